@@ -0,0 +1,95 @@
+"""
+Бенчмарк аналитики зарплат: один SQL-проход против агрегации в Python
+
+Запуск:
+    python -m benchmarks.bench_analytics --vacancies 1000000
+"""
+
+import argparse
+import statistics
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import BENCH_DATABASE, prepare_database, timed
+from src.analytics import DEFAULT_PERCENTILES, DIMENSIONS
+from src.db_manager import DBManager
+
+
+def python_analytics(db_manager: DBManager, bins: int = 10, upper: float = 500000) -> Dict[str, Any]:
+    """Та же аналитика, посчитанная в Python по выгруженным строкам"""
+    db_manager.connect()
+    assert db_manager.connection is not None
+    with db_manager.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT e.id, ex.name, em.name, v.currency,
+                   v.salary_from, v.salary_to
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            LEFT JOIN experience ex ON ex.id = v.experience_id
+            LEFT JOIN employment em ON em.id = v.employment_id
+            WHERE v.salary_from IS NOT NULL OR v.salary_to IS NOT NULL
+            """
+        )
+        rows = cursor.fetchall()
+    db_manager.disconnect()
+
+    groups: Dict[Tuple[str, Any, Any], List[float]] = defaultdict(list)
+    for row in rows:
+        low, high = row[4], row[5]
+        salary = ((low if low is not None else high) + (high if high is not None else low)) / 2
+        currency = row[3]
+        groups[("all", None, currency)].append(salary)
+        for i, dimension in enumerate(DIMENSIONS):
+            if dimension != "currency":
+                groups[(dimension, row[i], currency)].append(salary)
+
+    width = upper / bins
+    result = {}
+    for key, values in groups.items():
+        histogram = [0] * (bins + 2)
+        for value in values:
+            histogram[min(max(int(value // width) + 1, 0), bins + 1)] += 1
+        cuts = (
+            statistics.quantiles(values, n=100, method="inclusive")
+            if len(values) > 1
+            else values * 99
+        )
+        result[key] = (
+            len(values),
+            min(values),
+            max(values),
+            statistics.fmean(values),
+            [cuts[int(p * 100) - 1] for p in DEFAULT_PERCENTILES],
+            histogram,
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vacancies", type=int, default=1_000_000)
+    parser.add_argument("--employers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-load", action="store_true", help="использовать уже заполненную БД")
+    args = parser.parse_args()
+
+    if not args.skip_load:
+        print(f"Заполнение {BENCH_DATABASE}: {args.vacancies} вакансий...")
+        prepare_database(args.vacancies, args.employers).disconnect()
+
+    db_manager = DBManager(cache_size=0)
+    db_manager.config["database"] = BENCH_DATABASE
+
+    sql_time = timed(db_manager.get_salary_analytics, args.repeat)
+    python_time = timed(lambda: python_analytics(db_manager), args.repeat)
+
+    groups = sum(len(v) for v in db_manager.get_salary_analytics().values())
+    print(f"Групп в результате: {groups}")
+    print(f"SQL (GROUPING SETS, один проход): {sql_time:.3f} с")
+    print(f"Python (выгрузка и агрегация):    {python_time:.3f} с")
+    print(f"Ускорение: {python_time / sql_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Нагрузочный тест отчетов DBManager: параллельные чтения
+
+Несколько потоков или процессов в течение --duration секунд вызывают
+отчеты DBManager в заданной пропорции (--mix); у каждого исполнителя
+свой DBManager без кэша результатов. Для каждого уровня параллельности
+(--concurrency) печатаются пропускная способность и перцентили
+p50/p95/p99 времени вызова по отчетам. Время вызова включает
+подключение к БД: без --persistent каждый отчет открывает и закрывает
+соединение, как в рабочем режиме по умолчанию.
+
+Запуск:
+    python -m benchmarks.bench_concurrency --vacancies 100000 --concurrency 1,4,16,64
+    python -m benchmarks.bench_concurrency --skip-load --mode process --persistent
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from benchmarks.common import BENCH_DATABASE, prepare_database
+from src.db_manager import DBManager
+
+# Отчеты в порядке вывода
+REPORTS: Tuple[str, ...] = (
+    "companies_and_vacancies_count",
+    "all_vacancies",
+    "avg_salary",
+    "vacancies_with_higher_salary",
+    "vacancies_with_keyword",
+)
+
+PERCENTILES: Tuple[float, ...] = (0.50, 0.95, 0.99)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Разобрать пропорцию отчетов вида "avg_salary=5,all_vacancies=1"
+
+    Отчеты, не указанные в строке, не вызываются; пустая строка —
+    все отчеты поровну.
+
+    Args:
+        value: пары отчет=вес через запятую
+
+    Returns:
+        Dict[str, float]: вес каждого отчета
+    """
+    if not value:
+        return dict.fromkeys(REPORTS, 1.0)
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in REPORTS:
+            raise ValueError(f"Неизвестный отчет: {name}; доступны: {', '.join(REPORTS)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Некорректный вес отчета: {part}") from None
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("Сумма весов отчетов должна быть положительной")
+    return mix
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Перцентиль отсортированной выборки (метод ближайшего ранга)"""
+    if not values:
+        return 0.0
+    return values[max(math.ceil(fraction * len(values)), 1) - 1]
+
+
+def _report(manager: DBManager, name: str, keyword: str) -> Callable[[], Any]:
+    """Вызов отчета name"""
+    if name == "vacancies_with_keyword":
+        return lambda: manager.get_vacancies_with_keyword(keyword)
+    return getattr(manager, f"get_{name}")  # type: ignore[no-any-return]
+
+
+def run_worker(task: Tuple[int, Dict[str, float], float, bool, str, str, int]) -> Dict[str, Any]:
+    """
+    Вызывать отчеты до истечения времени
+
+    Функция верхнего уровня, чтобы ее можно было передать в процесс.
+
+    Args:
+        task: номер исполнителя, пропорция отчетов, длительность, секунды,
+            постоянная сессия, ключевое слово, имя БД и зерно генератора
+
+    Returns:
+        Dict: времена вызовов по отчетам (latencies), количество ошибок (errors)
+        и фактическая длительность работы (elapsed)
+    """
+    index, mix, duration, persistent, keyword, database, seed = task
+    rng = random.Random(seed * 1000 + index)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors = 0
+
+    manager = DBManager(cache_size=0, persistent=persistent, raise_errors=True)
+    manager.config["database"] = database
+    reports = {name: _report(manager, name, keyword) for name in names}
+    started = time.perf_counter()
+    deadline = started + duration
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        name = rng.choices(names, weights)[0]
+        try:
+            reports[name]()
+        except Exception:
+            errors += 1
+        else:
+            latencies[name].append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    manager.close()
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def run_level(
+    concurrency: int,
+    mode: str,
+    mix: Dict[str, float],
+    duration: float,
+    persistent: bool,
+    keyword: str,
+    seed: int,
+) -> Dict[str, Any]:
+    """
+    Нагрузка с concurrency исполнителями
+
+    Returns:
+        Dict: по каждому отчету calls, rps и перцентили в секундах,
+        а также суммарные total_rps и errors
+    """
+    pool: Callable[..., Executor] = ThreadPoolExecutor if mode == "thread" else ProcessPoolExecutor
+    tasks = [
+        (index, mix, duration, persistent, keyword, BENCH_DATABASE, seed)
+        for index in range(concurrency)
+    ]
+    # Сообщения о подключении не печатаются; stdout общий для потоков,
+    # поэтому перенаправляется один раз на весь уровень
+    with contextlib.redirect_stdout(io.StringIO()):
+        with pool(max_workers=concurrency) as executor:
+            parts = list(executor.map(run_worker, tasks))
+    # Запуск процессов не входит в замер: берется время работы исполнителей
+    elapsed = max(part["elapsed"] for part in parts)
+
+    result: Dict[str, Any] = {"reports": {}, "errors": sum(p["errors"] for p in parts)}
+    total = 0
+    for name in mix:
+        values = sorted(v for part in parts for v in part["latencies"][name])
+        total += len(values)
+        result["reports"][name] = {
+            "calls": len(values),
+            "rps": len(values) / elapsed,
+            **{f"p{int(p * 100)}": percentile(values, p) for p in PERCENTILES},
+        }
+    result["total_rps"] = total / elapsed
+    return result
+
+
+def print_level(concurrency: int, result: Dict[str, Any]) -> None:
+    """Вывести результаты уровня параллельности таблицей"""
+    print(
+        f"\nПараллельность {concurrency}: {result['total_rps']:.1f} запросов/с, "
+        f"ошибок {result['errors']}"
+    )
+    print(f"{'Отчет':<32}{'вызовы':>8}{'запр/с':>10}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}")
+    for name, stats in result["reports"].items():
+        print(
+            f"{name:<32}{stats['calls']:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50'] * 1000:>10.2f}{stats['p95'] * 1000:>10.2f}"
+            f"{stats['p99'] * 1000:>10.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--vacancies", type=int, default=100_000)
+    parser.add_argument("--employers", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-load", action="store_true", help="использовать уже заполненную БД")
+    parser.add_argument(
+        "--concurrency",
+        default="1,2,4,8,16,32",
+        help="уровни параллельности через запятую",
+    )
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд на уровень")
+    parser.add_argument("--mix", default="", help="веса отчетов: avg_salary=5,all_vacancies=1")
+    parser.add_argument("--keyword", default="python")
+    parser.add_argument(
+        "--persistent", action="store_true", help="постоянная сессия у каждого исполнителя"
+    )
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+        levels = [int(level) for level in args.concurrency.split(",")]
+    except ValueError as e:
+        parser.error(str(e))
+    if any(level < 1 for level in levels):
+        parser.error("Уровни параллельности должны быть положительными")
+
+    if not args.skip_load:
+        print(f"Заполнение {BENCH_DATABASE}: {args.vacancies} вакансий...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            prepare_database(args.vacancies, args.employers, args.seed).disconnect()
+
+    probe = DBManager(cache_size=0)
+    probe.config["database"] = BENCH_DATABASE
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            probe.connect()
+    except Exception as e:
+        parser.exit(1, f"База данных {BENCH_DATABASE} недоступна: {e}\n")
+    probe.close()
+
+    session = "постоянная сессия" if args.persistent else "подключение на каждый вызов"
+    print(f"Режим: {args.mode}, {session}, {args.duration:g} с на уровень")
+    results = {}
+    for level in levels:
+        results[level] = run_level(
+            level, args.mode, mix, args.duration, args.persistent, args.keyword, args.seed
+        )
+        print_level(level, results[level])
+
+    print(f"\n{'Параллельность':<16}{'запросов/с':>12}{'масштаб':>10}")
+    base = results[levels[0]]["total_rps"] / levels[0] or 1.0
+    for level in levels:
+        rps = results[level]["total_rps"]
+        print(f"{level:<16}{rps:>12.1f}{rps / (base * level):>10.0%}")
+
+    if args.output:
+        report = {
+            "meta": {
+                "vacancies": args.vacancies,
+                "employers": args.employers,
+                "mode": args.mode,
+                "persistent": args.persistent,
+                "duration": args.duration,
+                "mix": mix,
+            },
+            "levels": {str(level): result for level, result in results.items()},
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
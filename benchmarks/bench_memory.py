@@ -0,0 +1,71 @@
+"""
+Бенчмарк отчетов: MemoryDBManager против DBManager на PostgreSQL
+
+Для каждого из пяти отчетов печатается лучшее время вызова у обоих
+вариантов. DBManager работает с постоянной сессией и без кэша
+результатов, чтобы замерялось выполнение запроса, а не попадание в кэш.
+
+Запуск:
+    python -m benchmarks.bench_memory --vacancies 100000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List, Tuple
+
+from benchmarks.common import BENCH_DATABASE, prepare_database, timed
+from src.database import DatabaseManager
+from src.db_manager import DBManager
+from src.memory_db_manager import MemoryDBManager
+
+
+def reports(manager: Any, keyword: str) -> List[Tuple[str, Callable[[], Any]]]:
+    """Отчеты менеджера в порядке вывода"""
+    return [
+        ("companies_and_vacancies_count", manager.get_companies_and_vacancies_count),
+        ("all_vacancies", manager.get_all_vacancies),
+        ("avg_salary", manager.get_avg_salary),
+        ("vacancies_with_higher_salary", manager.get_vacancies_with_higher_salary),
+        ("vacancies_with_keyword", lambda: manager.get_vacancies_with_keyword(keyword)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vacancies", type=int, default=100_000)
+    parser.add_argument("--employers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keyword", default="python")
+    parser.add_argument("--skip-load", action="store_true", help="использовать уже заполненную БД")
+    args = parser.parse_args()
+
+    if args.skip_load:
+        database = DatabaseManager()
+        database.config["database"] = BENCH_DATABASE
+    else:
+        print(f"Заполнение {BENCH_DATABASE}: {args.vacancies} вакансий...")
+        database = prepare_database(args.vacancies, args.employers)
+
+    start = time.perf_counter()
+    memory = MemoryDBManager.from_database(database)
+    print(f"Загрузка в память: {time.perf_counter() - start:.3f} с")
+    database.disconnect()
+
+    postgres = DBManager(cache_size=0, persistent=True)
+    postgres.config["database"] = BENCH_DATABASE
+
+    print(f"{'Отчет':<32}{'PostgreSQL, мс':>16}{'в памяти, мс':>16}{'ускорение':>12}")
+    for (name, sql_report), (_, memory_report) in zip(
+        reports(postgres, args.keyword), reports(memory, args.keyword)
+    ):
+        sql_time = timed(sql_report, args.repeat)
+        memory_time = timed(memory_report, args.repeat)
+        print(
+            f"{name:<32}{sql_time * 1000:>16.2f}{memory_time * 1000:>16.2f}"
+            f"{sql_time / memory_time:>11.1f}x"
+        )
+    postgres.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Бенчмарк моделей: байт на вакансию и скорость создания из JSON
+
+Сравнивает модели со слотами и встроенными полями зарплаты с прежними
+dataclass-моделями и столбцовой пачкой VacancyBatch. Строки в синтетических данных общие для всех
+вакансий, поэтому замер показывает накладные расходы самих объектов.
+
+Запуск:
+    python -m benchmarks.bench_models --vacancies 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from benchmarks.synthetic import generate_vacancies
+from src.models import Vacancy
+
+
+@dataclass
+class LegacySalary:
+    """Прежняя модель зарплаты: dataclass с __dict__"""
+
+    from_: Optional[int] = None
+    to: Optional[int] = None
+    currency: Optional[str] = None
+    gross: Optional[bool] = None
+
+
+@dataclass
+class LegacyVacancy:
+    """Прежняя модель вакансии с отдельным объектом Salary"""
+
+    id: int
+    name: str
+    url: str
+    alternate_url: str
+    employer_id: int
+    salary: Optional[LegacySalary] = None
+    description: Optional[str] = None
+    experience: Optional[str] = None
+    employment: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "LegacyVacancy":
+        salary_data = data.get("salary")
+        salary = None
+        if salary_data:
+            salary = LegacySalary(
+                from_=salary_data.get("from"),
+                to=salary_data.get("to"),
+                currency=salary_data.get("currency"),
+                gross=salary_data.get("gross"),
+            )
+        return cls(
+            id=int(data["id"]),
+            name=data["name"],
+            url=data.get("url", ""),
+            alternate_url=data.get("alternate_url", ""),
+            employer_id=int(data["employer"]["id"]),
+            salary=salary,
+            description=data.get("description"),
+            experience=data.get("experience", {}).get("name"),
+            employment=data.get("employment", {}).get("name"),
+        )
+
+
+def measure(build: Callable[[], Any], count: int) -> Dict[str, float]:
+    """
+    Построить count вакансий функцией build и замерить память и скорость
+
+    Returns:
+        Dict: байт на вакансию и вакансий в секунду
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {"bytes_per_vacancy": allocated / count, "vacancies_per_second": count / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vacancies", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=10_000, help="уникальных JSON-документов")
+    args = parser.parse_args()
+
+    payloads = list(generate_vacancies(args.distinct, list(range(1, 101))))
+    size, count = len(payloads), args.vacancies
+
+    print(f"{'Модель':<32}{'байт/вакансия':>16}{'вакансий/с':>16}")
+    for title, build in [
+        (
+            "dataclass (прежняя)",
+            lambda: [LegacyVacancy.from_json(payloads[i % size]) for i in range(count)],
+        ),
+        (
+            "__slots__ + встроенная Salary",
+            lambda: [Vacancy.from_json(payloads[i % size]) for i in range(count)],
+        ),
+        (
+            "VacancyBatch (столбцы)",
+            lambda: Vacancy.from_json_batch(payloads[i % size] for i in range(count)),
+        ),
+    ]:
+        result = measure(build, count)
+        print(
+            f"{title:<32}{result['bytes_per_vacancy']:>16.1f}"
+            f"{result['vacancies_per_second']:>16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
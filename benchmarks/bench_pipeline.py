@@ -0,0 +1,293 @@
+"""
+Сквозной бенчмарк конвейера: сбор, разбор, загрузка и отчеты
+
+Данные генерируются детерминированно (benchmarks.synthetic), API hh.ru
+подменяется локальным имитатором (benchmarks.hh_stub), поэтому замеры
+воспроизводимы без сети. Разделы:
+
+    parse    — Vacancy.from_json по одной и from_json_batch (профили full и lean)
+    fetch    — работодатели и постраничная выдача через HHAPI и имитатор
+    load     — load_data построчно, load_batch с профилями full и lean
+    queries  — отчеты DBManager, поиск по вилке и аналитика зарплат
+
+Разделы load и queries требуют PostgreSQL (config/database.ini)
+и пропускаются, если БД недоступна. Результаты сохраняются в JSON
+(--output); с --compare текущий прогон сравнивается с сохраненным,
+и при замедлении сверх порога команда завершается с кодом 1.
+
+Запуск:
+    python -m benchmarks.bench_pipeline --vacancies 10000 --output baseline.json
+    python -m benchmarks.bench_pipeline --vacancies 10000 --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.common import BENCH_DATABASE, prepare_database, timed
+from benchmarks.hh_stub import StubHHServer
+from benchmarks.synthetic import generate_employers, generate_vacancies, vacancy_counts
+from src.api import HHAPI, get_employer_data
+from src.database import DatabaseManager
+from src.db_manager import DBManager
+from src.models import Employer, Vacancy
+from src.projection import FULL, LEAN, Projection
+
+# Допустимое замедление относительно базового прогона
+DEFAULT_THRESHOLD = 0.2
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def record(results: Results, name: str, seconds: float, items: int, unit: str) -> None:
+    """Сохранить замер и вывести его строкой таблицы"""
+    rate = items / seconds if seconds > 0 else 0.0
+    results[name] = {"seconds": seconds, "rate": rate, "unit": unit}
+    print(f"{name:<40}{seconds * 1000:>12.2f}{rate:>16.0f} {unit}/с")
+
+
+def quiet(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Обертка функции без вывода в stdout (сообщения о загрузке)"""
+
+    def wrapper() -> Any:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+
+    return wrapper
+
+
+def bench_parse(items: List[Dict[str, Any]], repeat: int, results: Results) -> None:
+    """Разбор JSON вакансий в модели"""
+    for profile, projection in (("full", FULL), ("lean", LEAN)):
+        record(
+            results,
+            f"parse.from_json.{profile}",
+            timed(lambda: [Vacancy.from_json(item, projection) for item in items], repeat),
+            len(items),
+            "вакансий",
+        )
+        record(
+            results,
+            f"parse.from_json_batch.{profile}",
+            timed(lambda: Vacancy.from_json_batch(items, projection), repeat),
+            len(items),
+            "вакансий",
+        )
+
+
+def bench_fetch(
+    employers: List[Dict[str, Any]], counts: Dict[int, int], seed: int, results: Results
+) -> None:
+    """Сбор работодателей и вакансий через HHAPI и локальный имитатор"""
+    employer_ids = [int(e["id"]) for e in employers]
+    with StubHHServer(employers, counts, seed) as server:
+        api = HHAPI()
+        api.BASE_URL = server.base_url  # type: ignore[misc]
+        record(
+            results,
+            "fetch.employers",
+            timed(lambda: get_employer_data(api, employer_ids), 1),
+            len(employer_ids),
+            "работодателей",
+        )
+
+        def fetch_pages() -> None:
+            for employer_id in employer_ids:
+                for _ in api.iter_pages(employer_id):
+                    pass
+
+        requests_before = server.requests
+        record(
+            results,
+            "fetch.vacancies",
+            timed(quiet(fetch_pages), 1),
+            sum(counts.values()),
+            "вакансий",
+        )
+        print(f"    запросов к имитатору: {server.requests - requests_before}")
+
+
+def _load_database(name: str, projection: Projection) -> DatabaseManager:
+    """Пустая тестовая БД с таблицами профиля projection"""
+    database = DatabaseManager(projection=projection)
+    quiet(lambda: database.create_database(name))()
+    database.config["database"] = name
+    database.connect()
+    quiet(database.create_tables)()
+    return database
+
+
+def _truncate(database: DatabaseManager) -> None:
+    """Очистить таблицы тестовой БД"""
+    assert database.connection is not None
+    with database.connection.cursor() as cursor:
+        cursor.execute("TRUNCATE vacancies, employers CASCADE")
+    database.connection.commit()
+
+
+def bench_load(
+    employers: List[Dict[str, Any]],
+    items: List[Dict[str, Any]],
+    per_row_limit: int,
+    results: Results,
+) -> None:
+    """Загрузка в PostgreSQL построчно и пакетами"""
+    models = [Employer.from_json(e) for e in employers]
+    for profile, projection in (("full", FULL), ("lean", LEAN)):
+        database = _load_database(f"{BENCH_DATABASE}_{profile}", projection)
+        try:
+            batch = Vacancy.from_json_batch(items, projection)
+            _truncate(database)
+            record(
+                results,
+                f"load.load_batch.{profile}",
+                timed(quiet(lambda: database.load_batch(models, batch, page_size=5000)), 1),
+                len(batch),
+                "вакансий",
+            )
+            if profile == "full" and per_row_limit:
+                rows = [Vacancy.from_json(item) for item in islice(items, per_row_limit)]
+                _truncate(database)
+                record(
+                    results,
+                    "load.load_data.full",
+                    timed(quiet(lambda: database.load_data(models, rows)), 1),
+                    len(rows),
+                    "вакансий",
+                )
+        finally:
+            database.disconnect()
+
+
+def bench_queries(
+    vacancies: int, employers: int, seed: int, repeat: int, results: Results
+) -> None:
+    """Запросы DBManager к заполненной тестовой БД"""
+    quiet(lambda: prepare_database(vacancies, employers, seed).disconnect())()
+
+    db_manager = DBManager(cache_size=0, persistent=True)
+    db_manager.config["database"] = BENCH_DATABASE
+    queries: List[tuple] = [
+        ("companies_and_vacancies_count", db_manager.get_companies_and_vacancies_count),
+        ("all_vacancies", db_manager.get_all_vacancies),
+        ("avg_salary", db_manager.get_avg_salary),
+        ("vacancies_with_higher_salary", db_manager.get_vacancies_with_higher_salary),
+        ("vacancies_with_keyword", lambda: db_manager.get_vacancies_with_keyword("python")),
+        (
+            "vacancies_in_salary_range",
+            lambda: db_manager.get_vacancies_in_salary_range(100000, 200000, "RUR"),
+        ),
+        ("salary_analytics", db_manager.get_salary_analytics),
+    ]
+    try:
+        for name, query in queries:
+            record(results, f"queries.{name}", timed(query, repeat), 1, "запросов")
+    finally:
+        db_manager.close()
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """
+    Сравнить замеры с базовыми
+
+    Args:
+        results: текущие замеры
+        baseline: базовые замеры
+        threshold: допустимая доля замедления
+
+    Returns:
+        List[str]: замеры, замедлившиеся сверх порога
+    """
+    print(f"{'Замер':<40}{'база, мс':>12}{'сейчас, мс':>12}{'изменение':>12}")
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base["seconds"]:
+            continue
+        change = current["seconds"] / base["seconds"] - 1
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = "  замедление"
+        print(
+            f"{name:<40}{base['seconds'] * 1000:>12.2f}"
+            f"{current['seconds'] * 1000:>12.2f}{change:>+12.1%}{mark}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--vacancies", type=int, default=10_000)
+    parser.add_argument("--employers", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--per-row-limit",
+        type=int,
+        default=2000,
+        help="вакансий для построчной загрузки load_data (0 — не замерять)",
+    )
+    parser.add_argument("--skip-db", action="store_true", help="не замерять load и queries")
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="сравнить с сохраненными результатами"
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    employers = generate_employers(args.employers, args.seed)
+    employer_ids = [int(e["id"]) for e in employers]
+    items = list(generate_vacancies(args.vacancies, employer_ids, args.seed))
+    counts = vacancy_counts(args.vacancies, employer_ids, args.seed)
+
+    results: Results = {}
+    print(f"{'Замер':<40}{'время, мс':>12}{'скорость':>16}")
+    bench_parse(items, args.repeat, results)
+    bench_fetch(employers, counts, args.seed, results)
+    if not args.skip_db:
+        try:
+            bench_load(employers, items, args.per_row_limit, results)
+            bench_queries(args.vacancies, args.employers, args.seed, args.repeat, results)
+        except Exception as e:
+            print(f"Замеры с PostgreSQL пропущены: {e}")
+
+    report = {
+        "meta": {
+            "vacancies": args.vacancies,
+            "employers": args.employers,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline["meta"].get("vacancies") != args.vacancies:
+            print("Внимание: базовый прогон выполнен на другом объеме данных")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"Замедление более {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
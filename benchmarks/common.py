@@ -0,0 +1,76 @@
+"""
+Общие функции бенчмарков: подготовка тестовой БД и замер времени
+"""
+
+import time
+from itertools import islice
+from typing import Any, Callable
+
+from benchmarks.synthetic import generate_employers, generate_vacancies
+from src.database import DatabaseManager
+from src.models import Employer, Vacancy
+
+# Отдельная БД, чтобы бенчмарки не затрагивали рабочие данные
+BENCH_DATABASE = "hh_vacancies_bench"
+
+
+def prepare_database(
+    vacancies: int, employers: int, seed: int = 0, config_file: str = "config/database.ini"
+) -> DatabaseManager:
+    """
+    Создать тестовую БД и заполнить ее синтетическими данными
+
+    Args:
+        vacancies: количество вакансий
+        employers: количество работодателей
+        seed: зерно генератора
+        config_file: путь к файлу конфигурации
+
+    Returns:
+        DatabaseManager: менеджер, подключенный к тестовой БД
+    """
+    db_manager = DatabaseManager(config_file)
+    db_manager.create_database(BENCH_DATABASE)
+    db_manager.config["database"] = BENCH_DATABASE
+    db_manager.connect()
+    db_manager.create_tables()
+
+    employer_data = generate_employers(employers, seed)
+    employer_ids = [int(e["id"]) for e in employer_data]
+    assert db_manager.connection is not None
+    with db_manager.connection.cursor() as cursor:
+        cursor.execute("TRUNCATE vacancies, employers CASCADE")
+    db_manager.connection.commit()
+
+    items = generate_vacancies(vacancies, employer_ids, seed)
+    models = [Employer.from_json(e) for e in employer_data]
+    while True:
+        batch = Vacancy.from_json_batch(islice(items, 100_000))
+        if not len(batch) and not models:
+            break
+        db_manager.load_batch(models, batch, page_size=5000)
+        models = []
+
+    with db_manager.connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    db_manager.connection.commit()
+    return db_manager
+
+
+def timed(func: Callable[[], Any], repeat: int = 3) -> float:
+    """
+    Лучшее время выполнения функции за несколько повторов
+
+    Args:
+        func: измеряемая функция
+        repeat: количество повторов
+
+    Returns:
+        float: время в секундах
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,116 @@
+"""
+Локальный имитатор API hh.ru для бенчмарков сбора данных
+
+Отвечает на /employers/{id}, /vacancies и /dictionaries синтетическими
+данными из benchmarks.synthetic; страницы вакансий генерируются
+при запросе, поэтому выдача любого размера занимает постоянную память.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import EMPLOYMENT, EXPERIENCE, vacancies_page
+from src.dictionaries import LOOKUP_DICTIONARIES
+
+
+class StubHHServer:
+    """
+    Имитатор API hh.ru в фоновом потоке
+
+    Использование:
+        with StubHHServer(employers, counts) as server:
+            api.BASE_URL = server.base_url
+    """
+
+    def __init__(
+        self,
+        employers: List[Dict[str, Any]],
+        counts: Dict[int, int],
+        seed: int = 0,
+        latency: float = 0.0,
+    ) -> None:
+        """
+        Инициализация имитатора
+
+        Args:
+            employers: данные работодателей (см. generate_employers)
+            counts: количество вакансий работодателей (см. vacancy_counts)
+            seed: зерно генератора вакансий
+            latency: искусственная задержка ответа, секунды
+        """
+        self.employers = {int(e["id"]): e for e in employers}
+        self.counts = counts
+        self.seed = seed
+        self.latency = latency
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        """Базовый адрес API для HHAPI.BASE_URL"""
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self) -> "StubHHServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело уходят отдельными пакетами: без TCP_NODELAY
+            # каждый ответ ждет отложенного подтверждения (~40 мс)
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                stub.requests += 1
+                if stub.latency:
+                    threading.Event().wait(stub.latency)
+                url = urlparse(self.path)
+                body = stub.respond(url.path, {k: v[0] for k, v in parse_qs(url.query).items()})
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = json.dumps(body, ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def respond(self, path: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Ответ на запрос к API или None, если ресурс не найден"""
+        parts = path.strip("/").split("/")
+        if parts[0] == "employers" and len(parts) == 2:
+            return self.employers.get(int(parts[1]))
+        if parts == ["vacancies"]:
+            employer_id = int(params.get("employer_id", 0))
+            return vacancies_page(
+                employer_id,
+                self.counts.get(employer_id, 0),
+                int(params.get("page", 0)),
+                int(params.get("per_page", 100)),
+                self.seed,
+            )
+        if parts == ["dictionaries"]:
+            values = {"experience": EXPERIENCE, "employment": EMPLOYMENT}
+            return {
+                name: [{"id": i, "name": n} for i, n in values[name]]
+                for name in LOOKUP_DICTIONARIES
+            }
+        return None
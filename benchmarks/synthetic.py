@@ -0,0 +1,183 @@
+"""
+Генератор синтетических данных в формате API hh.ru для бенчмарков
+"""
+
+import random
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Валюты с долей вакансий и медианной зарплатой
+CURRENCIES: List[Tuple[str, float, int]] = [
+    ("RUR", 0.85, 120000),
+    ("USD", 0.07, 3000),
+    ("EUR", 0.04, 2800),
+    ("KZT", 0.04, 600000),
+]
+EXPERIENCE: List[Tuple[str, str]] = [
+    ("noExperience", "Нет опыта"),
+    ("between1And3", "От 1 года до 3 лет"),
+    ("between3And6", "От 3 до 6 лет"),
+    ("moreThan6", "Более 6 лет"),
+]
+EMPLOYMENT: List[Tuple[str, str]] = [
+    ("full", "Полная занятость"),
+    ("part", "Частичная занятость"),
+    ("project", "Проектная работа"),
+    ("probation", "Стажировка"),
+]
+TITLES = [
+    "Python-разработчик",
+    "Java Developer",
+    "Аналитик данных",
+    "DevOps-инженер",
+    "Frontend-разработчик",
+    "Тестировщик",
+    "Менеджер проектов",
+    "Системный администратор",
+    "Data Scientist",
+    "Backend Developer (Go)",
+]
+LEVELS = ["Junior", "Middle", "Senior", "Lead", ""]
+
+
+def generate_employers(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Сгенерировать работодателей в формате ответа /employers/{id}
+
+    Args:
+        count: количество работодателей
+        seed: зерно генератора случайных чисел
+
+    Returns:
+        List[Dict]: данные работодателей
+    """
+    rng = random.Random(seed)
+    employers = []
+    for i in range(count):
+        employer_id = 1000 + i
+        employers.append(
+            {
+                "id": str(employer_id),
+                "name": f"Компания {employer_id}",
+                "url": f"https://api.hh.ru/employers/{employer_id}",
+                "alternate_url": f"https://hh.ru/employer/{employer_id}",
+                "description": "<p>Описание компании</p>" * rng.randint(1, 20),
+            }
+        )
+    return employers
+
+
+def _salary(rng: random.Random) -> Optional[Dict[str, Any]]:
+    """Сгенерировать зарплатную вилку с пропусками границ"""
+    roll = rng.random()
+    if roll < 0.03:
+        return None
+    currency, _, median = rng.choices(
+        CURRENCIES, weights=[c[1] for c in CURRENCIES]
+    )[0]
+    low = int(rng.lognormvariate(0, 0.5) * median) // 1000 * 1000
+    high = int(low * rng.uniform(1.1, 1.8)) // 1000 * 1000
+    return {
+        "from": low if roll < 0.8 else None,
+        "to": high if roll >= 0.5 else None,
+        "currency": currency,
+        "gross": rng.random() < 0.4,
+    }
+
+
+def _vacancy(rng: random.Random, vacancy_id: int, employer_id: int) -> Dict[str, Any]:
+    """Сгенерировать одну вакансию в формате элемента ответа /vacancies"""
+    experience = rng.choice(EXPERIENCE)
+    employment = rng.choice(EMPLOYMENT)
+    return {
+        "id": str(vacancy_id),
+        "name": f"{rng.choice(LEVELS)} {rng.choice(TITLES)}".strip(),
+        "url": f"https://api.hh.ru/vacancies/{vacancy_id}",
+        "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+        "employer": {"id": str(employer_id)},
+        "salary": _salary(rng),
+        "description": "<p>Обязанности и требования</p>" * rng.randint(5, 60),
+        "experience": {"id": experience[0], "name": experience[1]},
+        "employment": {"id": employment[0], "name": employment[1]},
+    }
+
+
+def _employer_weights(employer_ids: Sequence[int]) -> List[float]:
+    """Веса работодателей, близкие к степенному распределению"""
+    return [1.0 / (rank + 1) for rank in range(len(employer_ids))]
+
+
+def generate_vacancies(
+    count: int, employer_ids: Sequence[int], seed: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Сгенерировать вакансии в формате элементов ответа /vacancies
+
+    Работодатели выбираются с распределением, близким к степенному:
+    у немногих крупных компаний большая часть вакансий.
+
+    Args:
+        count: количество вакансий
+        employer_ids: ID работодателей
+        seed: зерно генератора случайных чисел
+
+    Yields:
+        Dict: данные вакансии
+    """
+    rng = random.Random(seed)
+    employers = rng.choices(employer_ids, weights=_employer_weights(employer_ids), k=count)
+    for i in range(count):
+        yield _vacancy(rng, 10_000_000 + i, employers[i])
+
+
+def vacancy_counts(count: int, employer_ids: Sequence[int], seed: int = 0) -> Dict[int, int]:
+    """
+    Распределить count вакансий по работодателям (см. generate_vacancies)
+
+    Args:
+        count: общее количество вакансий
+        employer_ids: ID работодателей
+        seed: зерно генератора случайных чисел
+
+    Returns:
+        Dict[int, int]: количество вакансий каждого работодателя
+    """
+    rng = random.Random(seed)
+    counts = dict.fromkeys(employer_ids, 0)
+    for employer_id in rng.choices(employer_ids, weights=_employer_weights(employer_ids), k=count):
+        counts[employer_id] += 1
+    return counts
+
+
+def vacancies_page(
+    employer_id: int, found: int, page: int = 0, per_page: int = 100, seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Сгенерировать страницу ответа /vacancies для работодателя
+
+    Страница строится без хранения остальных: одинаковые аргументы
+    всегда дают одинаковый ответ, поэтому имитатор API обслуживает
+    выдачу любого размера в постоянной памяти.
+
+    Args:
+        employer_id: ID работодателя
+        found: всего вакансий работодателя
+        page: номер страницы
+        per_page: вакансий на странице
+        seed: зерно генератора случайных чисел
+
+    Returns:
+        Dict: ответ с полями items, found, pages, page и per_page
+    """
+    rng = random.Random(f"{seed}:{employer_id}:{page}")
+    first = page * per_page
+    items = [
+        _vacancy(rng, employer_id * 1_000_000 + index, employer_id)
+        for index in range(first, min(first + per_page, found))
+    ]
+    return {
+        "items": items,
+        "found": found,
+        "pages": (found + per_page - 1) // per_page,
+        "page": page,
+        "per_page": per_page,
+    }
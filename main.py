@@ -1,59 +1,56 @@
-import sys
+import argparse
 import os
+import sys
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 # Добавляем путь к src для корректного импорта
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.api import HHAPI, get_employer_data, get_vacancies_data
-from src.database import DatabaseManager
-from src.db_manager import DBManager
-from src.models import Employer, Vacancy
-from typing import List
-
-
-def main() -> None:
-    """Основная функция программы"""
-
-    # Список ID интересных компаний
-    employer_ids = [
-        1740,  # Яндекс
-        15478,  # VK
-        3529,  # Сбер
-        907345,  # Тинькофф
-        1057,  # Касперский
-        78638,  # 1С
-        2180,  # Ozon
-        87021,  # Wildberries
-        3776,  # МТС
-        39305  # Газпром нефть
-    ]
-
-    # Инициализация API
-    api = HHAPI()
+from src.export import EXPORT_FORMATS, open_export_stream
+from src.output import FORMATS, OutputWriter, Pager
 
-    print("Получение данных с hh.ru...")
+# requests, psycopg2 и модули, зависящие от них, импортируются внутри
+# функций: сеанс без сбора данных не тратит время на импорт HTTP-клиента,
+# а --help не импортирует ничего из них
+if TYPE_CHECKING:
+    from src.api import HHAPI
+    from src.database import DatabaseManager
+    from src.db_manager import DBManager
 
-    # Получение данных о работодателях
-    employers_data = get_employer_data(api, employer_ids)
+# Список ID интересных компаний
+EMPLOYER_IDS = [
+    1740,  # Яндекс
+    15478,  # VK
+    3529,  # Сбер
+    907345,  # Тинькофф
+    1057,  # Касперский
+    78638,  # 1С
+    2180,  # Ozon
+    87021,  # Wildberries
+    3776,  # МТС
+    39305  # Газпром нефть
+]
 
-    # Получение данных о вакансиях
-    vacancies_data = get_vacancies_data(api, employer_ids)
+# Данные работодателя, собранные не раньше этого срока, не обновляются
+DEFAULT_MAX_AGE_HOURS = 12.0
 
-    # Преобразование данных в модели
-    employers: List[Employer] = []
-    vacancies: List[Vacancy] = []
+# Отчеты подкоманды report
+REPORTS = ("companies", "vacancies", "avg-salary", "higher-salary")
 
-    for emp_id, emp_data in employers_data.items():
-        employers.append(Employer.from_json(emp_data))
 
-    for emp_id, vac_list in vacancies_data.items():
-        for vac_data in vac_list:
-            vacancies.append(Vacancy.from_json(vac_data))
+def _prepare_database(db_manager: "DatabaseManager", api: "HHAPI") -> bool:
+    """
+    Создать базу данных и таблицы и подключиться к ней
 
-    print(f"Получено {len(employers)} работодателей и {len(vacancies)} вакансий")
+    Args:
+        db_manager: менеджер базы данных
+        api: экземпляр HHAPI для обновления справочников
 
-    # Инициализация менеджера базы данных
-    db_manager = DatabaseManager()
+    Returns:
+        bool: True, если база данных готова к загрузке
+    """
+    from src.dictionaries import load_dictionaries
 
     # Создание базы данных
     try:
@@ -67,27 +64,283 @@ def main() -> None:
         db_manager.connect()
     except Exception as e:
         print(f"Ошибка подключения к БД: {e}")
-        return
+        return False
 
     # Создание таблиц
     try:
-        db_manager.create_tables()
+        db_manager.create_tables(load_dictionaries(api))
     except Exception as e:
         print(f"Ошибка создания таблиц: {e}")
-        return
+        return False
+    return True
+
+
+def sync(
+    employer_ids: Sequence[int] = EMPLOYER_IDS, config_file: str = 'config/database.ini'
+) -> bool:
+    """
+    Получить данные с hh.ru и загрузить их в базу данных
+
+    Вакансии загружаются постранично: каждая страница выдачи записывается
+    в базу вместе с отметкой о ее загрузке в одной транзакции. Если сбор
+    прервался, следующий запуск продолжает его со страницы после последней
+    загруженной (см. DatabaseManager.get_checkpoints).
+
+    Args:
+        employer_ids: ID работодателей
+        config_file: путь к файлу конфигурации БД
+
+    Returns:
+        bool: True, если данные всех работодателей загружены полностью
+    """
+    from src.api import HHAPI, get_employer_data
+    from src.database import DatabaseManager
+    from src.dedup import SeenIds
+    from src.models import Employer, Vacancy
+    from src.profiling import stage
+
+    # Инициализация API
+    api = HHAPI()
+
+    # Инициализация менеджера базы данных: его профиль проекции определяет,
+    # какие поля вакансий разбираются и сохраняются
+    db_manager = DatabaseManager(config_file)
+    if not _prepare_database(db_manager, api):
+        return False
+
+    print("Получение данных с hh.ru...")
+
+    # Получение данных о работодателях
+    employers_data = get_employer_data(api, list(dict.fromkeys(employer_ids)))
+    complete = len(employers_data) == len(set(employer_ids))
 
-    # Загрузка данных
     try:
-        db_manager.load_data(employers, vacancies)
+        resume = db_manager.get_checkpoints(list(employers_data))
+    except Exception as e:
+        print(f"Не удалось прочитать отметки прерванного сбора: {e}")
+        resume = {}
+
+    # Общее множество id отбрасывает повторы по всему сбору
+    seen = SeenIds()
+    total = 0
+    try:
+        for emp_id, emp_data in employers_data.items():
+            employer = Employer.from_json(emp_data)
+            start_page = resume.get(emp_id, 0)
+            if start_page:
+                print(f"Продолжение сбора работодателя {emp_id} со страницы {start_page}")
+
+            finished = False
+            for page in api.iter_pages(emp_id, start_page, seen):
+                with stage("parse"):
+                    batch = Vacancy.from_json_batch(page.items, db_manager.projection)
+                with stage("load"):
+                    db_manager.load_batch([employer], batch, checkpoint=(emp_id, page.number))
+                total += len(batch)
+                finished = page.is_last
+
+            if finished:
+                # Сбор работодателя завершен: время сбора, отметки страниц удаляются
+                db_manager.mark_synced([emp_id])
+            else:
+                print(f"Сбор вакансий работодателя {emp_id} прерван, будет продолжен")
+                complete = False
     except Exception as e:
         print(f"Ошибка загрузки данных: {e}")
-        return
+        return False
+    finally:
+        # Закрытие соединения
+        db_manager.disconnect()
+
+    print(f"Получено {len(employers_data)} работодателей и {total} вакансий")
+    return complete
+
+
+def run_daemon(
+    employer_ids: Sequence[int],
+    config_file: str = 'config/database.ini',
+    state_file: Optional[str] = None,
+    concurrency: int = 4,
+    min_interval: Optional[float] = None,
+    max_interval: Optional[float] = None,
+) -> bool:
+    """
+    Запустить фоновую синхронизацию до SIGINT или SIGTERM
+
+    Args:
+        employer_ids: ID работодателей
+        config_file: путь к файлу конфигурации БД
+        state_file: файл состояния расписания
+        concurrency: максимальное количество одновременных запросов
+        min_interval: минимальный интервал обновления, секунды
+        max_interval: максимальный интервал обновления, секунды
+
+    Returns:
+        bool: False, если база данных не готова
+    """
+    import signal
+    import threading
+
+    from src.api import HHAPI
+    from src.daemon import SyncDaemon
+    from src.database import DatabaseManager
+    from src.scheduler import DEFAULT_STATE_FILE, MAX_INTERVAL, MIN_INTERVAL, Scheduler
+
+    api = HHAPI()
+    db_manager = DatabaseManager(config_file)
+    if not _prepare_database(db_manager, api):
+        return False
+
+    state_file = state_file or DEFAULT_STATE_FILE
+    scheduler = Scheduler(
+        dict.fromkeys(employer_ids),
+        min_interval or MIN_INTERVAL,
+        max_interval or MAX_INTERVAL,
+    )
+    scheduler.load(state_file)
+    daemon = SyncDaemon(api, db_manager, scheduler, state_file, concurrency)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    print(f"Синхронизация {len(scheduler.schedules)} работодателей по расписанию запущена")
+    try:
+        daemon.run(stop)
+    finally:
+        daemon.close()
+    print("Синхронизация остановлена")
+    return True
+
+
+def _employer_list(args: argparse.Namespace) -> Tuple[List[int], Dict[int, float]]:
+    """
+    Список работодателей подкоманд sync и daemon с учетом шарда
+
+    Работодатели берутся из --employer, --employers-file и --employers-table
+    (по умолчанию — EMPLOYER_IDS). Веса для разбиения на шарды берутся
+    только из файла: у всех узлов они должны совпадать.
+    """
+    from src.sharding import parse_shard, read_employer_file, shard_employers
+
+    employer_ids: List[int] = list(args.employer or [])
+    weights: Dict[int, float] = {}
+    if args.employers_file:
+        file_ids, weights = read_employer_file(args.employers_file)
+        employer_ids.extend(file_ids)
+    if args.employers_table:
+        from src.database import DatabaseManager
+
+        table, _, column = args.employers_table.partition(":")
+        db_manager = DatabaseManager(args.config)
+        db_manager.config['database'] = 'hh_vacancies'
+        try:
+            employer_ids.extend(db_manager.read_employer_ids(table, column or "employer_id"))
+        finally:
+            db_manager.disconnect()
+    employer_ids = list(dict.fromkeys(employer_ids)) or list(EMPLOYER_IDS)
+
+    if args.shard:
+        index, count = parse_shard(args.shard)
+        employer_ids = shard_employers(employer_ids, index, count, weights)
+        print(f"Шард {index}/{count}: {len(employer_ids)} работодателей")
+    return employer_ids, weights
+
+
+def sync_shards(
+    employer_ids: Sequence[int],
+    processes: int = 1,
+    weights: Optional[Dict[int, float]] = None,
+    config_file: str = 'config/database.ini',
+) -> bool:
+    """
+    Собрать данные работодателей в нескольких процессах
+
+    Работодатели разбиваются на processes шардов с близким суммарным весом
+    (количеством вакансий); если веса не заданы, берется количество вакансий,
+    загруженных прошлыми сборами. Каждый процесс собирает и загружает свой
+    шард в общую базу данных независимо (см. sync).
+
+    Args:
+        employer_ids: ID работодателей
+        processes: количество процессов
+        weights: веса работодателей
+        config_file: путь к файлу конфигурации БД
+
+    Returns:
+        bool: True, если все шарды загружены полностью
+    """
+    from functools import partial
+
+    from src.sharding import balance, run_local_shards
+
+    if processes < 1:
+        raise ValueError("Количество процессов должно быть положительным")
+    if processes == 1:
+        return sync(employer_ids, config_file)
+
+    if not weights:
+        from src.database import DatabaseManager
+
+        db_manager = DatabaseManager(config_file)
+        db_manager.config['database'] = 'hh_vacancies'
+        try:
+            weights = dict(db_manager.get_vacancy_counts(employer_ids))
+        except Exception as e:
+            print(f"Не удалось получить количество вакансий работодателей: {e}")
+        finally:
+            db_manager.disconnect()
 
-    # Закрытие соединения
-    db_manager.disconnect()
+    shards = balance(employer_ids, processes, weights)
+    results = run_local_shards(shards, partial(sync, config_file=config_file))
+    return all(results)
+
+
+def stale_employers(
+    employer_ids: Sequence[int], max_age: timedelta, config_file: str = 'config/database.ini'
+) -> List[int]:
+    """
+    Отобрать работодателей, данные которых устарели
+
+    Args:
+        employer_ids: ID работодателей
+        max_age: допустимый возраст данных
+        config_file: путь к файлу конфигурации БД
+
+    Returns:
+        List[int]: ID работодателей для сбора; все, если база недоступна
+    """
+    from src.database import DatabaseManager
+
+    db_manager = DatabaseManager(config_file)
+    db_manager.config['database'] = 'hh_vacancies'
+    try:
+        return db_manager.get_stale_employers(employer_ids, max_age)
+    except Exception as e:
+        print(f"Не удалось проверить время последнего сбора: {e}")
+        return list(employer_ids)
+    finally:
+        db_manager.disconnect()
+
+
+def _print_vacancies(vacancies: List[Any]) -> None:
+    """Вывести вакансии меню одной записью в stdout вместо print на каждое поле"""
+    lines: List[str] = []
+    for vac in vacancies:
+        lines.append(f"Компания: {vac['company']}")
+        lines.append(f"Вакансия: {vac['vacancy']}")
+        lines.append(f"Зарплата: {vac['salary'] or 'Не указана'}")
+        lines.append(f"Ссылка: {vac['url']}")
+        lines.append("-" * 40)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def interactive_menu(config_file: str = 'config/database.ini') -> None:
+    """Интерактивное меню отчетов"""
+    from src.db_manager import DBManager
 
     # Работа с данными через DBManager
-    db_manager_instance = DBManager()
+    db_manager_instance = DBManager(config_file, persistent=True)
 
     while True:
         print("\n" + "=" * 50)
@@ -114,12 +367,7 @@ def main() -> None:
             print("\nСПИСОК ВСЕХ ВАКАНСИЙ:")
             print("-" * 80)
             all_vacancies = db_manager_instance.get_all_vacancies()
-            for vac in all_vacancies:
-                print(f"Компания: {vac['company']}")
-                print(f"Вакансия: {vac['vacancy']}")
-                print(f"Зарплата: {vac['salary'] or 'Не указана'}")
-                print(f"Ссылка: {vac['url']}")
-                print("-" * 40)
+            _print_vacancies(all_vacancies)
 
         elif choice == '3':
             avg_salary = db_manager_instance.get_avg_salary()
@@ -129,12 +377,7 @@ def main() -> None:
             print("\nВАКАНСИИ С ЗАРПЛАТОЙ ВЫШЕ СРЕДНЕЙ:")
             print("-" * 80)
             high_salary_vacancies = db_manager_instance.get_vacancies_with_higher_salary()
-            for vac in high_salary_vacancies:
-                print(f"Компания: {vac['company']}")
-                print(f"Вакансия: {vac['vacancy']}")
-                print(f"Зарплата: {vac['salary']}")
-                print(f"Ссылка: {vac['url']}")
-                print("-" * 40)
+            _print_vacancies(high_salary_vacancies)
 
         elif choice == '5':
             keyword = input("Введите ключевое слово для поиска: ").strip()
@@ -143,12 +386,7 @@ def main() -> None:
                 print("-" * 80)
                 found_vacancies = db_manager_instance.get_vacancies_with_keyword(keyword)
                 if found_vacancies:
-                    for vac in found_vacancies:
-                        print(f"Компания: {vac['company']}")
-                        print(f"Вакансия: {vac['vacancy']}")
-                        print(f"Зарплата: {vac['salary'] or 'Не указана'}")
-                        print(f"Ссылка: {vac['url']}")
-                        print("-" * 40)
+                    _print_vacancies(found_vacancies)
                 else:
                     print("Вакансии не найдены")
             else:
@@ -156,11 +394,306 @@ def main() -> None:
 
         elif choice == '0':
             print("Выход из программы...")
+            db_manager_instance.close()
             break
 
         else:
             print("Неверный выбор! Попробуйте еще раз.")
 
 
+def _report_rows(
+    db_manager: "DBManager", name: str
+) -> Tuple[Sequence[str], Iterable[Sequence[Any]]]:
+    """Столбцы и строки отчета подкоманды report"""
+    from src.db_manager import VACANCY_COLUMNS
+
+    if name == "companies":
+        companies = db_manager.get_companies_and_vacancies_count()
+        return ("company", "vacancies_count"), (
+            (c["company"], c["vacancies_count"]) for c in companies
+        )
+    if name == "avg-salary":
+        return ("avg_salary",), [(db_manager.get_avg_salary(),)]
+    if name == "vacancies":
+        return VACANCY_COLUMNS, db_manager.get_all_vacancies(row_format="tuple")
+    return VACANCY_COLUMNS, db_manager.get_vacancies_with_higher_salary(row_format="tuple")
+
+
+def _search_rows(db_manager: "DBManager", args: argparse.Namespace) -> Iterable[Sequence[Any]]:
+    """Строки подкоманды search"""
+    filters = (args.salary_min, args.salary_max, args.currency, args.employer)
+    if all(value is None for value in filters):
+        if args.keyword is None:
+            return db_manager.get_all_vacancies(row_format="tuple")
+        return db_manager.get_vacancies_with_keyword(args.keyword, row_format="tuple")
+    return db_manager.get_vacancies_in_salary_range(
+        args.salary_min,
+        args.salary_max,
+        currency=args.currency,
+        employer_ids=tuple(args.employer) if args.employer else None,
+        keyword=args.keyword,
+        row_format="tuple",
+    )
+
+
+def _write(args: argparse.Namespace, columns: Sequence[str], rows: Iterable[Any]) -> None:
+    """Вывести строки через общий буферизованный вывод"""
+    with Pager(args.pager) as stream:
+        with OutputWriter(stream, columns, args.format, args.limit) as writer:
+            writer.write_rows(rows)
+
+
+def _export_params(db_manager: "DBManager", args: argparse.Namespace) -> Tuple[Any, ...]:
+    """Параметры запроса отчета подкоманды export"""
+    from src.db_manager import salary_range_params
+
+    if args.source == "vacancies_with_higher_salary":
+        return (db_manager.get_avg_salary(),)
+    if args.source == "vacancies_with_keyword":
+        if args.keyword is None:
+            raise ValueError("Для выгрузки vacancies_with_keyword нужен --keyword")
+        return (f"%{args.keyword.lower()}%",)
+    if args.source == "vacancies_in_salary_range":
+        return salary_range_params(
+            args.salary_min, args.salary_max, args.currency, args.employer, args.keyword
+        )
+    return ()
+
+
+def _export(args: argparse.Namespace) -> int:
+    """Подкоманда export: выгрузка через COPY TO STDOUT"""
+    from src.db_manager import DBManager
+
+    compress = args.gzip or (args.output is not None and args.output.endswith(".gz"))
+    try:
+        with DBManager(args.config, cache_size=0, raise_errors=True) as db_manager:
+            params = _export_params(db_manager, args)
+            with open_export_stream(args.output, compress) as stream:
+                db_manager.export(args.source, stream, args.format, params)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except Exception as e:
+        print(f"Ошибка выгрузки: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Сбор вакансий hh.ru и отчеты по ним. "
+        "Без подкоманды — сбор устаревших данных и интерактивное меню."
+    )
+    parser.add_argument(
+        "--config", default="config/database.ini", help="файл конфигурации БД"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE_HOURS,
+        help="допустимый возраст данных в часах (по умолчанию %(default)s)",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="собрать данные всех работодателей заново"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="профилировать стадии (HTTP, JSON, разбор, загрузка): cProfile, "
+        "стеки для flamegraph и выделения памяти по стадиям",
+    )
+    parser.add_argument(
+        "--profile-dir", default="profile", help="каталог результатов профилирования"
+    )
+    parser.add_argument(
+        "--metrics-file", help="записать метрики процесса в формате Prometheus в файл"
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, help="отдавать метрики по HTTP на 127.0.0.1:PORT/metrics"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    employers = argparse.ArgumentParser(add_help=False)
+    employers.add_argument(
+        "--employer", type=int, action="append", help="ID работодателя (можно несколько)"
+    )
+    employers.add_argument(
+        "--employers-file", help="файл со списком работодателей: ID и необязательный вес"
+    )
+    employers.add_argument(
+        "--employers-table", help="таблица БД со списком работодателей: TABLE[:COLUMN]"
+    )
+    employers.add_argument(
+        "--shard", help="обработать только шард i из N (i/N, нумерация с нуля)"
+    )
+
+    sync_parser = subparsers.add_parser(
+        "sync", parents=[employers], help="получить данные с hh.ru и загрузить в БД"
+    )
+    sync_parser.add_argument(
+        "--processes", type=int, default=1, help="количество процессов сбора"
+    )
+
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        parents=[employers],
+        help="обновлять данные по расписанию в фоне (до SIGINT/SIGTERM)",
+    )
+    daemon_parser.add_argument("--state", help="файл состояния расписания")
+    daemon_parser.add_argument(
+        "--concurrency", type=int, default=4, help="одновременных запросов к hh.ru"
+    )
+    daemon_parser.add_argument(
+        "--min-interval", type=float, help="минимальный интервал обновления, секунды"
+    )
+    daemon_parser.add_argument(
+        "--max-interval", type=float, help="максимальный интервал обновления, секунды"
+    )
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=FORMATS, default="text", help="формат вывода")
+    output.add_argument("--limit", type=int, help="максимальное количество строк")
+    output.add_argument("--pager", action="store_true", help="выводить через pager")
+
+    report_parser = subparsers.add_parser("report", parents=[output], help="вывести отчет")
+    report_parser.add_argument("name", choices=REPORTS, help="отчет")
+
+    search_parser = subparsers.add_parser("search", parents=[output], help="найти вакансии")
+    search_parser.add_argument("--keyword", help="ключевое слово в названии вакансии")
+    search_parser.add_argument("--salary-min", type=int, help="нижняя граница зарплаты")
+    search_parser.add_argument("--salary-max", type=int, help="верхняя граница зарплаты")
+    search_parser.add_argument("--currency", help="валюта зарплаты")
+    search_parser.add_argument(
+        "--employer", type=int, action="append", help="ID работодателя (можно несколько)"
+    )
+
+    export_parser = subparsers.add_parser(
+        "export", help="выгрузить таблицу или отчет через COPY TO STDOUT"
+    )
+    export_parser.add_argument(
+        "source",
+        help="таблица (employers, vacancies) или запрос отчета "
+        "(companies_and_vacancies_count, all_vacancies, avg_salary, "
+        "vacancies_with_higher_salary, vacancies_with_keyword, vacancies_in_salary_range)",
+    )
+    export_parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="csv", help="формат выгрузки"
+    )
+    export_parser.add_argument("--output", "-o", help="файл выгрузки (по умолчанию stdout)")
+    export_parser.add_argument(
+        "--gzip", action="store_true", help="сжать выгрузку (для файлов *.gz — всегда)"
+    )
+    export_parser.add_argument("--keyword", help="ключевое слово в названии вакансии")
+    export_parser.add_argument("--salary-min", type=int, help="нижняя граница зарплаты")
+    export_parser.add_argument("--salary-max", type=int, help="верхняя граница зарплаты")
+    export_parser.add_argument("--currency", help="валюта зарплаты")
+    export_parser.add_argument(
+        "--employer", type=int, action="append", help="ID работодателя (можно несколько)"
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Основная функция программы"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        from src import profiling
+
+        profiling.enable()
+    if args.metrics_port is not None:
+        from src.metrics import REGISTRY
+
+        server = REGISTRY.start_http_server(args.metrics_port)
+        host, port = server.server_address[:2]
+        print(f"Метрики доступны по адресу http://{host}:{port}/metrics", file=sys.stderr)
+    try:
+        return _run(parser, args)
+    finally:
+        if args.metrics_file:
+            from src.metrics import REGISTRY
+
+            REGISTRY.write_textfile(args.metrics_file)
+        if args.profile:
+            profiler = profiling.disable()
+            if profiler is not None:
+                profiler.write(args.profile_dir)
+                profiler.print_summary()
+                print(f"Результаты профилирования записаны в {args.profile_dir}", file=sys.stderr)
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Выполнить команду командной строки"""
+    if args.command is None:
+        employer_ids = EMPLOYER_IDS
+        if not args.refresh:
+            employer_ids = stale_employers(
+                EMPLOYER_IDS, timedelta(hours=args.max_age), args.config
+            )
+        if not employer_ids:
+            print("Данные актуальны, сбор пропущен")
+        elif not sync(employer_ids, args.config):
+            return 1
+        interactive_menu(args.config)
+        return 0
+
+    if args.command == "sync":
+        try:
+            employer_ids, weights = _employer_list(args)
+            return 0 if sync_shards(employer_ids, args.processes, weights, args.config) else 1
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    if args.command == "daemon":
+        try:
+            ok = run_daemon(
+                _employer_list(args)[0],
+                args.config,
+                args.state,
+                args.concurrency,
+                args.min_interval,
+                args.max_interval,
+            )
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+        return 0 if ok else 1
+
+    if args.command == "export":
+        return _export(args)
+
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit не может быть отрицательным")
+
+    from src.db_manager import VACANCY_COLUMNS, DBManager
+
+    try:
+        # Ошибка запроса не должна выглядеть как пустой результат:
+        # скрипт, вызвавший команду, различает их по коду возврата
+        with DBManager(args.config, cache_size=0, raise_errors=True) as db_manager:
+            if args.command == "report":
+                columns, rows = _report_rows(db_manager, args.name)
+            else:
+                columns, rows = VACANCY_COLUMNS, _search_rows(db_manager, args)
+            _write(args, columns, rows)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Получатель вывода (например, head) завершился раньше
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except Exception as e:
+        print(f"Ошибка при получении данных: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Выражения SQL для измерений, по которым строятся разбивки
+DIMENSION_COLUMNS: Dict[str, str] = {
+    "employer": "e.id",
+    "experience": "ex.name",
+    "employment": "em.name",
+    "currency": "v.currency",
+}
+# Названия групп для измерений, группируемых по ID: у разных
+# работодателей может быть одинаковое название
+DIMENSION_LABELS: Dict[str, str] = {
+    "employer": "e.name",
+}
+# Соединения с таблицами-справочниками, нужные только для своих измерений
+DIMENSION_JOINS: Dict[str, str] = {
+    "experience": "LEFT JOIN experience ex ON ex.id = v.experience_id",
+    "employment": "LEFT JOIN employment em ON em.id = v.employment_id",
+}
+DIMENSIONS: Tuple[str, ...] = tuple(DIMENSION_COLUMNS)
+DEFAULT_PERCENTILES: Tuple[float, ...] = (0.25, 0.5, 0.75, 0.9)
+
+
+class SalaryStats(NamedTuple):
+    """Статистика зарплат для одной группы вакансий"""
+
+    dimension: str
+    key: Optional[str]
+    count: int
+    min: Optional[float]
+    max: Optional[float]
+    avg: Optional[float]
+    percentiles: Tuple[float, ...]
+    histogram: Tuple[int, ...]
+    currency: Optional[str] = None
+
+
+def build_salary_analytics_query(
+    dimensions: Sequence[str] = DIMENSIONS, bins: int = 10, currency: bool = False
+) -> str:
+    """
+    Построить запрос, считающий все разбивки зарплат за один проход
+
+    Зарплаты в разных валютах несравнимы, поэтому каждая группа считается
+    отдельно по валютам: валюта входит в каждый набор GROUPING SETS, а
+    общий итог — набор из одной валюты (он же разбивка currency).
+    Гистограмма строится через width_bucket: корзина 0 содержит зарплаты
+    ниже нижней границы, корзина bins + 1 — не ниже верхней.
+
+    Столбцы результата: grouping_id, валюта, ключи измерений кроме
+    currency, затем статистика. Параметры запроса по порядку: валюта
+    (если currency=True), нижняя граница, верхняя граница, количество
+    корзин и массив перцентилей.
+
+    Args:
+        dimensions: измерения для разбивки
+        bins: количество корзин гистограммы
+        currency: добавить фильтр по валюте
+
+    Returns:
+        str: текст SQL-запроса
+    """
+    unknown = [d for d in dimensions if d not in DIMENSION_COLUMNS]
+    if unknown:
+        raise ValueError(f"Неизвестные измерения: {', '.join(unknown)}")
+    if bins <= 0:
+        raise ValueError("Количество корзин должно быть положительным")
+
+    grouped = _grouped_dimensions(dimensions)
+    columns = ["v.currency AS currency"] + [f"{DIMENSION_COLUMNS[d]} AS {d}" for d in grouped]
+    columns += [f"{DIMENSION_LABELS[d]} AS {d}_label" for d in grouped if d in DIMENSION_LABELS]
+    keys = [f"MAX({d}_label)" if d in DIMENSION_LABELS else d for d in grouped]
+    histogram = ", ".join(
+        f"COUNT(*) FILTER (WHERE bucket = {i})" for i in range(bins + 2)
+    )
+    grouping_sets = ", ".join(["(currency)"] + [f"({d}, currency)" for d in grouped])
+    joins = "\n            ".join(DIMENSION_JOINS[d] for d in grouped if d in DIMENSION_JOINS)
+    where = "AND v.currency = %s" if currency else ""
+
+    return f"""
+        WITH salaries AS (
+            SELECT
+                {", ".join(columns + [""])}
+                (COALESCE(v.salary_from, v.salary_to)
+                    + COALESCE(v.salary_to, v.salary_from)) / 2.0 AS salary
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            {joins}
+            WHERE (v.salary_from IS NOT NULL OR v.salary_to IS NOT NULL)
+            {where}
+        ),
+        bucketed AS (
+            SELECT *, width_bucket(salary, %s, %s, %s) AS bucket
+            FROM salaries
+        )
+        SELECT
+            {f"GROUPING({', '.join(grouped)})" if grouped else "0"} AS grouping_id,
+            {", ".join(["currency"] + keys + [""])}
+            COUNT(*),
+            MIN(salary),
+            MAX(salary),
+            AVG(salary),
+            percentile_cont(%s::float8[]) WITHIN GROUP (ORDER BY salary),
+            ARRAY[{histogram}]
+        FROM bucketed
+        GROUP BY GROUPING SETS ({grouping_sets})
+    """
+
+
+def _grouped_dimensions(dimensions: Sequence[str]) -> List[str]:
+    """Измерения со своим набором группировки (валюта входит в каждый набор)"""
+    return [d for d in dimensions if d != "currency"]
+
+
+def query_params(
+    percentiles: Sequence[float],
+    lower: float,
+    upper: float,
+    bins: int,
+    currency: Optional[str] = None,
+) -> Tuple[Any, ...]:
+    """
+    Собрать параметры для запроса build_salary_analytics_query
+
+    Параметры идут в порядке появления плейсхолдеров в тексте запроса.
+    """
+    if lower >= upper:
+        raise ValueError("Нижняя граница гистограммы должна быть меньше верхней")
+    params: Tuple[Any, ...] = ()
+    if currency is not None:
+        params += (currency,)
+    return params + (lower, upper, bins, list(percentiles))
+
+
+def parse_salary_analytics(
+    rows: Sequence[Sequence[Any]], dimensions: Sequence[str] = DIMENSIONS
+) -> Dict[str, List[SalaryStats]]:
+    """
+    Разобрать строки результата запроса в статистику по измерениям
+
+    Args:
+        rows: строки результата build_salary_analytics_query
+        dimensions: измерения, использованные при построении запроса
+
+    Returns:
+        Dict[str, List[SalaryStats]]: статистика по измерениям в разрезе
+        валют, итоги по валютам — под ключом "all"
+    """
+    # Бит измерения в GROUPING() равен 0, если строка сгруппирована по нему
+    grouped = _grouped_dimensions(dimensions)
+    full_mask = (1 << len(grouped)) - 1
+    by_mask = {
+        full_mask ^ (1 << (len(grouped) - 1 - i)): (i, d) for i, d in enumerate(grouped)
+    }
+
+    result: Dict[str, List[SalaryStats]] = {"all": []}
+    for d in dimensions:
+        result[d] = []
+
+    n = len(grouped)
+    for row in rows:
+        grouping_id, currency = row[0], row[1]
+        count, min_, max_, avg, percentiles, histogram = row[2 + n :]
+        stats = SalaryStats(
+            dimension="all",
+            key=None,
+            count=count,
+            min=float(min_) if min_ is not None else None,
+            max=float(max_) if max_ is not None else None,
+            avg=round(float(avg), 2) if avg is not None else None,
+            percentiles=tuple(percentiles or ()),
+            histogram=tuple(histogram),
+            currency=currency,
+        )
+        if grouping_id == full_mask:
+            result["all"].append(stats)
+            if "currency" in result:
+                result["currency"].append(stats._replace(dimension="currency", key=currency))
+        else:
+            index, dimension = by_mask[grouping_id]
+            result[dimension].append(stats._replace(dimension=dimension, key=row[2 + index]))
+
+    for stats in result.values():
+        stats.sort(key=lambda s: s.count, reverse=True)
+    return result
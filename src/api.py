@@ -1,13 +1,32 @@
+import math
 import os
 import sys
-from typing import Any, Dict, List, Optional, cast
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, cast
 
 import requests
 
+from src.dedup import SeenIds, unique
+from src.metrics import HTTP_BYTES, HTTP_LATENCY, HTTP_REQUESTS, HTTP_RETRIES
+from src.profiling import stage
+
 # Добавляем путь к исходному коду
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 
+class VacancyPage(NamedTuple):
+    """Страница выдачи вакансий работодателя"""
+
+    number: int
+    items: List[Dict[str, Any]]
+    pages: int
+
+    @property
+    def is_last(self) -> bool:
+        """Последняя страница выдачи"""
+        return self.number >= self.pages - 1
+
+
 class HHAPI:
     """Класс для взаимодействия с API HeadHunter"""
 
@@ -19,6 +38,37 @@ class HHAPI:
             {"User-Agent": "HH-Vacancies-API/1.0 (your-email@example.com)"}
         )
 
+    def _get(
+        self, endpoint: str, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Выполнить GET-запрос к API и учесть его в метриках
+
+        Args:
+            endpoint: имя метода API для меток метрик
+            url: адрес запроса
+            params: параметры запроса
+
+        Returns:
+            Dict: разобранный JSON ответа
+
+        Raises:
+            requests.RequestException: ошибка запроса или статус ответа
+        """
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with stage("http"):
+                response = self.session.get(url, params=params)
+                status = str(response.status_code)
+                HTTP_BYTES.inc(len(response.content), endpoint)
+                response.raise_for_status()
+            with stage("json"):
+                return cast(Dict[str, Any], response.json())
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - start, endpoint)
+            HTTP_REQUESTS.inc(1, endpoint, status)
+
     def get_employer(self, employer_id: int) -> Optional[Dict[str, Any]]:
         """
         Получить информацию о работодателе по ID
@@ -31,9 +81,7 @@ class HHAPI:
         """
         url = f"{self.BASE_URL}employers/{employer_id}"
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return cast(Dict[str, Any], response.json())
+            return self._get("employers", url)
         except requests.RequestException as e:
             print(f"Ошибка при получении данных работодателя {employer_id}: {e}")
             return None
@@ -61,45 +109,128 @@ class HHAPI:
         }
 
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return cast(Dict[str, Any], response.json())
+            return self._get("vacancies", url, params)
         except requests.RequestException as e:
             print(f"Ошибка при получении вакансий работодателя {employer_id}: {e}")
             return None
 
-    def get_all_vacancies(self, employer_id: int) -> List[Dict[str, Any]]:
+    def get_dictionaries(self) -> Optional[Dict[str, Any]]:
         """
-        Получить все вакансии работодателя (с пагинацией)
+        Получить справочники HH (опыт работы, тип занятости и другие)
+
+        Returns:
+            Dict со справочниками или None при ошибке
+        """
+        url = f"{self.BASE_URL}dictionaries"
+        try:
+            return self._get("dictionaries", url)
+        except requests.RequestException as e:
+            print(f"Ошибка при получении справочников: {e}")
+            return None
+
+    def iter_pages(
+        self,
+        employer_id: int,
+        start_page: int = 0,
+        seen: Optional[SeenIds] = None,
+        per_page: int = 100,
+    ) -> Iterator[VacancyPage]:
+        """
+        Постранично получать вакансии работодателя без повторов
+
+        Пока идет пагинация, выдача HH может сдвигаться: появившиеся
+        вакансии сдвигают остальные на следующие страницы (возникают
+        повторы), а закрытые — на уже пройденные (часть вакансий
+        пропускается). Повторы отбрасываются по множеству seen.
+        Уменьшение поля found между страницами означает сдвиг назад:
+        тогда предыдущие страницы, на которые могли уйти вакансии,
+        запрашиваются повторно, и их вакансии добавляются к текущей.
+
+        Если страницу получить не удалось, перебор прекращается; сбор
+        завершен полностью, только если последняя выданная страница
+        is_last.
 
         Args:
             employer_id: ID работодателя
+            start_page: номер первой страницы (продолжение прерванного сбора)
+            seen: множество уже полученных id, общее для нескольких вызовов
+            per_page: количество вакансий на странице
 
-        Returns:
-            List всех вакансий работодателя
+        Yields:
+            VacancyPage: страницы выдачи
         """
-        all_vacancies: List[Dict[str, Any]] = []
-        page = 0
+        seen = seen if seen is not None else SeenIds()
+        found: Optional[int] = None
+        page = start_page
 
         while True:
-            data = self.get_vacancies(employer_id, page)
+            data = self.get_vacancies(employer_id, page, per_page)
             if not data:
                 break
 
+            pages = data.get("pages", 0)
             vacancies = data.get("items", [])
             if not vacancies:
+                # Пустая страница — конец выдачи
+                yield VacancyPage(page, [], page)
                 break
 
-            all_vacancies.extend(vacancies)
+            items: List[Dict[str, Any]] = []
+            current = data.get("found")
+            if found is not None and current is not None and current < found:
+                first = max(start_page, page - math.ceil((found - current) / per_page))
+                print(
+                    f"Выдача работодателя {employer_id} сместилась на {found - current} "
+                    f"вакансий, повторный запрос страниц {first}-{page - 1}"
+                )
+                for missed_page in range(first, page):
+                    HTTP_RETRIES.inc(1, "vacancies")
+                    missed = self.get_vacancies(employer_id, missed_page, per_page)
+                    if missed:
+                        items.extend(unique(missed.get("items", []), seen))
+            if current is not None:
+                found = current
+
+            items.extend(unique(vacancies, seen))
+            yield VacancyPage(page, items, pages)
 
             # Проверяем, есть ли следующая страница
-            pages = data.get("pages", 0)
             if page >= pages - 1:
                 break
 
             page += 1
 
-        return all_vacancies
+    def iter_vacancies(
+        self, employer_id: int, seen: Optional[SeenIds] = None, per_page: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Постранично получать вакансии работодателя без повторов (см. iter_pages)
+
+        Args:
+            employer_id: ID работодателя
+            seen: множество уже полученных id, общее для нескольких вызовов
+            per_page: количество вакансий на странице
+
+        Yields:
+            Dict: вакансии работодателя
+        """
+        for page in self.iter_pages(employer_id, seen=seen, per_page=per_page):
+            yield from page.items
+
+    def get_all_vacancies(
+        self, employer_id: int, seen: Optional[SeenIds] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить все вакансии работодателя (с пагинацией)
+
+        Args:
+            employer_id: ID работодателя
+            seen: множество уже полученных id (см. iter_vacancies)
+
+        Returns:
+            List всех вакансий работодателя
+        """
+        return list(self.iter_vacancies(employer_id, seen))
 
 
 def get_employer_data(api: HHAPI, employer_ids: List[int]) -> Dict[int, Dict[str, Any]]:
@@ -135,8 +266,10 @@ def get_vacancies_data(
         Dict с вакансиями для каждого работодателя
     """
     vacancies: Dict[int, List[Dict[str, Any]]] = {}
-    for emp_id in employer_ids:
-        emp_vacancies = api.get_all_vacancies(emp_id)
+    # Общее множество id отбрасывает повторы по всему сбору
+    seen = SeenIds()
+    for emp_id in dict.fromkeys(employer_ids):
+        emp_vacancies = api.get_all_vacancies(emp_id, seen)
         vacancies[emp_id] = emp_vacancies
         print(f"Получено {len(emp_vacancies)} вакансий для работодателя {emp_id}")
     return vacancies
@@ -0,0 +1,269 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2  # type: ignore
+from psycopg2 import extensions
+
+from src.database import read_config
+from src.db_manager import QUERIES, VacancyResult, build_vacancy_rows, salary_range_params
+
+
+async def _wait(connection: Any) -> None:
+    """
+    Дождаться завершения операции на асинхронном соединении psycopg2
+
+    Соединение опрашивается через poll(), а ожидание готовности сокета
+    регистрируется в цикле событий, не блокируя его.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            return
+
+        future = loop.create_future()
+
+        def ready() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        fd = connection.fileno()
+        if state == extensions.POLL_READ:
+            loop.add_reader(fd, ready)
+            try:
+                await future
+            finally:
+                loop.remove_reader(fd)
+        elif state == extensions.POLL_WRITE:
+            loop.add_writer(fd, ready)
+            try:
+                await future
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise psycopg2.OperationalError(f"Неожиданное состояние соединения: {state}")
+
+
+class AsyncDBManager:
+    """Асинхронный вариант DBManager на неблокирующих соединениях psycopg2"""
+
+    def __init__(
+        self,
+        config_file: str = "config/database.ini",
+        max_connections: int = 5,
+        query_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Инициализация асинхронного менеджера базы данных
+
+        Args:
+            config_file: путь к файлу конфигурации
+            max_connections: максимальное число одновременно выполняемых запросов
+            query_timeout: таймаут запроса в секундах (None — без таймаута)
+        """
+        self.config = read_config(config_file)
+        self.query_timeout = query_timeout
+        self.max_connections = max_connections
+        # Семафор создается в работающем цикле событий при первом запросе
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: List[Any] = []
+
+    async def __aenter__(self) -> "AsyncDBManager":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def _acquire(self) -> Any:
+        """Взять свободное соединение или открыть новое"""
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.closed:
+                return connection
+        connection = psycopg2.connect(
+            host=self.config["host"],
+            database=self.config["database"],
+            user=self.config["user"],
+            password=self.config["password"],
+            port=self.config["port"],
+            async_=True,
+        )
+        try:
+            await _wait(connection)
+        except BaseException:
+            # Таймаут или отмена во время подключения: соединение закрывается
+            connection.close()
+            raise
+        return connection
+
+    async def _run(self, query: str, params: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        """Выполнить запрос на свободном соединении"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        async with self._semaphore:
+            connection = await self._acquire()
+            try:
+                cursor = connection.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                await _wait(connection)
+                rows = cursor.fetchall()
+                cursor.close()
+            except BaseException:
+                # При отмене или ошибке прерываем запрос на сервере,
+                # а соединение в неизвестном состоянии не переиспользуем
+                if not connection.closed:
+                    try:
+                        connection.cancel()
+                    except psycopg2.Error:
+                        pass
+                    connection.close()
+                raise
+            self._idle.append(connection)
+            return rows
+
+    async def _fetch(
+        self, name: str, params: Tuple[Any, ...] = (), timeout: Optional[float] = None
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Выполнить запрос из QUERIES с таймаутом
+
+        Args:
+            name: имя запроса
+            params: параметры запроса
+            timeout: таймаут в секундах, по умолчанию — query_timeout
+
+        Returns:
+            List[Tuple]: строки результата
+
+        Raises:
+            asyncio.TimeoutError: если запрос не уложился в таймаут
+        """
+        timeout = self.query_timeout if timeout is None else timeout
+        return await asyncio.wait_for(self._run(QUERIES[name], params), timeout)
+
+    def close(self) -> None:
+        """Закрыть все свободные соединения"""
+        while self._idle:
+            self._idle.pop().close()
+
+    async def get_companies_and_vacancies_count(self) -> List[Dict[str, Any]]:
+        """
+        Получить список всех компаний и количество вакансий у каждой компании
+
+        Returns:
+            List[Dict]: список словарей с данными компаний и количеством вакансий
+        """
+        rows = await self._fetch("companies_and_vacancies_count")
+        return [{"company": row[0], "vacancies_count": row[1]} for row in rows]
+
+    async def get_all_vacancies(self, row_format: str = "dict") -> VacancyResult:
+        """
+        Получить список всех вакансий
+
+        Args:
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате
+        """
+        return build_vacancy_rows(await self._fetch("all_vacancies"), row_format)
+
+    async def get_avg_salary(self) -> float:
+        """
+        Получить среднюю зарплату по вакансиям
+
+        Returns:
+            float: средняя зарплата
+        """
+        rows = await self._fetch("avg_salary")
+        if rows and rows[0][0]:
+            return round(float(rows[0][0]), 2)
+        return 0.0
+
+    async def get_vacancies_with_higher_salary(self, row_format: str = "dict") -> VacancyResult:
+        """
+        Получить список всех вакансий, у которых зарплата выше средней
+
+        Args:
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате
+        """
+        avg_salary = await self.get_avg_salary()
+        rows = await self._fetch("vacancies_with_higher_salary", (avg_salary,))
+        return build_vacancy_rows(rows, row_format)
+
+    async def get_vacancies_with_keyword(
+        self, keyword: str, row_format: str = "dict"
+    ) -> VacancyResult:
+        """
+        Получить список всех вакансий, в названии которых содержится ключевое слово
+
+        Args:
+            keyword: ключевое слово для поиска
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате
+        """
+        rows = await self._fetch("vacancies_with_keyword", (f"%{keyword.lower()}%",))
+        return build_vacancy_rows(rows, row_format)
+
+    async def get_vacancies_in_salary_range(
+        self,
+        salary_min: Optional[int] = None,
+        salary_max: Optional[int] = None,
+        currency: Optional[str] = None,
+        employer_ids: Optional[Sequence[int]] = None,
+        keyword: Optional[str] = None,
+        row_format: str = "dict",
+    ) -> VacancyResult:
+        """
+        Получить вакансии, зарплатная вилка которых пересекается с диапазоном
+
+        Args:
+            salary_min: нижняя граница диапазона, None — открытая
+            salary_max: верхняя граница диапазона, None — открытая
+            currency: учитывать только вакансии в этой валюте
+            employer_ids: учитывать только вакансии этих работодателей
+            keyword: ключевое слово в названии вакансии
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате
+        """
+        params = salary_range_params(salary_min, salary_max, currency, employer_ids, keyword)
+        rows = await self._fetch("vacancies_in_salary_range", params)
+        return build_vacancy_rows(rows, row_format)
+
+    async def get_dashboard(self, keyword: str) -> Dict[str, Any]:
+        """
+        Получить данные для сводной страницы, выполняя запросы одновременно
+
+        Время ответа определяется самым медленным запросом. Если один
+        из запросов завершился ошибкой, остальные отменяются.
+
+        Args:
+            keyword: ключевое слово для поиска вакансий
+
+        Returns:
+            Dict: компании с количеством вакансий, средняя зарплата
+            и результаты поиска
+        """
+        tasks = [
+            asyncio.ensure_future(self.get_companies_and_vacancies_count()),
+            asyncio.ensure_future(self.get_avg_salary()),
+            asyncio.ensure_future(self.get_vacancies_with_keyword(keyword)),
+        ]
+        try:
+            companies, avg_salary, vacancies = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return {"companies": companies, "avg_salary": avg_salary, "vacancies": vacancies}
@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Канал LISTEN/NOTIFY, через который процессы сообщают о новой загрузке данных
+NOTIFY_CHANNEL = "hh_data_loaded"
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def current_generation() -> int:
+    """Текущее поколение загрузки данных в этом процессе"""
+    return _generation
+
+
+def bump_generation() -> int:
+    """
+    Увеличить поколение загрузки данных
+
+    Вызывается после каждой загрузки: все результаты, закэшированные
+    в предыдущих поколениях, становятся недействительными.
+
+    Returns:
+        int: новое поколение
+    """
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        return _generation
+
+
+class QueryCache:
+    """LRU-кэш результатов запросов с инвалидацией по поколению загрузки"""
+
+    def __init__(self, max_size: int = 128) -> None:
+        """
+        Инициализация кэша
+
+        Args:
+            max_size: максимальное количество хранимых результатов
+        """
+        if max_size <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._generation = current_generation()
+        self._lock = threading.Lock()
+
+    def _check_generation(self) -> None:
+        """Сбросить кэш, если с момента заполнения была новая загрузка"""
+        generation = current_generation()
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: Hashable) -> Tuple[bool, Optional[Any]]:
+        """
+        Получить результат из кэша
+
+        Args:
+            key: ключ запроса (метод и аргументы)
+
+        Returns:
+            Tuple[bool, Any]: признак попадания и сохраненное значение
+        """
+        with self._lock:
+            self._check_generation()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Сохранить результат в кэше, вытесняя самый давний при переполнении
+
+        Args:
+            key: ключ запроса (метод и аргументы)
+            value: результат запроса
+            generation: поколение загрузки, в котором начался запрос;
+                если с тех пор была новая загрузка, результат устарел
+                и не сохраняется
+        """
+        with self._lock:
+            self._check_generation()
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очистить кэш"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
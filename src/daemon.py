@@ -0,0 +1,217 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.api import HHAPI
+from src.database import DatabaseManager
+from src.models import Employer, Vacancy
+from src.scheduler import DEFAULT_STATE_FILE, Scheduler
+
+# Результат запроса данных работодателя: данные работодателя, его вакансии
+# и признак полного сбора (получена последняя страница выдачи)
+FetchResult = Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], bool]
+
+# Максимальная пауза между проверками расписания, секунды
+POLL_INTERVAL = 60.0
+
+
+def vacancy_fingerprint(vacancies: List[Dict[str, Any]]) -> str:
+    """
+    Отпечаток набора вакансий работодателя
+
+    Меняется при появлении и закрытии вакансий, а также при изменении
+    их названия или зарплаты.
+
+    Args:
+        vacancies: вакансии в формате JSON HH
+
+    Returns:
+        str: шестнадцатеричный хеш
+    """
+    digest = hashlib.sha1()
+    for vacancy in sorted(vacancies, key=lambda v: str(v.get("id"))):
+        salary = vacancy.get("salary") or {}
+        digest.update(
+            f"{vacancy.get('id')}\t{vacancy.get('name')}\t{salary.get('from')}\t"
+            f"{salary.get('to')}\t{salary.get('currency')}\n".encode()
+        )
+    return digest.hexdigest()
+
+
+class SyncDaemon:
+    """
+    Фоновая синхронизация вакансий по расписанию
+
+    Держит одну сессию HHAPI и одно соединение с базой данных. Данные
+    работодателей, которых пора обновить, запрашиваются параллельно,
+    не больше concurrency одновременно (это общий бюджет запросов к HH).
+    Результат каждого работодателя загружается отдельной транзакцией,
+    как только получен, а освободившееся место сразу занимает следующий
+    работодатель из расписания: медленный или крупный работодатель
+    не задерживает остальных. Расписание сохраняется в файл после
+    каждой загрузки.
+    """
+
+    def __init__(
+        self,
+        api: HHAPI,
+        db_manager: DatabaseManager,
+        scheduler: Scheduler,
+        state_file: str = DEFAULT_STATE_FILE,
+        concurrency: int = 4,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        """
+        Инициализация демона
+
+        Args:
+            api: сессия HHAPI
+            db_manager: менеджер базы данных с созданными таблицами
+            scheduler: расписание обновлений
+            state_file: файл состояния расписания
+            concurrency: максимальное количество одновременных запросов
+                данных работодателей
+            poll_interval: максимальная пауза между проверками расписания
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency должен быть положительным")
+        self.api = api
+        self.db_manager = db_manager
+        self.scheduler = scheduler
+        self.state_file = state_file
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix="hh-sync")
+        # Запросы в работе: future -> ID работодателя
+        self._pending: Dict["Future[FetchResult]", int] = {}
+
+    def close(self) -> None:
+        """Остановить потоки запросов и отключиться от базы данных"""
+        self._executor.shutdown()
+        self.db_manager.disconnect()
+
+    def _fetch(self, employer_id: int) -> FetchResult:
+        """Запросить данные работодателя и все его вакансии"""
+        vacancies: List[Dict[str, Any]] = []
+        try:
+            employer = self.api.get_employer(employer_id)
+            if employer is None:
+                return None, [], False
+            finished = False
+            for page in self.api.iter_pages(employer_id):
+                vacancies.extend(page.items)
+                finished = page.is_last
+            if not finished:
+                print(f"Сбор вакансий работодателя {employer_id} прерван, будет повторен")
+            return employer, vacancies, finished
+        except Exception as e:
+            print(f"Ошибка при обновлении работодателя {employer_id}: {e}")
+            return None, [], False
+
+    def _submit(self, now: Optional[float] = None) -> int:
+        """
+        Запустить запросы работодателей, которых пора обновить, на свободные места
+
+        Returns:
+            int: количество запущенных запросов
+        """
+        free = self.concurrency - len(self._pending)
+        if free <= 0:
+            return 0
+        due = self.scheduler.due(now, free, exclude=self._pending.values())
+        for employer_id in due:
+            self._pending[self._executor.submit(self._fetch, employer_id)] = employer_id
+        return len(due)
+
+    def _complete(
+        self, futures: Iterable["Future[FetchResult]"], now: Optional[float] = None
+    ) -> None:
+        """Загрузить результаты завершившихся запросов и сохранить расписание"""
+        for future in futures:
+            employer_id = self._pending.pop(future)
+            self._load(employer_id, *future.result(), now=now)
+        try:
+            self.scheduler.save(self.state_file)
+        except OSError as e:
+            print(f"Не удалось сохранить состояние расписания: {e}")
+
+    def _load(
+        self,
+        employer_id: int,
+        employer: Optional[Dict[str, Any]],
+        vacancies: List[Dict[str, Any]],
+        finished: bool,
+        now: Optional[float] = None,
+    ) -> None:
+        """Загрузить данные одного работодателя и учесть результат в расписании"""
+        if employer is None:
+            self.scheduler.record_failure(employer_id, now)
+            return
+        batch = Vacancy.from_json_batch(vacancies, self.db_manager.projection)
+        try:
+            self.db_manager.load_batch([Employer.from_json(employer)], batch)
+        except Exception:
+            # Соединение могло оборваться — следующая загрузка подключится заново
+            self.db_manager.disconnect()
+            self.scheduler.record_failure(employer_id, now)
+            return
+        if finished:
+            self.db_manager.mark_synced([employer_id])
+            self.scheduler.record(employer_id, vacancy_fingerprint(vacancies), now)
+        else:
+            # Полученные страницы загружены, но сбор не отмечается
+            # завершенным, а отпечаток неполного набора не сохраняется
+            self.scheduler.record_failure(employer_id, now)
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """
+        Обновить работодателей, которых пора обновить, не больше concurrency
+
+        Результат каждого работодателя загружается по мере получения.
+
+        Args:
+            now: текущее время, по умолчанию time.time()
+
+        Returns:
+            int: количество работодателей, обновление которых запускалось
+        """
+        started = self._submit(now)
+        self._complete(as_completed(list(self._pending)), now)
+        return started
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Обновлять работодателей по расписанию до установки stop
+
+        После stop запросы, которые еще не начались, отменяются,
+        а начавшиеся дожидаются и загружаются.
+
+        Args:
+            stop: событие остановки (например, по сигналу SIGTERM)
+        """
+        while not stop.is_set():
+            self._submit()
+            timeout = self.poll_interval
+            if len(self._pending) < self.concurrency:
+                wakeup = self.scheduler.next_wakeup(exclude=self._pending.values())
+                if wakeup is not None:
+                    timeout = min(max(wakeup - time.time(), 0.0), timeout)
+            if self._pending:
+                done, _ = wait(self._pending, timeout, FIRST_COMPLETED)
+                if done:
+                    self._complete(done)
+            else:
+                stop.wait(timeout)
+        for future in list(self._pending):
+            if future.cancel():
+                del self._pending[future]
+        if self._pending:
+            self._complete(as_completed(list(self._pending)))
@@ -1,13 +1,116 @@
 import configparser
-from typing import Dict, List, Optional
+from datetime import timedelta
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 import psycopg2
 from psycopg2 import sql
-
-from src.models import Employer, Vacancy
-
-
-def _read_config(config_file: str) -> Dict[str, str]:
+from psycopg2.extras import execute_values
+
+from src.cache import NOTIFY_CHANNEL, bump_generation
+from src.dictionaries import LOOKUP_DICTIONARIES, load_dictionaries
+from src.encoding import compress_text
+from src.metrics import timed_batch
+from src.models import Employer, LookupKey, Vacancy, VacancyBatch
+from src.profiling import stage
+from src.projection import OPTIONAL_FIELDS, Projection, get_projection
+
+_UPSERT_EMPLOYERS = """
+    INSERT INTO employers (id, name, url, alternate_url, description)
+    VALUES %s
+    ON CONFLICT (id) DO UPDATE SET
+    name = EXCLUDED.name,
+    url = EXCLUDED.url,
+    alternate_url = EXCLUDED.alternate_url,
+    description = EXCLUDED.description
+"""
+
+# Типы столбцов таблицы vacancies; какие из них создаются, задает профиль проекции
+_VACANCY_COLUMN_TYPES: Dict[str, str] = {
+    "id": "INTEGER PRIMARY KEY",
+    "name": "VARCHAR(255) NOT NULL",
+    "url": "TEXT",
+    "alternate_url": "TEXT",
+    "employer_id": "INTEGER REFERENCES employers(id) ON DELETE CASCADE",
+    "salary_from": "INTEGER",
+    "salary_to": "INTEGER",
+    "currency": "VARCHAR(10)",
+    "salary_gross": "BOOLEAN",
+    "experience": "SMALLINT REFERENCES experience(id)",
+    "employment": "SMALLINT REFERENCES employment(id)",
+}
+
+# Опыт работы и тип занятости хранятся кодами таблиц-справочников
+_VACANCY_COLUMN_NAMES: Dict[str, str] = {
+    name: f"{name}_id" for name in LOOKUP_DICTIONARIES
+}
+
+# Таблица-справочник: код SMALLINT, ID справочника HH и отображаемое название
+_CREATE_LOOKUP = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        hh_id VARCHAR(50) UNIQUE,
+        name VARCHAR(100) NOT NULL UNIQUE
+    )
+"""
+
+# Зарплатная вилка как диапазон int4range для поиска пересечений по GiST-индексу:
+# отсутствующая граница — открытая, перевернутая вилка упорядочивается,
+# без обеих границ — NULL
+_ADD_SALARY_RANGE = """
+    ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_range int4range
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN salary_from IS NULL AND salary_to IS NULL THEN NULL
+            WHEN salary_from > salary_to THEN int4range(salary_to, salary_from, '[]')
+            ELSE int4range(salary_from, salary_to, '[]')
+        END
+    ) STORED
+"""
+
+
+def _vacancy_column(name: str) -> str:
+    """Имя столбца таблицы vacancies для поля вакансии"""
+    return _VACANCY_COLUMN_NAMES.get(name, name)
+
+
+def _upsert_vacancies(columns: Sequence[str], values: str = "%s") -> str:
+    """
+    Запрос вставки или обновления вакансий
+
+    Args:
+        columns: поля вакансии в порядке значений
+        values: шаблон VALUES — %s для execute_values или кортеж параметров
+
+    Returns:
+        str: текст запроса
+    """
+    columns = [_vacancy_column(c) for c in columns]
+    updates = ",\n    ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != "id")
+    return f"""
+    INSERT INTO vacancies ({", ".join(columns)})
+    VALUES {values}
+    ON CONFLICT (id) DO UPDATE SET
+    {updates}
+"""
+
+
+# Ключ advisory-блокировки создания схемы
+_SCHEMA_LOCK = 0x68685F7363  # "hh_sc"
+
+# Описания вакансий хранятся сжатыми zlib в отдельной таблице, чтобы
+# строки vacancies оставались узкими, а отчеты их не читали
+_UPSERT_DESCRIPTIONS = """
+    INSERT INTO vacancy_descriptions (vacancy_id, description)
+    VALUES %s
+    ON CONFLICT (vacancy_id) DO UPDATE SET
+    description = EXCLUDED.description
+"""
+
+_DELETE_DESCRIPTIONS = "DELETE FROM vacancy_descriptions WHERE vacancy_id = ANY(%s)"
+
+
+def read_config(config_file: str) -> Dict[str, str]:
     """Чтение конфигурации из файла"""
     config = configparser.ConfigParser()
     config.read(config_file)
@@ -23,28 +126,31 @@ def _read_config(config_file: str) -> Dict[str, str]:
 class DatabaseManager:
     """Класс для управления базой данных PostgreSQL"""
 
-    def __init__(self, config_file: str = 'config/database.ini') -> None:
+    def __init__(
+        self, config_file: str = 'config/database.ini', projection: Optional[Projection] = None
+    ) -> None:
         """
         Инициализация менеджера базы данных
 
         Args:
             config_file: путь к файлу конфигурации
+            projection: профиль проекции полей вакансий; по умолчанию
+                берется из параметра fields секции [projection] конфигурации
         """
         self.config_file = config_file
         self.config = self._read_config(config_file)
+        self.projection = projection or self._read_projection(config_file)
         self.connection: Optional[psycopg2.extensions.connection] = None
 
     def _read_config(self, config_file: str) -> Dict[str, str]:
         """Чтение конфигурации из файла"""
+        return read_config(config_file)
+
+    def _read_projection(self, config_file: str) -> Projection:
+        """Чтение профиля проекции из файла конфигурации"""
         config = configparser.ConfigParser()
         config.read(config_file)
-        return {
-            "host": config["postgresql"]["host"],
-            "database": config["postgresql"]["database"],
-            "user": config["postgresql"]["user"],
-            "password": config["postgresql"]["password"],
-            "port": config["postgresql"]["port"],
-        }
+        return get_projection(config.get("projection", "fields", fallback=None))
 
     def _get_connection_string(self, db_name: Optional[str] = None) -> str:
         """Преобразование конфигурации в строку подключения"""
@@ -124,14 +230,29 @@ class DatabaseManager:
             print(f"Ошибка при создании базы данных: {e}")
             raise
 
-    def create_tables(self) -> None:
-        """Создание таблиц в базе данных"""
+    def create_tables(
+        self, dictionaries: Optional[Dict[str, List[Dict[str, str]]]] = None
+    ) -> None:
+        """
+        Создание таблиц в базе данных
+
+        Args:
+            dictionaries: справочники опыта работы и типа занятости
+                (см. src.dictionaries.load_dictionaries); по умолчанию —
+                из локального кэша или офлайн-копии
+        """
         if not self.connection:
             self.connect()
+        if dictionaries is None:
+            dictionaries = load_dictionaries()
 
         try:
             if self.connection:
                 with self.connection.cursor() as cursor:
+                    # Процессы шардов создают схему одновременно: параллельные
+                    # CREATE TABLE IF NOT EXISTS могут завершиться ошибкой
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (_SCHEMA_LOCK,))
+
                     # Таблица employers
                     cursor.execute(
                         """
@@ -145,26 +266,75 @@ class DatabaseManager:
                     """
                     )
 
-                    # Таблица vacancies
+                    # Таблицы-справочники experience и employment
+                    lookups = [t for t in LOOKUP_DICTIONARIES if t in self.projection]
+                    for table in lookups:
+                        cursor.execute(_CREATE_LOOKUP.format(table=table))
+                        self._fill_lookup(cursor, table, dictionaries.get(table, []))
+
+                    # Таблица vacancies: только столбцы профиля проекции
+                    columns = ",\n".join(
+                        f"{_vacancy_column(name)} {_VACANCY_COLUMN_TYPES[name]}"
+                        for name in self.projection.vacancy_columns
+                    )
+                    cursor.execute(f"CREATE TABLE IF NOT EXISTS vacancies (\n{columns}\n)")
+                    for table in lookups:
+                        self._migrate_lookup(cursor, table)
+                    # Таблица могла быть создана с более узким профилем
+                    for name in self.projection.vacancy_columns:
+                        if name in OPTIONAL_FIELDS:
+                            cursor.execute(
+                                f"ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS "
+                                f"{_vacancy_column(name)} {_VACANCY_COLUMN_TYPES[name]}"
+                            )
+
+                    # Таблица employer_sync: время последнего сбора по работодателям
                     cursor.execute(
                         """
-                        CREATE TABLE IF NOT EXISTS vacancies (
-                            id INTEGER PRIMARY KEY,
-                            name VARCHAR(255) NOT NULL,
-                            url TEXT,
-                            alternate_url TEXT,
-                            employer_id INTEGER REFERENCES employers(id) ON DELETE CASCADE,
-                            salary_from INTEGER,
-                            salary_to INTEGER,
-                            currency VARCHAR(10),
-                            salary_gross BOOLEAN,
-                            description TEXT,
-                            experience VARCHAR(100),
-                            employment VARCHAR(100)
+                        CREATE TABLE IF NOT EXISTS employer_sync (
+                            employer_id INTEGER PRIMARY KEY,
+                            synced_at TIMESTAMPTZ NOT NULL DEFAULT now()
                         )
                     """
                     )
 
+                    # Таблица harvest_checkpoints: загруженные страницы
+                    # незавершенного сбора по работодателям
+                    cursor.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS harvest_checkpoints (
+                            employer_id INTEGER NOT NULL,
+                            page INTEGER NOT NULL,
+                            loaded_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                            PRIMARY KEY (employer_id, page)
+                        )
+                    """
+                    )
+
+                    cursor.execute(_ADD_SALARY_RANGE)
+                    cursor.execute(
+                        "CREATE INDEX IF NOT EXISTS vacancies_salary_range_idx "
+                        "ON vacancies USING GIST (salary_range)"
+                    )
+
+                    if "description" in self.projection:
+                        # Таблица vacancy_descriptions: сжатые описания вакансий.
+                        # STORAGE EXTERNAL отключает повторное сжатие на сервере
+                        cursor.execute(
+                            """
+                            CREATE TABLE IF NOT EXISTS vacancy_descriptions (
+                                vacancy_id INTEGER PRIMARY KEY
+                                    REFERENCES vacancies(id) ON DELETE CASCADE,
+                                description BYTEA NOT NULL
+                            )
+                        """
+                        )
+                        cursor.execute(
+                            "ALTER TABLE vacancy_descriptions "
+                            "ALTER COLUMN description SET STORAGE EXTERNAL"
+                        )
+                        self._migrate_descriptions(cursor)
+
                     self.connection.commit()
                     print("Таблицы созданы успешно")
         except Exception as e:
@@ -185,7 +355,7 @@ class DatabaseManager:
 
         try:
             if self.connection:
-                with self.connection.cursor() as cursor:
+                with self.connection.cursor() as cursor, timed_batch("insert_employer", 1):
                     cursor.execute(
                         """
                         INSERT INTO employers (id, name, url, alternate_url, description)
@@ -220,56 +390,298 @@ class DatabaseManager:
         if not self.connection:
             self.connect()
 
-        salary_from = vacancy.salary.from_ if vacancy.salary else None
-        salary_to = vacancy.salary.to if vacancy.salary else None
-        currency = vacancy.salary.currency if vacancy.salary else None
-        salary_gross = vacancy.salary.gross if vacancy.salary else None
-
         try:
             if self.connection:
-                with self.connection.cursor() as cursor:
+                with self.connection.cursor() as cursor, timed_batch("insert_vacancy", 1):
+                    columns = self.projection.vacancy_columns
+                    values = {
+                        "id": vacancy.id,
+                        "name": vacancy.name,
+                        "url": vacancy.url,
+                        "alternate_url": vacancy.alternate_url,
+                        "employer_id": vacancy.employer_id,
+                        "salary_from": vacancy.salary_from,
+                        "salary_to": vacancy.salary_to,
+                        "currency": vacancy.currency,
+                        "salary_gross": vacancy.gross,
+                        "experience": vacancy.experience,
+                        "employment": vacancy.employment,
+                    }
+                    keys = {
+                        t: [(getattr(vacancy, f"{t}_hh_id"), values[t])]
+                        for t in LOOKUP_DICTIONARIES
+                        if t in self.projection
+                    }
+                    codes = self._lookup_codes(cursor, keys)
+                    (row,) = self._encode_lookups(
+                        codes, [tuple(values[name] for name in columns)], keys
+                    )
                     cursor.execute(
-                        """
-                        INSERT INTO vacancies (
-                            id, name, url, alternate_url, employer_id,
-                            salary_from, salary_to, currency, salary_gross,
-                            description, experience, employment
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (id) DO UPDATE SET
-                        name = EXCLUDED.name,
-                        url = EXCLUDED.url,
-                        alternate_url = EXCLUDED.alternate_url,
-                        employer_id = EXCLUDED.employer_id,
-                        salary_from = EXCLUDED.salary_from,
-                        salary_to = EXCLUDED.salary_to,
-                        currency = EXCLUDED.currency,
-                        salary_gross = EXCLUDED.salary_gross,
-                        description = EXCLUDED.description,
-                        experience = EXCLUDED.experience,
-                        employment = EXCLUDED.employment
-                    """,
-                        (
-                            vacancy.id,
-                            vacancy.name,
-                            vacancy.url,
-                            vacancy.alternate_url,
-                            vacancy.employer_id,
-                            salary_from,
-                            salary_to,
-                            currency,
-                            salary_gross,
-                            vacancy.description,
-                            vacancy.experience,
-                            vacancy.employment,
-                        ),
+                        _upsert_vacancies(columns, f"({', '.join(['%s'] * len(columns))})"),
+                        row,
                     )
+                    if "description" in self.projection:
+                        self._write_descriptions(
+                            cursor, [(vacancy.id, vacancy.compressed_description)]
+                        )
                     self.connection.commit()
         except Exception as e:
             if self.connection:
                 self.connection.rollback()
             print(f"Ошибка при вставке вакансии {vacancy.id}: {e}")
 
+    def _write_descriptions(
+        self, cursor: Any, descriptions: List[Tuple[int, Optional[bytes]]], page_size: int = 1000
+    ) -> None:
+        """
+        Записать сжатые описания вакансий, удалив описания, ставшие пустыми
+
+        Args:
+            cursor: курсор текущей транзакции
+            descriptions: пары (id вакансии, сжатое описание или None)
+            page_size: количество строк в одном INSERT
+        """
+        present = [(i, psycopg2.Binary(d)) for i, d in descriptions if d is not None]
+        missing = [i for i, d in descriptions if d is None]
+        if present:
+            execute_values(cursor, _UPSERT_DESCRIPTIONS, present, page_size=page_size)
+        if missing:
+            cursor.execute(_DELETE_DESCRIPTIONS, (missing,))
+
+    def _has_vacancy_column(self, cursor: Any, column: str) -> bool:
+        """Проверить, есть ли в таблице vacancies столбец"""
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+                AND table_name = 'vacancies' AND column_name = %s
+            """,
+            (column,),
+        )
+        return bool(cursor.fetchone())
+
+    def _fill_lookup(self, cursor: Any, table: str, items: List[Dict[str, str]]) -> None:
+        """
+        Заполнить таблицу-справочник элементами справочника HH
+
+        Args:
+            cursor: курсор текущей транзакции
+            table: таблица-справочник (experience или employment)
+            items: элементы справочника с ключами id и name
+        """
+        values = [(item["id"], item["name"]) for item in items]
+        if not values:
+            return
+        # Вставляются только новые элементы: каждый INSERT, даже завершившийся
+        # ON CONFLICT, расходует значение последовательности SMALLINT-кодов
+        cursor.execute(f"SELECT hh_id, name FROM {table} WHERE hh_id IS NOT NULL")
+        existing = dict(cursor.fetchall())
+        renamed = [(name, hh_id) for hh_id, name in values if existing.get(hh_id, name) != name]
+        missing = [(hh_id, name) for hh_id, name in values if hh_id not in existing]
+        if renamed:
+            cursor.executemany(f"UPDATE {table} SET name = %s WHERE hh_id = %s", renamed)
+        if missing:
+            # Значения, добавленные из вакансий раньше справочника, получают ID HH
+            cursor.executemany(
+                f"UPDATE {table} SET hh_id = %s WHERE name = %s AND hh_id IS NULL", missing
+            )
+            cursor.executemany(
+                f"""
+                INSERT INTO {table} (hh_id, name)
+                SELECT %s, %s
+                WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE hh_id = %s)
+                """,
+                [(hh_id, name, hh_id) for hh_id, name in missing],
+            )
+
+    def _migrate_lookup(self, cursor: Any, table: str) -> None:
+        """
+        Заменить текстовый столбец vacancies.<table> прежней схемы
+        кодом таблицы-справочника
+
+        Args:
+            cursor: курсор текущей транзакции
+            table: таблица-справочник (experience или employment)
+        """
+        if not self._has_vacancy_column(cursor, table):
+            return
+
+        print(f"Перенос значений vacancies.{table} в таблицу-справочник {table}...")
+        column = _vacancy_column(table)
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (name)
+            SELECT DISTINCT {table} FROM vacancies WHERE {table} IS NOT NULL
+            ON CONFLICT (name) DO NOTHING
+            """
+        )
+        cursor.execute(
+            f"ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS {column} "
+            f"{_VACANCY_COLUMN_TYPES[table]}"
+        )
+        cursor.execute(
+            f"UPDATE vacancies v SET {column} = t.id FROM {table} t WHERE t.name = v.{table}"
+        )
+        cursor.execute(f"ALTER TABLE vacancies DROP COLUMN {table}")
+
+    def _lookup_codes(
+        self, cursor: Any, keys: Dict[str, Sequence[LookupKey]]
+    ) -> Dict[str, Dict[LookupKey, Optional[int]]]:
+        """
+        Получить коды значений таблиц-справочников, добавив недостающие
+
+        Значения ищутся по ID элемента справочника HH (hh_id), поэтому
+        переименование элемента в HH не создает новую строку. Значения
+        без ID (например, прочитанные из таблиц прежней схемы) ищутся
+        по названию.
+
+        Args:
+            cursor: курсор текущей транзакции
+            keys: пары (ID справочника HH, название) для каждой таблицы-справочника
+
+        Returns:
+            Dict: для каждой таблицы отображение пары в код
+        """
+        codes: Dict[str, Dict[LookupKey, Optional[int]]] = {}
+        for table, values in keys.items():
+            wanted = set(values)
+            by_id = {hh_id: name for hh_id, name in wanted if hh_id is not None}
+            by_name = sorted({name for hh_id, name in wanted if hh_id is None and name})
+            id_codes: Dict[str, int] = {}
+            name_codes: Dict[str, int] = {}
+            if by_id:
+                cursor.execute(
+                    f"SELECT hh_id, id FROM {table} WHERE hh_id = ANY(%s)", (sorted(by_id),)
+                )
+                id_codes.update(cursor.fetchall())
+                missing = [
+                    (hh_id, by_id[hh_id] or hh_id)
+                    for hh_id in sorted(by_id)
+                    if hh_id not in id_codes
+                ]
+                if missing:
+                    # Строка с тем же названием без ID (из прежней схемы) получает
+                    # ID HH; строка, у которой уже есть другой ID, не меняется
+                    id_codes.update(
+                        execute_values(
+                            cursor,
+                            f"""
+                            UPDATE {table} t SET hh_id = m.hh_id
+                            FROM (VALUES %s) AS m (hh_id, name)
+                            WHERE t.name = m.name AND t.hh_id IS NULL
+                            RETURNING t.hh_id, t.id
+                            """,
+                            missing,
+                            fetch=True,
+                        )
+                    )
+                    missing = [item for item in missing if item[0] not in id_codes]
+                if missing:
+                    # Коды следуют за ID HH: при одновременной вставке тем же
+                    # ID из другой загрузки обновляется только название
+                    id_codes.update(
+                        execute_values(
+                            cursor,
+                            f"""
+                            INSERT INTO {table} (hh_id, name) VALUES %s
+                            ON CONFLICT (hh_id) DO UPDATE SET name = EXCLUDED.name
+                            RETURNING hh_id, id
+                            """,
+                            missing,
+                            fetch=True,
+                        )
+                    )
+            if by_name:
+                cursor.execute(
+                    f"SELECT name, id FROM {table} WHERE name = ANY(%s)", (by_name,)
+                )
+                name_codes.update(cursor.fetchall())
+                missing_names = [(name,) for name in by_name if name not in name_codes]
+                if missing_names:
+                    name_codes.update(
+                        execute_values(
+                            cursor,
+                            f"""
+                            INSERT INTO {table} (name) VALUES %s
+                            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+                            RETURNING name, id
+                            """,
+                            missing_names,
+                            fetch=True,
+                        )
+                    )
+            codes[table] = {
+                (hh_id, name): (
+                    id_codes[hh_id] if hh_id is not None else name_codes.get(name or "")
+                )
+                for hh_id, name in wanted
+            }
+        return codes
+
+    def _encode_lookups(
+        self,
+        codes: Dict[str, Dict[LookupKey, Optional[int]]],
+        rows: Iterable[Tuple[Any, ...]],
+        keys: Dict[str, Sequence[LookupKey]],
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Заменить в строках вакансий значения справочников их кодами
+
+        Args:
+            codes: коды значений, полученные _lookup_codes
+            rows: строки в порядке полей профиля проекции
+            keys: пары (ID справочника HH, название) для каждой строки,
+                те же, что переданы в _lookup_codes
+
+        Yields:
+            Tuple: строки для таблицы vacancies
+        """
+        columns = self.projection.vacancy_columns
+        positions = [
+            (columns.index(table), mapping, keys[table]) for table, mapping in codes.items()
+        ]
+        for index, row in enumerate(rows):
+            if positions:
+                values = list(row)
+                for i, mapping, column in positions:
+                    values[i] = mapping[column[index]]
+                row = tuple(values)
+            yield row
+
+    def _migrate_descriptions(self, cursor: Any, chunk_size: int = 1000) -> None:
+        """
+        Перенести описания из столбца vacancies.description прежней схемы
+        в сжатом виде в таблицу vacancy_descriptions и удалить столбец
+
+        Args:
+            cursor: курсор текущей транзакции
+            chunk_size: количество описаний, сжимаемых за раз
+        """
+        if not self._has_vacancy_column(cursor, "description"):
+            return
+
+        print("Перенос описаний вакансий в таблицу vacancy_descriptions...")
+        last_id = -1
+        while True:
+            cursor.execute(
+                """
+                SELECT id, description FROM vacancies
+                WHERE description IS NOT NULL AND id > %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                (last_id, chunk_size),
+            )
+            rows = cursor.fetchall()
+            if rows:
+                self._write_descriptions(
+                    cursor, [(row[0], compress_text(row[1])) for row in rows], chunk_size
+                )
+                last_id = rows[-1][0]
+            if len(rows) < chunk_size:
+                break
+        cursor.execute("ALTER TABLE vacancies DROP COLUMN description")
+
     def load_data(self, employers: List[Employer], vacancies: List[Vacancy]) -> None:
         """
         Загрузка данных в базу данных
@@ -280,12 +692,277 @@ class DatabaseManager:
         """
         print("Начало загрузки данных в базу данных...")
 
+        # Повторы одного id заменяются последней версией, как сделал бы upsert
+        employers = list({employer.id: employer for employer in employers}.values())
+        vacancies = list({vacancy.id: vacancy for vacancy in vacancies}.values())
+
         # Загрузка работодателей
         for employer in employers:
-            self.insert_employer(employer)
+            with stage("insert_employer"):
+                self.insert_employer(employer)
 
         # Загрузка вакансий
         for vacancy in vacancies:
-            self.insert_vacancy(vacancy)
+            with stage("insert_vacancy"):
+                self.insert_vacancy(vacancy)
 
+        self._notify_loaded(bump_generation())
         print("Данные успешно загружены в базу данных")
+
+    def load_batch(
+        self,
+        employers: List[Employer],
+        batch: VacancyBatch,
+        page_size: int = 1000,
+        checkpoint: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """
+        Пакетная загрузка данных в базу данных
+
+        Работодатели и вакансии записываются многострочными INSERT
+        по page_size строк в одной транзакции. Из повторяющихся id
+        загружается последняя версия. Записываются только столбцы
+        профиля проекции.
+
+        Args:
+            employers: список работодателей
+            batch: пачка вакансий
+            page_size: количество строк в одном INSERT
+            checkpoint: (ID работодателя, номер страницы выдачи) — отметка
+                о загрузке страницы, записывается в той же транзакции
+        """
+        if not self.connection:
+            self.connect()
+
+        print("Начало пакетной загрузки данных в базу данных...")
+        # Повторы id в одном INSERT ... ON CONFLICT вызывают ошибку
+        employers = list({employer.id: employer for employer in employers}.values())
+        batch = batch.deduplicate()
+        try:
+            if self.connection:
+                with self.connection.cursor() as cursor:
+                    with timed_batch("upsert_employers", len(employers)):
+                        execute_values(
+                            cursor,
+                            _UPSERT_EMPLOYERS,
+                            [
+                                (e.id, e.name, e.url, e.alternate_url, e.description)
+                                for e in employers
+                            ],
+                            page_size=page_size,
+                        )
+                    project = itemgetter(*self.projection.row_indexes)
+                    lookups = [t for t in LOOKUP_DICTIONARIES if t in self.projection]
+                    keys = {t: batch.lookup_keys(t) for t in lookups}
+                    codes = self._lookup_codes(cursor, keys)
+                    with timed_batch("upsert_vacancies", len(batch)):
+                        execute_values(
+                            cursor,
+                            _upsert_vacancies(self.projection.vacancy_columns),
+                            self._encode_lookups(
+                                codes, (project(row) for row in batch.rows()), keys
+                            ),
+                            page_size=page_size,
+                        )
+                    if "description" in self.projection:
+                        with timed_batch("upsert_descriptions", len(batch)):
+                            self._write_descriptions(
+                                cursor, list(zip(batch.id, batch.description)), page_size
+                            )
+                    if checkpoint is not None:
+                        cursor.execute(
+                            """
+                            INSERT INTO harvest_checkpoints (employer_id, page)
+                            VALUES (%s, %s)
+                            ON CONFLICT (employer_id, page) DO UPDATE SET loaded_at = now()
+                            """,
+                            checkpoint,
+                        )
+                with timed_batch("commit_batch", len(batch)):
+                    self.connection.commit()
+        except Exception as e:
+            if self.connection:
+                self.connection.rollback()
+            print(f"Ошибка при пакетной загрузке данных: {e}")
+            raise
+
+        self._notify_loaded(bump_generation())
+        print(f"Загружено {len(employers)} работодателей и {len(batch)} вакансий")
+
+    def mark_synced(self, employer_ids: Iterable[int]) -> None:
+        """
+        Записать текущее время как время сбора вакансий работодателей
+
+        Сбор считается завершенным: отметки загруженных страниц удаляются.
+
+        Args:
+            employer_ids: ID работодателей, данные которых загружены
+        """
+        if not self.connection:
+            self.connect()
+
+        rows = [(employer_id,) for employer_id in dict.fromkeys(employer_ids)]
+        try:
+            if self.connection and rows:
+                with self.connection.cursor() as cursor:
+                    execute_values(
+                        cursor,
+                        """
+                        INSERT INTO employer_sync (employer_id) VALUES %s
+                        ON CONFLICT (employer_id) DO UPDATE SET synced_at = now()
+                        """,
+                        rows,
+                    )
+                    cursor.execute(
+                        "DELETE FROM harvest_checkpoints WHERE employer_id = ANY(%s)",
+                        ([row[0] for row in rows],),
+                    )
+                self.connection.commit()
+        except Exception as e:
+            if self.connection:
+                self.connection.rollback()
+            print(f"Ошибка при сохранении времени сбора: {e}")
+
+    def get_stale_employers(
+        self, employer_ids: Sequence[int], max_age: timedelta
+    ) -> List[int]:
+        """
+        Отобрать работодателей, данные которых собирались раньше max_age
+        назад или не собирались вовсе
+
+        Args:
+            employer_ids: ID работодателей
+            max_age: допустимый возраст данных
+
+        Returns:
+            List[int]: ID работодателей, данные которых нужно обновить
+        """
+        if not self.connection:
+            self.connect()
+        assert self.connection is not None
+
+        with self.connection.cursor() as cursor:
+            # В базе прежней схемы таблицы еще нет — устарели все
+            cursor.execute("SELECT to_regclass('employer_sync')")
+            row = cursor.fetchone()
+            fresh: Set[int] = set()
+            if row and row[0] is not None:
+                cursor.execute(
+                    """
+                    SELECT employer_id FROM employer_sync
+                    WHERE employer_id = ANY(%s) AND synced_at > now() - %s
+                    """,
+                    (list(employer_ids), max_age),
+                )
+                fresh = {r[0] for r in cursor.fetchall()}
+        self.connection.commit()
+        return [employer_id for employer_id in employer_ids if employer_id not in fresh]
+
+    def read_employer_ids(self, table: str, column: str = "employer_id") -> List[int]:
+        """
+        Прочитать список работодателей из таблицы
+
+        Args:
+            table: имя таблицы (возможно, со схемой через точку)
+            column: столбец с ID работодателей
+
+        Returns:
+            List[int]: ID работодателей по возрастанию без повторов
+        """
+        if not self.connection:
+            self.connect()
+        assert self.connection is not None
+
+        with self.connection.cursor() as cursor:
+            query = sql.SQL(
+                "SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column}"
+            ).format(column=sql.Identifier(column), table=sql.Identifier(*table.split(".")))
+            cursor.execute(query)
+            result = [row[0] for row in cursor.fetchall()]
+        self.connection.commit()
+        return result
+
+    def get_vacancy_counts(self, employer_ids: Sequence[int]) -> Dict[int, int]:
+        """
+        Получить количество загруженных вакансий работодателей
+
+        Используется как вес работодателя при разбиении на шарды.
+
+        Args:
+            employer_ids: ID работодателей
+
+        Returns:
+            Dict[int, int]: количество вакансий работодателей, у которых они есть
+        """
+        if not self.connection:
+            self.connect()
+        assert self.connection is not None
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT employer_id, COUNT(*) FROM vacancies
+                WHERE employer_id = ANY(%s)
+                GROUP BY employer_id
+                """,
+                (list(employer_ids),),
+            )
+            result = dict(cursor.fetchall())
+        self.connection.commit()
+        return result
+
+    def get_checkpoints(
+        self, employer_ids: Sequence[int], max_age: timedelta = timedelta(hours=24)
+    ) -> Dict[int, int]:
+        """
+        Получить страницы, с которых продолжается прерванный сбор
+
+        Страницы загружаются по порядку, поэтому сбор продолжается
+        со страницы после последней загруженной. Отметки старше max_age
+        не учитываются: выдача за это время могла сильно сместиться,
+        и сбор начинается заново.
+
+        Args:
+            employer_ids: ID работодателей
+            max_age: допустимый возраст отметок
+
+        Returns:
+            Dict[int, int]: номер следующей страницы для работодателей
+            с незавершенным сбором
+        """
+        if not self.connection:
+            self.connect()
+        assert self.connection is not None
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT employer_id, MAX(page) FROM harvest_checkpoints
+                WHERE employer_id = ANY(%s) AND loaded_at > now() - %s
+                GROUP BY employer_id
+                """,
+                (list(employer_ids), max_age),
+            )
+            result = {row[0]: row[1] + 1 for row in cursor.fetchall()}
+        self.connection.commit()
+        return result
+
+    def _notify_loaded(self, generation: int) -> None:
+        """
+        Оповестить другие процессы о новой загрузке данных
+
+        Args:
+            generation: номер поколения загрузки
+        """
+        if not self.connection:
+            return
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, str(generation))
+                )
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            print(f"Ошибка при отправке уведомления о загрузке: {e}")
@@ -1,21 +1,401 @@
 import configparser
-from typing import Any, Dict, List, Optional
+import functools
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import psycopg2  # type: ignore
 
+from src.analytics import (
+    DEFAULT_PERCENTILES,
+    DIMENSIONS,
+    SalaryStats,
+    build_salary_analytics_query,
+    parse_salary_analytics,
+    query_params,
+)
+from src.cache import NOTIFY_CHANNEL, QueryCache, bump_generation, current_generation
+from src.encoding import CURRENCIES, intern_strings
+from src.export import EXPORT_TABLES, build_copy_query, build_table_query
+from src.metrics import observe_statement
+from src.projection import Projection, get_projection
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Запросы отчетов DBManager. В постоянной сессии каждый из них один раз
+# подготавливается на сервере (PREPARE) и далее выполняется по имени.
+# Названия сортируются по кодам символов (COLLATE "C"), а не по локали
+# базы: порядок не зависит от сервера и совпадает с MemoryDBManager.
+QUERIES: Dict[str, str] = {
+    "companies_and_vacancies_count": """
+        SELECT e.name, COUNT(v.id) as vacancy_count
+        FROM employers e
+        LEFT JOIN vacancies v ON e.id = v.employer_id
+        GROUP BY e.id, e.name
+        ORDER BY vacancy_count DESC
+    """,
+    "all_vacancies": """
+        SELECT
+            e.name as company_name,
+            v.name as vacancy_name,
+            v.salary_from,
+            v.salary_to,
+            v.currency,
+            v.alternate_url
+        FROM vacancies v
+        JOIN employers e ON v.employer_id = e.id
+        ORDER BY e.name COLLATE "C", v.name COLLATE "C"
+    """,
+    "avg_salary": """
+        SELECT AVG((COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2)
+        FROM vacancies
+        WHERE salary_from IS NOT NULL OR salary_to IS NOT NULL
+    """,
+    "vacancies_with_higher_salary": """
+        SELECT
+            e.name as company_name,
+            v.name as vacancy_name,
+            v.salary_from,
+            v.salary_to,
+            v.currency,
+            v.alternate_url
+        FROM vacancies v
+        JOIN employers e ON v.employer_id = e.id
+        WHERE (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2 > %s::numeric
+        ORDER BY (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2 DESC
+    """,
+    "vacancies_with_keyword": """
+        SELECT
+            e.name as company_name,
+            v.name as vacancy_name,
+            v.salary_from,
+            v.salary_to,
+            v.currency,
+            v.alternate_url
+        FROM vacancies v
+        JOIN employers e ON v.employer_id = e.id
+        WHERE LOWER(v.name) LIKE %s::text
+        ORDER BY e.name COLLATE "C", v.name COLLATE "C"
+    """,
+    # Пересечение зарплатной вилки с диапазоном [min, max] проверяется
+    # по GiST-индексу на столбце salary_range; NULL-граница — открытая.
+    # Необязательные фильтры отключаются параметром NULL.
+    "vacancies_in_salary_range": """
+        SELECT
+            e.name as company_name,
+            v.name as vacancy_name,
+            v.salary_from,
+            v.salary_to,
+            v.currency,
+            v.alternate_url
+        FROM vacancies v
+        JOIN employers e ON v.employer_id = e.id
+        WHERE v.salary_range && int4range(%s::int4, %s::int4, '[]')
+            AND (%s::text IS NULL OR v.currency = %s::text)
+            AND (%s::int4[] IS NULL OR v.employer_id = ANY(%s::int4[]))
+            AND (%s::text IS NULL OR LOWER(v.name) LIKE %s::text)
+        ORDER BY e.name COLLATE "C", v.name COLLATE "C"
+    """,
+}
+
+
+class VacancyRow(NamedTuple):
+    """Строка вакансии в компактном формате результата"""
+
+    company: str
+    vacancy: str
+    salary_from: Optional[int]
+    salary_to: Optional[int]
+    currency: Optional[str]
+    url: Optional[str]
+
+    @property
+    def salary(self) -> str:
+        """Зарплата в виде строки, вычисляется при обращении"""
+        return format_salary(self.salary_from, self.salary_to, self.currency)
+
+
+VACANCY_COLUMNS: Tuple[str, ...] = VacancyRow._fields
+VacancyResult = Union[List[Dict[str, Any]], List[VacancyRow], Dict[str, List[Any]]]
+
+
+def format_salary(
+    salary_from: Optional[int], salary_to: Optional[int], currency: Optional[str]
+) -> str:
+    """
+    Представить зарплатную вилку в виде строки
+
+    Args:
+        salary_from: нижняя граница
+        salary_to: верхняя граница
+        currency: валюта
+
+    Returns:
+        str: строка вида "100000 - 150000 RUR", "от 100000 RUR" или пустая
+    """
+    if salary_from and salary_to:
+        return f"{salary_from} - {salary_to} {currency}"
+    elif salary_from:
+        return f"от {salary_from} {currency}"
+    elif salary_to:
+        return f"до {salary_to} {currency}"
+    return ""
+
+
+def build_vacancy_rows(rows: Sequence[Tuple[Any, ...]], row_format: str = "dict") -> VacancyResult:
+    """
+    Преобразовать строки запроса вакансий в выбранный формат результата
+
+    Форматы:
+        "dict" — список словарей с ключами company, vacancy, salary, url;
+        "tuple" — список VacancyRow, строка зарплаты вычисляется при обращении;
+        "columns" — словарь столбцов VACANCY_COLUMNS, по списку на столбец.
+
+    Повторяющиеся названия компаний и валюты во всех форматах ссылаются
+    на один объект строки.
+
+    Args:
+        rows: строки (company, vacancy, salary_from, salary_to, currency, url)
+        row_format: формат результата
+
+    Returns:
+        вакансии в выбранном формате
+    """
+    companies: Dict[str, str] = {}
+    if row_format == "dict":
+        return [
+            {
+                "company": companies.setdefault(row[0], row[0]),
+                "vacancy": row[1],
+                "salary": format_salary(row[2], row[3], row[4]),
+                "url": row[5],
+            }
+            for row in rows
+        ]
+    elif row_format == "tuple":
+        return [
+            VacancyRow(
+                companies.setdefault(row[0], row[0]),
+                row[1],
+                row[2],
+                row[3],
+                CURRENCIES.intern(row[4]),
+                row[5],
+            )
+            for row in rows
+        ]
+    elif row_format == "columns":
+        columns = list(zip(*rows)) or [()] * len(VACANCY_COLUMNS)
+        result = {name: list(values) for name, values in zip(VACANCY_COLUMNS, columns)}
+        result["company"] = intern_strings(result["company"])
+        result["currency"] = [CURRENCIES.intern(c) for c in result["currency"]]
+        return result
+    raise ValueError(f"Неизвестный формат результата: {row_format}")
+
+
+def salary_range_params(
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    currency: Optional[str] = None,
+    employer_ids: Optional[Sequence[int]] = None,
+    keyword: Optional[str] = None,
+) -> Tuple[Any, ...]:
+    """
+    Собрать параметры запроса vacancies_in_salary_range
+
+    Args:
+        salary_min: нижняя граница диапазона, None — открытая
+        salary_max: верхняя граница диапазона, None — открытая
+        currency: валюта зарплаты
+        employer_ids: ID работодателей
+        keyword: ключевое слово в названии вакансии
+
+    Returns:
+        Tuple: параметры в порядке плейсхолдеров запроса
+    """
+    if salary_min is not None and salary_max is not None and salary_min > salary_max:
+        raise ValueError("Нижняя граница зарплаты больше верхней")
+    employers = list(employer_ids) if employer_ids is not None else None
+    pattern = f"%{keyword.lower()}%" if keyword is not None else None
+    return (
+        salary_min,
+        salary_max,
+        currency,
+        currency,
+        employers,
+        employers,
+        pattern,
+        pattern,
+    )
+
+
+def _to_positional(query: str) -> str:
+    """Заменить плейсхолдеры psycopg2 (%s) на параметры PREPARE ($1, $2, ...)"""
+    counter = iter(range(1, query.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(counter)}", query)
+
+
+@dataclass
+class StatementStats:
+    """Статистика выполнения запроса"""
+
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        """Среднее время выполнения в секундах"""
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class QueryError(Exception):
+    """
+    Ошибка запроса отчета DBManager
+
+    Attributes:
+        result: пустой результат отчета, который возвращается вызывающему
+            коду, если DBManager не пробрасывает ошибки
+    """
+
+    def __init__(self, message: str, result: Any) -> None:
+        super().__init__(message)
+        self.result = result
+
+
+# Глубина вложенных вызовов отчетов в текущем потоке
+_calls = threading.local()
+
+
+def _cached(method: F) -> F:
+    """
+    Декоратор кэширования результатов отчетов DBManager
+
+    Ключ кэша — имя метода и его аргументы. Неудачный запрос метод сообщает
+    исключением QueryError, поэтому признак ошибки относится к одному
+    вызову. Результат не кэшируется, если запрос не удался или пока он
+    выполнялся, прошла новая загрузка данных. Ошибка вложенного отчета
+    пробрасывается во внешний; во внешнем она выводится и заменяется
+    пустым результатом, если у DBManager не включен raise_errors.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "DBManager", *args: Any, **kwargs: Any) -> Any:
+        depth = getattr(_calls, "depth", 0)
+        _calls.depth = depth + 1
+        try:
+            return _cached_call(self, method, args, kwargs)
+        except QueryError as e:
+            if depth or self.raise_errors:
+                raise
+            print(f"Ошибка при получении данных: {e}")
+            return e.result
+        finally:
+            _calls.depth = depth
+
+    return cast(F, wrapper)
+
+
+def _cached_call(
+    manager: "DBManager",
+    method: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> Any:
+    """Выполнить отчет или взять его результат из кэша"""
+    if manager.cache is None:
+        return method(manager, *args, **kwargs)
+
+    manager._poll_invalidations()
+    key = (method.__name__, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        # Изменяемые аргументы (например, списки) не кэшируются
+        return method(manager, *args, **kwargs)
+    found, value = manager.cache.get(key)
+    if not found:
+        generation = current_generation()
+        value = method(manager, *args, **kwargs)
+        manager.cache.put(key, value, generation)
+    return _copy_result(value)
+
+
+def _copy_result(value: Any) -> Any:
+    """
+    Копия результата из кэша, защищающая кэш от изменения вызывающим кодом
+
+    Копируются контейнер и вложенные в него словари и списки (строки
+    формата "dict", столбцы формата "columns", группы аналитики);
+    кортежи и скаляры неизменяемы и не копируются.
+    """
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    if isinstance(value, dict):
+        return {
+            key: list(item) if isinstance(item, list) else item for key, item in value.items()
+        }
+    return value
+
 
 class DBManager:
     """Класс для работы с данными в БД PostgreSQL"""
 
-    def __init__(self, config_file: str = "config/database.ini") -> None:
+    def __init__(
+        self,
+        config_file: str = "config/database.ini",
+        cache_size: int = 128,
+        listen: bool = False,
+        persistent: bool = False,
+        raise_errors: bool = False,
+    ) -> None:
         """
         Инициализация менеджера базы данных
 
         Args:
             config_file: путь к файлу конфигурации
+            cache_size: размер кэша результатов (0 — кэширование отключено)
+            listen: получать уведомления о загрузках из других процессов
+                через LISTEN/NOTIFY
+            persistent: держать одно соединение между вызовами и выполнять
+                запросы отчетов как подготовленные на сервере
+            raise_errors: пробрасывать ошибки запросов отчетов (QueryError)
+                вместо вывода сообщения и пустого результата
         """
         self.config = self._read_config(config_file)
+        self.projection = self._read_projection(config_file)
         self.connection: Optional[psycopg2.extensions.connection] = None
+        self.cache: Optional[QueryCache] = (
+            QueryCache(cache_size) if cache_size > 0 else None
+        )
+        self.listen = listen
+        self._listen_connection: Optional[psycopg2.extensions.connection] = None
+        self.raise_errors = raise_errors
+        self.persistent = persistent
+        self._prepared: Set[str] = set()
+        self.statement_stats: Dict[str, StatementStats] = {}
+
+    def __enter__(self) -> "DBManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _read_config(self, config_file: str) -> Dict[str, str]:
         """Чтение конфигурации из файла"""
@@ -29,6 +409,12 @@ class DBManager:
             "port": config["postgresql"]["port"],
         }
 
+    def _read_projection(self, config_file: str) -> Projection:
+        """Чтение профиля проекции, с которым созданы таблицы, из файла конфигурации"""
+        config = configparser.ConfigParser()
+        config.read(config_file)
+        return get_projection(config.get("projection", "fields", fallback=None))
+
     def _get_connection_string(self) -> dict:
         """Возвращает параметры подключения в виде словаря"""
         return {
@@ -50,6 +436,10 @@ class DBManager:
                 password=self.config["password"],
                 port=self.config["port"],
             )
+            # Подготовленные запросы живут только в рамках сессии
+            self._prepared.clear()
+            if self.persistent:
+                self.connection.autocommit = True
         except Exception as e:
             print(f"Ошибка подключения к базе данных: {e}")
             raise
@@ -60,6 +450,115 @@ class DBManager:
             self.connection.close()
             self.connection = None
 
+    def _open(self) -> None:
+        """Подключиться перед запросом или переиспользовать постоянную сессию"""
+        if not self.persistent or not self.connection or self.connection.closed:
+            self.connect()
+
+    def _close(self) -> None:
+        """Отключиться после запроса, если сессия не постоянная"""
+        if not self.persistent:
+            self.disconnect()
+
+    def _record(self, name: str, elapsed: float, rows: Optional[int] = None) -> None:
+        """Учесть выполнение запроса в статистике и метриках"""
+        observe_statement(name, elapsed, rows)
+        stats = self.statement_stats.setdefault(name, StatementStats())
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+
+    def _execute(self, cursor: Any, name: str, params: Tuple[Any, ...]) -> None:
+        """Выполнить запрос из QUERIES, в постоянной сессии — по имени"""
+        if not self.persistent:
+            if params:
+                cursor.execute(QUERIES[name], params)
+            else:
+                cursor.execute(QUERIES[name])
+            return
+
+        statement = f"hh_{name}"
+        if statement not in self._prepared:
+            cursor.execute(f"PREPARE {statement} AS {_to_positional(QUERIES[name])}")
+            self._prepared.add(statement)
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            cursor.execute(f"EXECUTE {statement} ({placeholders})", params)
+        else:
+            cursor.execute(f"EXECUTE {statement}")
+
+    def _fetch(self, name: str, params: Tuple[Any, ...] = (), one: bool = False) -> Any:
+        """
+        Выполнить запрос из QUERIES и получить результат
+
+        При обрыве постоянной сессии переподключается и повторяет запрос
+        один раз; подготовленные запросы создаются заново.
+
+        Args:
+            name: имя запроса
+            params: параметры запроса
+            one: вернуть одну строку вместо списка
+
+        Returns:
+            строка или список строк результата
+        """
+        for attempt in range(2):
+            try:
+                assert self.connection is not None
+                with self.connection.cursor() as cursor:
+                    start = time.perf_counter()
+                    self._execute(cursor, name, params)
+                    rows = cursor.fetchone() if one else cursor.fetchall()
+                    elapsed = time.perf_counter() - start
+                    self._record(name, elapsed, int(rows is not None) if one else len(rows))
+                    return rows
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if not self.persistent or attempt:
+                    raise
+                print("Соединение с базой данных потеряно, переподключение...")
+                self.disconnect()
+                self.connect()
+
+    def get_statement_stats(self) -> Dict[str, StatementStats]:
+        """
+        Получить статистику выполнения запросов
+
+        Returns:
+            Dict[str, StatementStats]: количество вызовов и время по каждому запросу
+        """
+        return dict(self.statement_stats)
+
+    def close(self) -> None:
+        """Закрыть все соединения, включая соединение для уведомлений"""
+        self.disconnect()
+        if self._listen_connection:
+            self._listen_connection.close()
+            self._listen_connection = None
+
+    def _poll_invalidations(self) -> None:
+        """Проверить уведомления о загрузках данных из других процессов"""
+        if not self.listen or self.cache is None:
+            return
+        try:
+            if self._listen_connection is None or self._listen_connection.closed:
+                self._listen_connection = psycopg2.connect(
+                    **self._get_connection_string()
+                )
+                self._listen_connection.autocommit = True
+                with self._listen_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Уведомления, пришедшие до подписки, потеряны
+                self.cache.clear()
+            self._listen_connection.poll()
+            if self._listen_connection.notifies:
+                del self._listen_connection.notifies[:]
+                bump_generation()
+        except psycopg2.Error as e:
+            print(f"Ошибка при получении уведомлений: {e}")
+            self._listen_connection = None
+            self.cache.clear()
+
+    @_cached
     def get_companies_and_vacancies_count(self) -> List[Dict[str, Any]]:
         """
         Получить список всех компаний и количество вакансий у каждой компании
@@ -67,79 +566,43 @@ class DBManager:
         Returns:
             List[Dict]: список словарей с данными компаний и количеством вакансий
         """
-        self.connect()
+        self._open()
         result: List[Dict[str, Any]] = []
         try:
             if self.connection:
-                with self.connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT e.name, COUNT(v.id) as vacancy_count
-                        FROM employers e
-                        LEFT JOIN vacancies v ON e.id = v.employer_id
-                        GROUP BY e.id, e.name
-                        ORDER BY vacancy_count DESC
-                    """
-                    )
-                    for row in cursor.fetchall():
-                        result.append({"company": row[0], "vacancies_count": row[1]})
+                for row in self._fetch("companies_and_vacancies_count"):
+                    result.append({"company": row[0], "vacancies_count": row[1]})
         except Exception as e:
-            print(f"Ошибка при получении данных: {e}")
+            raise QueryError(str(e), []) from e
         finally:
-            self.disconnect()
+            self._close()
         return result
 
-    def get_all_vacancies(self) -> List[Dict[str, Any]]:
+    @_cached
+    def get_all_vacancies(self, row_format: str = "dict") -> VacancyResult:
         """
         Получить список всех вакансий с указанием названия компании,
         названия вакансии, зарплаты и ссылки на вакансию
 
+        Args:
+            row_format: формат результата — "dict", "tuple" или "columns"
+
         Returns:
-            List[Dict]: список словарей с данными вакансий
+            список вакансий в выбранном формате (см. build_vacancy_rows)
         """
-        self.connect()
-        result: List[Dict[str, Any]] = []
+        # Неизвестный формат отклоняется до подключения к БД
+        result: VacancyResult = build_vacancy_rows([], row_format)
+        self._open()
         try:
             if self.connection:
-                with self.connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT
-                            e.name as company_name,
-                            v.name as vacancy_name,
-                            v.salary_from,
-                            v.salary_to,
-                            v.currency,
-                            v.alternate_url
-                        FROM vacancies v
-                        JOIN employers e ON v.employer_id = e.id
-                        ORDER BY e.name, v.name
-                    """
-                    )
-                    for row in cursor.fetchall():
-                        salary_info = ""
-                        if row[2] or row[3]:
-                            if row[2] and row[3]:
-                                salary_info = f"{row[2]} - {row[3]} {row[4]}"
-                            elif row[2]:
-                                salary_info = f"от {row[2]} {row[4]}"
-                            elif row[3]:
-                                salary_info = f"до {row[3]} {row[4]}"
-
-                        result.append(
-                            {
-                                "company": row[0],
-                                "vacancy": row[1],
-                                "salary": salary_info,
-                                "url": row[5],
-                            }
-                        )
+                result = build_vacancy_rows(self._fetch("all_vacancies"), row_format)
         except Exception as e:
-            print(f"Ошибка при получении данных: {e}")
+            raise QueryError(str(e), result) from e
         finally:
-            self.disconnect()
+            self._close()
         return result
 
+    @_cached
     def get_avg_salary(self) -> float:
         """
         Получить среднюю зарплату по вакансиям
@@ -147,133 +610,203 @@ class DBManager:
         Returns:
             float: средняя зарплата
         """
-        self.connect()
+        self._open()
         result: float = 0.0
         try:
             if self.connection:
-                with self.connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT AVG((COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2)
-                        FROM vacancies
-                        WHERE salary_from IS NOT NULL OR salary_to IS NOT NULL
-                    """
-                    )
-                    row = cursor.fetchone()
-                    if row and row[0]:
-                        result = round(float(row[0]), 2)
+                row = self._fetch("avg_salary", one=True)
+                if row and row[0]:
+                    result = round(float(row[0]), 2)
         except Exception as e:
-            print(f"Ошибка при получении данных: {e}")
+            raise QueryError(str(e), result) from e
         finally:
-            self.disconnect()
+            self._close()
         return result
 
-    def get_vacancies_with_higher_salary(self) -> List[Dict[str, Any]]:
+    @_cached
+    def get_vacancies_with_higher_salary(self, row_format: str = "dict") -> VacancyResult:
         """
         Получить список всех вакансий, у которых зарплата выше средней по всем вакансиям
 
+        Args:
+            row_format: формат результата — "dict", "tuple" или "columns"
+
         Returns:
-            List[Dict]: список словарей с вакансиями
+            список вакансий в выбранном формате (см. build_vacancy_rows)
         """
-        avg_salary = self.get_avg_salary()
-        self.connect()
-        result: List[Dict[str, Any]] = []
+        result: VacancyResult = build_vacancy_rows([], row_format)
+        try:
+            avg_salary = self.get_avg_salary()
+        except QueryError as e:
+            raise QueryError(str(e), result) from e
+        self._open()
         try:
             if self.connection:
-                with self.connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT
-                            e.name as company_name,
-                            v.name as vacancy_name,
-                            v.salary_from,
-                            v.salary_to,
-                            v.currency,
-                            v.alternate_url
-                        FROM vacancies v
-                        JOIN employers e ON v.employer_id = e.id
-                        WHERE (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2 > %s
-                        ORDER BY (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2 DESC
-                    """,
-                        (avg_salary,),
-                    )
-
-                    for row in cursor.fetchall():
-                        salary_info = ""
-                        if row[2] or row[3]:
-                            if row[2] and row[3]:
-                                salary_info = f"{row[2]} - {row[3]} {row[4]}"
-                            elif row[2]:
-                                salary_info = f"от {row[2]} {row[4]}"
-                            elif row[3]:
-                                salary_info = f"до {row[3]} {row[4]}"
-
-                        result.append(
-                            {
-                                "company": row[0],
-                                "vacancy": row[1],
-                                "salary": salary_info,
-                                "url": row[5],
-                            }
-                        )
+                rows = self._fetch("vacancies_with_higher_salary", (avg_salary,))
+                result = build_vacancy_rows(rows, row_format)
         except Exception as e:
-            print(f"Ошибка при получении данных: {e}")
+            raise QueryError(str(e), result) from e
         finally:
-            self.disconnect()
+            self._close()
         return result
 
-    def get_vacancies_with_keyword(self, keyword: str) -> List[Dict[str, Any]]:
+    @_cached
+    def get_vacancies_with_keyword(
+        self, keyword: str, row_format: str = "dict"
+    ) -> VacancyResult:
         """
         Получить список всех вакансий, в названии которых содержатся переданные слова
 
         Args:
             keyword: ключевое слово для поиска
+            row_format: формат результата — "dict", "tuple" или "columns"
 
         Returns:
-            List[Dict]: список словарей с вакансиями
+            список вакансий в выбранном формате (см. build_vacancy_rows)
         """
-        self.connect()
-        result: List[Dict[str, Any]] = []
+        result: VacancyResult = build_vacancy_rows([], row_format)
+        self._open()
+        try:
+            if self.connection:
+                rows = self._fetch("vacancies_with_keyword", (f"%{keyword.lower()}%",))
+                result = build_vacancy_rows(rows, row_format)
+        except Exception as e:
+            raise QueryError(str(e), result) from e
+        finally:
+            self._close()
+        return result
+
+    @_cached
+    def get_vacancies_in_salary_range(
+        self,
+        salary_min: Optional[int] = None,
+        salary_max: Optional[int] = None,
+        currency: Optional[str] = None,
+        employer_ids: Optional[Sequence[int]] = None,
+        keyword: Optional[str] = None,
+        row_format: str = "dict",
+    ) -> VacancyResult:
+        """
+        Получить вакансии, зарплатная вилка которых пересекается с диапазоном
+
+        Вилка без одной из границ считается открытой с этой стороны,
+        вакансии без зарплаты не возвращаются. Границы диапазона
+        включаются; None — открытая граница.
+
+        Args:
+            salary_min: нижняя граница диапазона
+            salary_max: верхняя граница диапазона
+            currency: учитывать только вакансии в этой валюте
+            employer_ids: учитывать только вакансии этих работодателей
+            keyword: ключевое слово в названии вакансии
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате (см. build_vacancy_rows)
+        """
+        params = salary_range_params(salary_min, salary_max, currency, employer_ids, keyword)
+        result: VacancyResult = build_vacancy_rows([], row_format)
+        self._open()
+        try:
+            if self.connection:
+                rows = self._fetch("vacancies_in_salary_range", params)
+                result = build_vacancy_rows(rows, row_format)
+        except Exception as e:
+            raise QueryError(str(e), result) from e
+        finally:
+            self._close()
+        return result
+
+    @_cached
+    def get_salary_analytics(
+        self,
+        dimensions: Sequence[str] = DIMENSIONS,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        bins: int = 10,
+        lower: float = 0,
+        upper: float = 500000,
+        currency: Optional[str] = None,
+    ) -> Dict[str, List[SalaryStats]]:
+        """
+        Получить статистику зарплат с разбивкой по измерениям за один запрос
+
+        Зарплата вакансии — середина вилки или единственная указанная граница.
+        Для каждой группы считаются количество, минимум, максимум, среднее,
+        перцентили и гистограмма; группы делятся по валютам, работодатели
+        различаются по ID.
+
+        Args:
+            dimensions: измерения разбивки (employer, experience,
+                employment, currency)
+            percentiles: перцентили в диапазоне от 0 до 1
+            bins: количество корзин гистограммы между lower и upper
+            lower: нижняя граница гистограммы
+            upper: верхняя граница гистограммы
+            currency: учитывать только вакансии в этой валюте
+
+        Returns:
+            Dict[str, List[SalaryStats]]: статистика по измерениям,
+            итоги по валютам — под ключом "all"
+        """
+        query = build_salary_analytics_query(dimensions, bins, currency is not None)
+        params = query_params(percentiles, lower, upper, bins, currency)
+        self._open()
+        result: Dict[str, List[SalaryStats]] = {}
         try:
             if self.connection:
                 with self.connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT
-                            e.name as company_name,
-                            v.name as vacancy_name,
-                            v.salary_from,
-                            v.salary_to,
-                            v.currency,
-                            v.alternate_url
-                        FROM vacancies v
-                        JOIN employers e ON v.employer_id = e.id
-                        WHERE LOWER(v.name) LIKE %s
-                        ORDER BY e.name, v.name
-                    """,
-                        (f"%{keyword.lower()}%",),
-                    )
-
-                    for row in cursor.fetchall():
-                        salary_info = ""
-                        if row[2] or row[3]:
-                            if row[2] and row[3]:
-                                salary_info = f"{row[2]} - {row[3]} {row[4]}"
-                            elif row[2]:
-                                salary_info = f"от {row[2]} {row[4]}"
-                            elif row[3]:
-                                salary_info = f"до {row[3]} {row[4]}"
-
-                        result.append(
-                            {
-                                "company": row[0],
-                                "vacancy": row[1],
-                                "salary": salary_info,
-                                "url": row[5],
-                            }
-                        )
+                    start = time.perf_counter()
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+                    self._record("salary_analytics", time.perf_counter() - start, len(rows))
+                result = parse_salary_analytics(rows, dimensions)
         except Exception as e:
-            print(f"Ошибка при получении данных: {e}")
+            raise QueryError(str(e), result) from e
         finally:
-            self.disconnect()
+            self._close()
         return result
+
+    def export(
+        self,
+        source: str,
+        stream: BinaryIO,
+        fmt: str = "csv",
+        params: Tuple[Any, ...] = (),
+    ) -> None:
+        """
+        Выгрузить таблицу или результат отчета в поток через COPY TO STDOUT
+
+        Сервер отдает данные частями, и они сразу пишутся в stream, поэтому
+        строки не собираются в памяти. Ошибки не перехватываются: неполная
+        выгрузка не должна выглядеть успешной.
+
+        Args:
+            source: таблица из EXPORT_TABLES или имя запроса из QUERIES
+            stream: двоичный поток (см. open_export_stream)
+            fmt: формат выгрузки из EXPORT_FORMATS
+            params: параметры запроса отчета
+
+        Raises:
+            ValueError: неизвестный источник или формат
+        """
+        if source in EXPORT_TABLES:
+            query = build_table_query(source, self.projection)
+        elif source in QUERIES:
+            query = QUERIES[source].strip()
+        else:
+            raise ValueError(f"Неизвестный источник выгрузки: {source}")
+        copy_query = build_copy_query(query, fmt)
+
+        self._open()
+        try:
+            assert self.connection is not None
+            with self.connection.cursor() as cursor:
+                if params:
+                    # COPY не принимает параметры — подставляем их на клиенте
+                    encoding = psycopg2.extensions.encodings[self.connection.encoding]
+                    copy_query = cursor.mogrify(copy_query, params).decode(encoding)
+                start = time.perf_counter()
+                cursor.copy_expert(copy_query, stream)
+                self._record(f"export_{source}", time.perf_counter() - start)
+        finally:
+            self._close()
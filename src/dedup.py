@@ -0,0 +1,233 @@
+import hashlib
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+
+class IntSet:
+    """
+    Компактное множество целых чисел
+
+    Значения хранятся в отсортированном массиве array (8 байт на число)
+    и небольшом буфере set для недавно добавленных. Когда буфер
+    вырастает до восьмой части массива, он сливается с массивом,
+    поэтому добавление в среднем не требует пересортировки всего массива.
+    """
+
+    def __init__(self, min_buffer: int = 4096) -> None:
+        """
+        Инициализация множества
+
+        Args:
+            min_buffer: минимальный размер буфера перед слиянием
+        """
+        self.min_buffer = min_buffer
+        self._sorted = array("q")
+        self._buffer: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._buffer)
+
+    def __contains__(self, value: int) -> bool:
+        if value in self._buffer:
+            return True
+        index = bisect_left(self._sorted, value)
+        return index < len(self._sorted) and self._sorted[index] == value
+
+    def __iter__(self) -> Iterator[int]:
+        return heapq.merge(self._sorted, sorted(self._buffer))
+
+    def add(self, value: int) -> bool:
+        """
+        Добавить число в множество
+
+        Args:
+            value: число
+
+        Returns:
+            bool: True, если числа в множестве еще не было
+        """
+        if value in self:
+            return False
+        self._buffer.add(value)
+        if len(self._buffer) >= max(self.min_buffer, len(self._sorted) // 8):
+            self._sorted = array("q", iter(self))
+            self._buffer.clear()
+        return True
+
+
+class BloomFilter:
+    """
+    Фильтр Блума для целых чисел
+
+    Занимает около 1.8 байта на элемент при доле ложных срабатываний 0.1%.
+    Ложное срабатывание означает, что новое значение считается уже
+    встречавшимся; пропусков уже добавленных значений не бывает.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        Инициализация фильтра
+
+        Args:
+            capacity: ожидаемое количество элементов
+            error_rate: допустимая доля ложных срабатываний при capacity элементах
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity должна быть положительной, error_rate — от 0 до 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, value: int) -> Iterator[int]:
+        digest = hashlib.blake2b(value.to_bytes(8, "little", signed=True), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def __contains__(self, value: int) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+    def add(self, value: int) -> bool:
+        """
+        Добавить число в фильтр
+
+        Args:
+            value: число
+
+        Returns:
+            bool: True, если число, вероятно, не встречалось раньше
+        """
+        added = False
+        for p in self._positions(value):
+            mask = 1 << (p & 7)
+            if not self._bits[p >> 3] & mask:
+                self._bits[p >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+
+class SeenIds:
+    """
+    Множество уже встречавшихся id с ограниченным расходом памяти
+
+    Пока id не больше max_exact, они хранятся точно в IntSet. После этого
+    множество переходит на фильтры Блума: первый рассчитан на growth
+    текущих количеств id, а когда он заполняется, добавляется следующий,
+    в growth раз больше (с вдвое меньшей долей ложных срабатываний, чтобы
+    общая доля не превышала 2 * error_rate). Память растет примерно
+    на 1.8 байта на id вместо 8, но новый id может быть принят за повтор;
+    такие отбрасывания учитываются в approximate_duplicates.
+    """
+
+    def __init__(
+        self, max_exact: int = 5_000_000, growth: float = 2.0, error_rate: float = 0.001
+    ) -> None:
+        """
+        Инициализация множества
+
+        Args:
+            max_exact: максимальное количество id, хранимых точно
+            growth: во сколько раз емкость очередного фильтра Блума больше
+                количества id на момент его создания
+            error_rate: доля ложных срабатываний первого фильтра Блума
+        """
+        if growth <= 1:
+            raise ValueError("growth должен быть больше 1")
+        self.max_exact = max_exact
+        self.growth = growth
+        self.error_rate = error_rate
+        self._ids = IntSet()
+        self._filters: List[BloomFilter] = []
+        self._count = 0
+        self.duplicates = 0
+        self.approximate_duplicates = 0
+
+    @property
+    def approximate(self) -> bool:
+        """True после перехода на фильтры Блума"""
+        return bool(self._filters)
+
+    def __len__(self) -> int:
+        return self._count if self._filters else len(self._ids)
+
+    def __contains__(self, value: int) -> bool:
+        if self._filters:
+            return any(value in bloom for bloom in self._filters)
+        return value in self._ids
+
+    def _grow(self) -> BloomFilter:
+        """Добавить фильтр Блума, рассчитанный на рост количества id"""
+        error_rate = self.error_rate / 2 ** len(self._filters)
+        bloom = BloomFilter(max(math.ceil(len(self) * self.growth), 1), error_rate)
+        self._filters.append(bloom)
+        return bloom
+
+    def add(self, value: int) -> bool:
+        """
+        Отметить id как встречавшийся
+
+        Args:
+            value: id
+
+        Returns:
+            bool: True, если id встретился впервые (после перехода
+            на фильтры Блума — вероятно впервые)
+        """
+        if not self._filters:
+            if not self._ids.add(value):
+                self.duplicates += 1
+                return False
+            if len(self._ids) > self.max_exact:
+                self._count = len(self._ids)
+                bloom = self._grow()
+                for seen in self._ids:
+                    bloom.add(seen)
+                self._ids = IntSet()
+                print(
+                    f"Встречено более {self.max_exact} id вакансий: повторы "
+                    f"отбрасываются по фильтру Блума, новые id могут быть приняты "
+                    f"за повтор с вероятностью до {2 * self.error_rate:.2%}"
+                )
+            return True
+
+        if value in self:
+            self.duplicates += 1
+            self.approximate_duplicates += 1
+            return False
+        bloom = self._filters[-1]
+        if len(bloom) >= bloom.capacity:
+            bloom = self._grow()
+        bloom.add(value)
+        self._count += 1
+        return True
+
+
+def unique(
+    items: Iterable[Dict[str, Any]], seen: Optional[SeenIds] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Пропустить элементы, id которых уже встречались
+
+    Args:
+        items: элементы ответа HH
+        seen: множество встречавшихся id, общее для нескольких вызовов
+
+    Yields:
+        Dict: элементы с новыми id в исходном порядке
+    """
+    seen = seen if seen is not None else SeenIds()
+    for item in items:
+        if seen.add(int(item["id"])):
+            yield item
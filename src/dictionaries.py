@@ -0,0 +1,76 @@
+import json
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    # requests импортируется только при обращении к API
+    from src.api import HHAPI
+
+# Справочники HH, которые хранятся в базе данных таблицами-справочниками
+LOOKUP_DICTIONARIES = ("experience", "employment")
+
+# Файл локального кэша справочников
+DEFAULT_CACHE_FILE = "config/dictionaries.json"
+
+# Офлайн-копия справочников HH (GET /dictionaries) на случай,
+# если API недоступно и кэша еще нет
+BUNDLED_DICTIONARIES: Dict[str, List[Dict[str, str]]] = {
+    "experience": [
+        {"id": "noExperience", "name": "Нет опыта"},
+        {"id": "between1And3", "name": "От 1 года до 3 лет"},
+        {"id": "between3And6", "name": "От 3 до 6 лет"},
+        {"id": "moreThan6", "name": "Более 6 лет"},
+    ],
+    "employment": [
+        {"id": "full", "name": "Полная занятость"},
+        {"id": "part", "name": "Частичная занятость"},
+        {"id": "project", "name": "Проектная работа"},
+        {"id": "volunteer", "name": "Волонтерство"},
+        {"id": "probation", "name": "Стажировка"},
+    ],
+}
+
+
+def _select(data: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
+    """Оставить из ответа HH только нужные справочники и поля"""
+    return {
+        name: [{"id": item["id"], "name": item["name"]} for item in data.get(name, [])]
+        for name in LOOKUP_DICTIONARIES
+    }
+
+
+def load_dictionaries(
+    api: Optional["HHAPI"] = None, cache_file: str = DEFAULT_CACHE_FILE
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Загрузить справочники опыта работы и типа занятости
+
+    Если передан api, справочники запрашиваются у HH и сохраняются
+    в кэш. Иначе (или при ошибке запроса) читается кэш, а при его
+    отсутствии используется офлайн-копия BUNDLED_DICTIONARIES.
+
+    Args:
+        api: экземпляр HHAPI для обновления справочников
+        cache_file: путь к файлу кэша
+
+    Returns:
+        Dict: для каждого справочника список элементов с ключами id и name
+    """
+    if api is not None:
+        data = api.get_dictionaries()
+        if data:
+            dictionaries = _select(data)
+            try:
+                with open(cache_file, "w", encoding="utf-8") as file:
+                    json.dump(dictionaries, file, ensure_ascii=False, indent=2)
+            except OSError as e:
+                print(f"Не удалось сохранить кэш справочников: {e}")
+            return dictionaries
+
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, encoding="utf-8") as file:
+                return _select(json.load(file))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Не удалось прочитать кэш справочников: {e}")
+    return BUNDLED_DICTIONARIES
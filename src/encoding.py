@@ -0,0 +1,132 @@
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Union
+
+# Код отсутствующего значения
+NULL_CODE = -1
+
+
+class StringDictionary:
+    """
+    Словарь для кодирования строк с небольшим числом различных значений
+
+    Каждой строке присваивается небольшой целочисленный код, а сама строка
+    хранится в словаре в единственном экземпляре.
+    """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        """
+        Инициализация словаря
+
+        Args:
+            values: значения, которым заранее присваиваются коды
+        """
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Optional[str]) -> int:
+        """
+        Получить код строки, добавив ее в словарь при необходимости
+
+        Args:
+            value: строка или None
+
+        Returns:
+            int: код строки, NULL_CODE для None
+        """
+        if value is None:
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        """
+        Получить строку по коду
+
+        Args:
+            code: код строки
+
+        Returns:
+            строка или None для NULL_CODE
+        """
+        return None if code == NULL_CODE else self.values[code]
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """
+        Получить единственный экземпляр строки из словаря
+
+        Args:
+            value: строка или None
+
+        Returns:
+            равная строка из словаря или None
+        """
+        if value is None:
+            return None
+        return self.values[self.encode(value)]
+
+
+# Общие словари для полей вакансий с небольшим числом значений
+CURRENCIES = StringDictionary(["RUR", "USD", "EUR", "KZT", "UZS", "BYR"])
+EXPERIENCE = StringDictionary()
+EMPLOYMENT = StringDictionary()
+# ID элементов справочников HH (experience.id, employment.id)
+EXPERIENCE_IDS = StringDictionary()
+EMPLOYMENT_IDS = StringDictionary()
+
+
+def intern_strings(values: Iterable[str]) -> List[str]:
+    """
+    Заменить равные строки одним экземпляром
+
+    Args:
+        values: строки, например названия компаний из результата запроса
+
+    Returns:
+        List[str]: те же строки, равные значения — общий объект
+    """
+    seen: Dict[str, str] = {}
+    return [seen.setdefault(value, value) for value in values]
+
+
+def compress_text(value: Optional[str]) -> Optional[bytes]:
+    """
+    Сжать текст (например, HTML-описание вакансии) zlib
+
+    Args:
+        value: текст или None
+
+    Returns:
+        сжатые байты UTF-8 или None
+    """
+    if value is None:
+        return None
+    return zlib.compress(value.encode("utf-8"))
+
+
+def decompress_text(data: Optional[Union[bytes, memoryview]]) -> Optional[str]:
+    """
+    Распаковать текст, сжатый compress_text
+
+    Args:
+        data: сжатые байты или None
+
+    Returns:
+        текст или None
+    """
+    if data is None:
+        return None
+    return zlib.decompress(data).decode("utf-8")
@@ -0,0 +1,107 @@
+import gzip
+import sys
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from src.dictionaries import LOOKUP_DICTIONARIES
+from src.projection import FULL, Projection
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+# Таблицы, которые выгружаются целиком в порядке ключа
+EXPORT_TABLES: Tuple[str, ...] = ("employers", "vacancies")
+
+EMPLOYER_EXPORT_COLUMNS: Tuple[str, ...] = ("id", "name", "url", "alternate_url", "description")
+
+# Уровень сжатия gzip: уровень 9 по умолчанию в несколько раз медленнее
+# при почти том же размере и не успевает за COPY
+COMPRESS_LEVEL = 6
+
+
+def build_table_query(table: str, projection: Projection = FULL) -> str:
+    """
+    Запрос выгрузки таблицы из EXPORT_TABLES
+
+    Столбцы перечисляются явно: выгрузка не зависит от служебных столбцов
+    таблиц (кодов справочников, salary_range) и не меняется вместе со схемой.
+    Вакансии выгружаются полями профиля проекции, опыт работы и тип
+    занятости — названиями из таблиц-справочников; сжатые описания
+    не выгружаются.
+
+    Args:
+        table: таблица из EXPORT_TABLES
+        projection: профиль проекции, с которым созданы таблицы
+
+    Returns:
+        str: запрос SELECT
+    """
+    if table == "employers":
+        return f"SELECT {', '.join(EMPLOYER_EXPORT_COLUMNS)} FROM employers ORDER BY id"
+    if table != "vacancies":
+        raise ValueError(f"Неизвестная таблица выгрузки: {table}")
+    columns = []
+    joins = []
+    for name in projection.vacancy_columns:
+        if name in LOOKUP_DICTIONARIES:
+            columns.append(f"{name}.name AS {name}")
+            joins.append(f" LEFT JOIN {name} ON {name}.id = v.{name}_id")
+        else:
+            columns.append(f"v.{name}")
+    return f"SELECT {', '.join(columns)} FROM vacancies v{''.join(joins)} ORDER BY v.id"
+
+
+def build_copy_query(query: str, fmt: str = "csv") -> str:
+    """
+    Обернуть запрос в COPY (...) TO STDOUT
+
+    CSV выгружается с заголовком. Для JSONL каждая строка превращается
+    в объект row_to_json и выгружается в формате csv с управляющими
+    символами в качестве кавычки и разделителя: JSON их не содержит
+    (row_to_json экранирует управляющие символы), поэтому значение
+    не заключается в кавычки, а обратные косые черты, в отличие
+    от текстового формата COPY, не удваиваются.
+
+    Args:
+        query: запрос без параметров (SELECT ...)
+        fmt: формат выгрузки из EXPORT_FORMATS
+
+    Returns:
+        str: запрос COPY
+    """
+    if fmt == "csv":
+        return f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    if fmt == "jsonl":
+        return (
+            f"COPY (SELECT row_to_json(q) FROM ({query}) q) TO STDOUT "
+            "WITH (FORMAT csv, QUOTE e'\\x01', DELIMITER e'\\x02')"
+        )
+    raise ValueError(f"Неизвестный формат выгрузки: {fmt}")
+
+
+@contextmanager
+def open_export_stream(path: Optional[str] = None, compress: bool = False) -> Iterator[BinaryIO]:
+    """
+    Открыть двоичный поток для выгрузки
+
+    Данные пишутся в поток по мере получения от сервера, поэтому
+    выгрузка любого объема занимает постоянную память.
+
+    Args:
+        path: путь к файлу, None — stdout
+        compress: сжимать выгрузку gzip
+
+    Yields:
+        BinaryIO: поток для записи
+    """
+    raw: BinaryIO = sys.stdout.buffer if path is None else open(path, "wb")
+    try:
+        if compress:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=COMPRESS_LEVEL) as stream:
+                yield stream  # type: ignore[misc]
+        else:
+            yield raw
+    finally:
+        if path is None:
+            raw.flush()
+        else:
+            raw.close()
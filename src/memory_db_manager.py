@@ -0,0 +1,308 @@
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.database import DatabaseManager
+from src.db_manager import VacancyResult, build_vacancy_rows, salary_range_params
+from src.models import Employer, Vacancy, VacancyBatch
+from src.snapshot import Snapshot, read_tables
+
+
+def _like_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Построить проверку строки на соответствие шаблону LIKE
+
+    Как в PostgreSQL: % — любая последовательность символов, _ — один
+    символ, обратная косая черта экранирует следующий символ. Шаблон
+    вида %слово% без других спецсимволов проверяется поиском подстроки.
+
+    Args:
+        pattern: шаблон LIKE
+
+    Returns:
+        функция, возвращающая True для подходящих строк
+    """
+    inner = pattern[1:-1] if len(pattern) >= 2 and pattern[0] == pattern[-1] == "%" else None
+    if inner is not None and not any(c in inner for c in "%_\\"):
+        return lambda value: inner in value
+
+    parts = []
+    chars = iter(pattern)
+    for char in chars:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        elif char == "\\":
+            parts.append(re.escape(next(chars, "")))
+        else:
+            parts.append(re.escape(char))
+    regex = re.compile("".join(parts), re.DOTALL)
+    return lambda value: regex.fullmatch(value) is not None
+
+
+def _half(total: int) -> int:
+    """Деление на 2 с отбрасыванием дробной части, как у integer в PostgreSQL"""
+    return total // 2 if total >= 0 else -(-total // 2)
+
+
+class MemoryDBManager:
+    """
+    Вариант DBManager, выполняющий отчеты над данными в памяти
+
+    Данные хранятся по столбцам (VacancyBatch), а все, что не зависит
+    от параметров отчетов, считается один раз при создании: зарплата
+    каждой вакансии, названия в нижнем регистре, порядок сортировки
+    по компании и названию и по убыванию зарплаты. Поэтому отчеты
+    сводятся к проходу по готовым индексам, а отбор вакансий с зарплатой
+    выше средней — к двоичному поиску.
+
+    Результаты совпадают с DBManager на тех же данных: повторяющиеся id
+    заменяются последней версией (как при ON CONFLICT DO UPDATE),
+    вакансии без работодателя не попадают в отчеты с JOIN, зарплата
+    вакансии — (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2
+    с целочисленным делением. Строки сравниваются по кодам символов,
+    как при COLLATE "C"; порядок равных строк — порядок загрузки.
+    """
+
+    def __init__(self, employers: Sequence[Employer], vacancies: VacancyBatch) -> None:
+        """
+        Инициализация менеджера
+
+        Args:
+            employers: работодатели
+            vacancies: пачка вакансий
+        """
+        self.employers = {employer.id: employer for employer in employers}
+        self.vacancies = vacancies
+
+        employer_index = {employer_id: i for i, employer_id in enumerate(self.employers)}
+        self._employer_names = [employer.name for employer in self.employers.values()]
+
+        last = {vacancy_id: i for i, vacancy_id in enumerate(vacancies.id)}
+        rows = [i for i, vacancy_id in enumerate(vacancies.id) if last[vacancy_id] == i]
+
+        # Индекс работодателя каждой вакансии, -1 — работодателя нет в данных
+        self._employer = array(
+            "l", (employer_index.get(employer_id, -1) for employer_id in vacancies.employer_id)
+        )
+        # Маски хранят 0 для отсутствующих границ, что соответствует COALESCE(x, 0)
+        self._salary = array(
+            "q",
+            (_half(low + high) for low, high in zip(vacancies.salary_from, vacancies.salary_to)),
+        )
+        self._lower_names = [name.lower() for name in vacancies.name]
+        self._currency = vacancies.decode("currency")
+
+        with_salary = [
+            i for i in rows if vacancies.salary_from_mask[i] or vacancies.salary_to_mask[i]
+        ]
+        self._salary_total = sum(self._salary[i] for i in with_salary)
+        self._salary_count = len(with_salary)
+
+        joined = [i for i in rows if self._employer[i] >= 0]
+        names = self._employer_names
+        self._by_name = array(
+            "l", sorted(joined, key=lambda i: (names[self._employer[i]], vacancies.name[i]))
+        )
+        self._by_salary = array("l", sorted(joined, key=lambda i: -self._salary[i]))
+        # Отрицательные зарплаты в порядке _by_salary: возрастающая последовательность
+        self._by_salary_keys = array("q", (-self._salary[i] for i in self._by_salary))
+        self._vacancy_counts = Counter(self._employer[i] for i in joined)
+
+    @classmethod
+    def from_models(
+        cls, employers: Sequence[Employer], vacancies: Iterable[Vacancy]
+    ) -> "MemoryDBManager":
+        """
+        Создать менеджер из моделей
+
+        Args:
+            employers: работодатели
+            vacancies: вакансии
+
+        Returns:
+            MemoryDBManager: менеджер с данными в памяти
+        """
+        batch = VacancyBatch()
+        for v in vacancies:
+            batch.append_row(
+                (
+                    v.id, v.name, v.url, v.alternate_url, v.employer_id,
+                    v.salary_from, v.salary_to, v.currency, v.gross,
+                    v.compressed_description, v.experience, v.employment,
+                    v.experience_hh_id, v.employment_hh_id,
+                )
+            )
+        return cls(employers, batch)
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "MemoryDBManager":
+        """
+        Создать менеджер из столбцового снимка (см. src.snapshot)
+
+        Args:
+            path: путь к файлу снимка
+
+        Returns:
+            MemoryDBManager: менеджер с данными в памяти
+        """
+        with Snapshot(path) as snapshot:
+            return cls(snapshot.employers(), snapshot.to_batch())
+
+    @classmethod
+    def from_database(cls, db_manager: DatabaseManager) -> "MemoryDBManager":
+        """
+        Создать менеджер из содержимого базы данных
+
+        Args:
+            db_manager: менеджер базы данных
+
+        Returns:
+            MemoryDBManager: менеджер с данными в памяти
+        """
+        return cls(*read_tables(db_manager))
+
+    def __enter__(self) -> "MemoryDBManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Для совместимости с DBManager: соединений нет"""
+
+    def _rows(self, indices: Iterable[int]) -> List[Tuple[Any, ...]]:
+        """Строки (company, vacancy, salary_from, salary_to, currency, url)"""
+        v = self.vacancies
+        names = self._employer_names
+        return [
+            (
+                names[self._employer[i]],
+                v.name[i],
+                v.salary_from[i] if v.salary_from_mask[i] else None,
+                v.salary_to[i] if v.salary_to_mask[i] else None,
+                self._currency[i],
+                v.alternate_url[i],
+            )
+            for i in indices
+        ]
+
+    def get_companies_and_vacancies_count(self) -> List[Dict[str, Any]]:
+        """
+        Получить список всех компаний и количество вакансий у каждой компании
+
+        Returns:
+            List[Dict]: список словарей с данными компаний и количеством вакансий
+        """
+        counts = self._vacancy_counts
+        order = sorted(range(len(self._employer_names)), key=lambda i: -counts[i])
+        return [
+            {"company": self._employer_names[i], "vacancies_count": counts[i]} for i in order
+        ]
+
+    def get_all_vacancies(self, row_format: str = "dict") -> VacancyResult:
+        """
+        Получить список всех вакансий с указанием названия компании,
+        названия вакансии, зарплаты и ссылки на вакансию
+
+        Args:
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате (см. build_vacancy_rows)
+        """
+        return build_vacancy_rows(self._rows(self._by_name), row_format)
+
+    def get_avg_salary(self) -> float:
+        """
+        Получить среднюю зарплату по вакансиям
+
+        Returns:
+            float: средняя зарплата
+        """
+        if not self._salary_count:
+            return 0.0
+        return round(self._salary_total / self._salary_count, 2)
+
+    def get_vacancies_with_higher_salary(self, row_format: str = "dict") -> VacancyResult:
+        """
+        Получить список всех вакансий, у которых зарплата выше средней по всем вакансиям
+
+        Args:
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате (см. build_vacancy_rows)
+        """
+        avg_salary = self.get_avg_salary()
+        count = bisect_left(self._by_salary_keys, -avg_salary)
+        return build_vacancy_rows(self._rows(self._by_salary[:count]), row_format)
+
+    def get_vacancies_with_keyword(
+        self, keyword: str, row_format: str = "dict"
+    ) -> VacancyResult:
+        """
+        Получить список всех вакансий, в названии которых содержатся переданные слова
+
+        Args:
+            keyword: ключевое слово для поиска
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате (см. build_vacancy_rows)
+        """
+        matches = _like_matcher(f"%{keyword.lower()}%")
+        lower_names = self._lower_names
+        return build_vacancy_rows(
+            self._rows(i for i in self._by_name if matches(lower_names[i])), row_format
+        )
+
+    def get_vacancies_in_salary_range(
+        self,
+        salary_min: Optional[int] = None,
+        salary_max: Optional[int] = None,
+        currency: Optional[str] = None,
+        employer_ids: Optional[Sequence[int]] = None,
+        keyword: Optional[str] = None,
+        row_format: str = "dict",
+    ) -> VacancyResult:
+        """
+        Получить вакансии, зарплатная вилка которых пересекается с диапазоном
+
+        Args:
+            salary_min: нижняя граница диапазона, None — открытая
+            salary_max: верхняя граница диапазона, None — открытая
+            currency: учитывать только вакансии в этой валюте
+            employer_ids: учитывать только вакансии этих работодателей
+            keyword: ключевое слово в названии вакансии
+            row_format: формат результата — "dict", "tuple" или "columns"
+
+        Returns:
+            список вакансий в выбранном формате (см. build_vacancy_rows)
+        """
+        salary_range_params(salary_min, salary_max)
+        v = self.vacancies
+        employers = set(employer_ids) if employer_ids is not None else None
+        matches = _like_matcher(f"%{keyword.lower()}%") if keyword is not None else None
+
+        def selected(i: int) -> bool:
+            has_from, has_to = v.salary_from_mask[i], v.salary_to_mask[i]
+            if not has_from and not has_to:
+                return False
+            # Как у salary_range: открытые границы, перевернутая вилка упорядочивается
+            low = v.salary_from[i] if has_from else None
+            high = v.salary_to[i] if has_to else None
+            if low is not None and high is not None and low > high:
+                low, high = high, low
+            return (
+                (salary_max is None or low is None or low <= salary_max)
+                and (salary_min is None or high is None or high >= salary_min)
+                and (currency is None or self._currency[i] == currency)
+                and (employers is None or v.employer_id[i] in employers)
+                and (matches is None or matches(self._lower_names[i]))
+            )
+
+        return build_vacancy_rows(self._rows(i for i in self._by_name if selected(i)), row_format)
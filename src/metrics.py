@@ -0,0 +1,313 @@
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Границы корзин гистограмм длительности, секунды
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Границы корзин гистограмм размера пакета, строки
+BATCH_BUCKETS: Tuple[float, ...] = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Метки в формате Prometheus: {name="value",...}"""
+    pairs = [
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Число в формате Prometheus"""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Счетчик с метками: монотонно растущая сумма"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        """
+        Увеличить счетчик
+
+        Args:
+            amount: приращение
+            labels: значения меток в порядке label_names
+        """
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Текущее значение счетчика для меток"""
+        with self._lock:
+            return self._values.get(tuple(str(label) for label in labels), 0)
+
+    def samples(self) -> List[str]:
+        """Строки значений в текстовом формате Prometheus"""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram:
+    """
+    Гистограмма с метками: количество наблюдений по корзинам,
+    их сумма и количество
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Для каждого набора меток: счетчики корзин (последняя — +Inf), сумма
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Учесть наблюдение
+
+        Args:
+            value: наблюдаемое значение
+            labels: значения меток в порядке label_names
+        """
+        key = tuple(str(label) for label in labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Учесть длительность блока with в секундах"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        """Количество наблюдений для меток"""
+        with self._lock:
+            counts, _ = self._values.get(tuple(str(label) for label in labels), ([], [0.0]))
+            return sum(counts)
+
+    def sum(self, *labels: str) -> float:
+        """Сумма наблюдений для меток"""
+        with self._lock:
+            _, total = self._values.get(tuple(str(label) for label in labels), ([], [0.0]))
+            return total[0]
+
+    def samples(self) -> List[str]:
+        """Строки значений в текстовом формате Prometheus"""
+        with self._lock:
+            items = sorted((key, (list(c), t[0])) for key, (c, t) in self._values.items())
+        lines: List[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Набор метрик процесса с выводом в текстовом формате Prometheus"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """Получить счетчик, создав его при первом обращении"""
+        return self._register(Counter(name, documentation, labels))  # type: ignore[no-any-return]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Получить гистограмму, создав ее при первом обращении"""
+        return self._register(  # type: ignore[no-any-return]
+            Histogram(name, documentation, labels, buckets)
+        )
+
+    def render(self) -> str:
+        """
+        Вывести все метрики
+
+        Returns:
+            str: метрики в текстовом формате Prometheus
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Записать метрики в файл (например, для textfile collector
+        node_exporter); файл заменяется атомарно
+
+        Args:
+            path: путь к файлу
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> Any:
+        """
+        Отдавать метрики по HTTP (GET /metrics) в фоновом потоке
+
+        Args:
+            port: порт (0 — любой свободный)
+            host: адрес
+
+        Returns:
+            HTTPServer: запущенный сервер; server_address — фактический адрес
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name="hh-metrics", daemon=True)
+        thread.start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+# Запросы к API HH
+HTTP_REQUESTS = REGISTRY.counter(
+    "hh_http_requests_total", "HTTP-запросы к API HH", ("endpoint", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "hh_http_request_duration_seconds", "Длительность HTTP-запросов к API HH", ("endpoint",)
+)
+HTTP_BYTES = REGISTRY.counter(
+    "hh_http_response_bytes_total", "Размер ответов API HH", ("endpoint",)
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "hh_http_retries_total",
+    "Повторные запросы страниц выдачи после ее сдвига",
+    ("endpoint",),
+)
+
+# Запросы к базе данных
+DB_LATENCY = REGISTRY.histogram(
+    "hh_db_statement_duration_seconds", "Длительность запросов к БД", ("statement",)
+)
+DB_ROWS = REGISTRY.counter(
+    "hh_db_rows_total", "Строки, записанные или прочитанные запросами к БД", ("statement",)
+)
+DB_BATCH_ROWS = REGISTRY.histogram(
+    "hh_db_batch_rows", "Размер пакетов записи в БД", ("statement",), BATCH_BUCKETS
+)
+
+
+def observe_statement(statement: str, elapsed: float, rows: Optional[int] = None) -> None:
+    """
+    Учесть выполнение запроса к БД
+
+    Args:
+        statement: имя запроса
+        elapsed: длительность, секунды
+        rows: количество строк результата
+    """
+    DB_LATENCY.observe(elapsed, statement)
+    if rows is not None:
+        DB_ROWS.inc(rows, statement)
+
+
+@contextmanager
+def timed_batch(statement: str, rows: int) -> Iterator[None]:
+    """
+    Учесть длительность блока with как запись пакета из rows строк
+
+    Args:
+        statement: имя запроса
+        rows: количество строк пакета
+    """
+    DB_BATCH_ROWS.observe(rows, statement)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_statement(statement, time.perf_counter() - start, rows)
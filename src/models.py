@@ -1,7 +1,58 @@
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import math
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
 
+from src.encoding import (
+    CURRENCIES,
+    EMPLOYMENT,
+    EMPLOYMENT_IDS,
+    EXPERIENCE,
+    EXPERIENCE_IDS,
+    NULL_CODE,
+    StringDictionary,
+    compress_text,
+    decompress_text,
+)
+from src.projection import FULL, Projection
 
+T = TypeVar("T")
+
+# Ключ значения справочника: ID элемента справочника HH и отображаемое название
+LookupKey = Tuple[Optional[str], Optional[str]]
+
+
+def _slotted(cls: Type[T]) -> Type[T]:
+    """
+    Пересоздать dataclass с __slots__ вместо __dict__ у экземпляров
+
+    Аналог dataclass(slots=True), доступного только с Python 3.10.
+    Значения по умолчанию уже сохранены в сгенерированном __init__,
+    поэтому атрибуты класса с ними можно удалить.
+    """
+    names = tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _avg_salary(from_: Optional[int], to: Optional[int]) -> Optional[float]:
+    """Средняя зарплата по границам вилки"""
+    if from_ is not None and to is not None:
+        return (from_ + to) / 2
+    elif from_ is not None:
+        return float(from_)
+    elif to is not None:
+        return float(to)
+    return None
+
+
+@_slotted
 @dataclass
 class Salary:
     """Модель зарплаты"""
@@ -13,15 +64,48 @@ class Salary:
 
     def get_avg_salary(self) -> Optional[float]:
         """Получить среднюю зарплату"""
-        if self.from_ is not None and self.to is not None:
-            return (self.from_ + self.to) / 2
-        elif self.from_ is not None:
-            return float(self.from_)
-        elif self.to is not None:
-            return float(self.to)
-        return None
+        return _avg_salary(self.from_, self.to)
+
+
+# Поля вакансии, в которых хранятся поля зарплаты
+_SALARY_FIELDS = {
+    "from_": "salary_from",
+    "to": "salary_to",
+    "currency": "currency",
+    "gross": "gross",
+}
+
+
+class _VacancySalary(Salary):
+    """
+    Зарплата, возвращаемая Vacancy.salary
+
+    Вакансия хранит поля зарплаты в себе, а объект строится при обращении;
+    изменение его полей записывается обратно в вакансию.
+    """
 
+    __slots__ = ("_vacancy",)
 
+    def __init__(self, vacancy: "Vacancy") -> None:
+        object.__setattr__(self, "_vacancy", vacancy)
+        for name, source in _SALARY_FIELDS.items():
+            object.__setattr__(self, name, getattr(vacancy, source))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        setattr(self._vacancy, _SALARY_FIELDS[name], value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Salary):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _SALARY_FIELDS)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in _SALARY_FIELDS)
+        return f"Salary({values})"
+
+
+@_slotted
 @dataclass
 class Employer:
     """Модель работодателя"""
@@ -44,41 +128,472 @@ class Employer:
         )
 
 
-@dataclass
 class Vacancy:
-    """Модель вакансии"""
+    """
+    Модель вакансии
 
-    id: int
-    name: str
-    url: str
-    alternate_url: str
-    employer_id: int
-    salary: Optional[Salary] = None
-    description: Optional[str] = None
-    experience: Optional[str] = None
-    employment: Optional[str] = None
+    Поля зарплаты хранятся в самой вакансии: объект Salary создается
+    только при обращении к атрибуту salary. Описание хранится сжатым
+    (compressed_description) и распаковывается при каждом обращении
+    к атрибуту description. Для опыта работы и типа занятости хранятся
+    название и ID элемента справочника HH (experience_hh_id, employment_hh_id).
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "url",
+        "alternate_url",
+        "employer_id",
+        "has_salary",
+        "salary_from",
+        "salary_to",
+        "currency",
+        "gross",
+        "compressed_description",
+        "experience",
+        "employment",
+        "experience_hh_id",
+        "employment_hh_id",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        url: str,
+        alternate_url: str,
+        employer_id: int,
+        salary: Optional[Salary] = None,
+        description: Optional[str] = None,
+        experience: Optional[str] = None,
+        employment: Optional[str] = None,
+        experience_hh_id: Optional[str] = None,
+        employment_hh_id: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.url = url
+        self.alternate_url = alternate_url
+        self.employer_id = employer_id
+        self.salary = salary
+        self.description = description
+        self.experience = experience
+        self.employment = employment
+        self.experience_hh_id = experience_hh_id
+        self.employment_hh_id = employment_hh_id
+
+    @property
+    def salary(self) -> Optional[Salary]:
+        """Зарплата вакансии или None, если она не указана"""
+        if not self.has_salary:
+            return None
+        return _VacancySalary(self)
+
+    @salary.setter
+    def salary(self, salary: Optional[Salary]) -> None:
+        self.has_salary = salary is not None
+        self.salary_from = salary.from_ if salary else None
+        self.salary_to = salary.to if salary else None
+        self.currency = salary.currency if salary else None
+        self.gross = salary.gross if salary else None
+
+    @property
+    def description(self) -> Optional[str]:
+        """Описание вакансии, распаковывается при обращении"""
+        return decompress_text(self.compressed_description)
+
+    @description.setter
+    def description(self, description: Optional[str]) -> None:
+        self.compressed_description = compress_text(description)
+
+    def get_avg_salary(self) -> Optional[float]:
+        """Получить среднюю зарплату без создания объекта Salary"""
+        return _avg_salary(self.salary_from, self.salary_to)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"Vacancy(id={self.id!r}, name={self.name!r}, url={self.url!r}, "
+            f"alternate_url={self.alternate_url!r}, employer_id={self.employer_id!r}, "
+            f"salary={self.salary!r}, description={self.description!r}, "
+            f"experience={self.experience!r}, employment={self.employment!r}, "
+            f"experience_hh_id={self.experience_hh_id!r}, "
+            f"employment_hh_id={self.employment_hh_id!r})"
+        )
 
     @classmethod
-    def from_json(cls, data: Dict[str, Any]) -> "Vacancy":
-        """Создать объект Vacancy из JSON данных"""
-        salary_data = data.get("salary")
-        salary = None
-        if salary_data:
-            salary = Salary(
-                from_=salary_data.get("from"),
-                to=salary_data.get("to"),
-                currency=salary_data.get("currency"),
-                gross=salary_data.get("gross"),
-            )
+    def from_json(cls, data: Dict[str, Any], projection: Projection = FULL) -> "Vacancy":
+        """
+        Создать объект Vacancy из JSON данных
 
-        return cls(
+        Args:
+            data: элемент "items" ответа HH
+            projection: профиль проекции; поля вне профиля не разбираются
+
+        Returns:
+            Vacancy: вакансия
+        """
+        experience = data.get("experience", {}) if "experience" in projection else {}
+        employment = data.get("employment", {}) if "employment" in projection else {}
+        vacancy = cls(
             id=int(data["id"]),
             name=data["name"],
-            url=data.get("url", ""),
+            url=data.get("url", "") if "url" in projection else "",
             alternate_url=data.get("alternate_url", ""),
             employer_id=int(data["employer"]["id"]),
-            salary=salary,
-            description=data.get("description"),
-            experience=data.get("experience", {}).get("name"),
-            employment=data.get("employment", {}).get("name"),
+            description=data.get("description") if "description" in projection else None,
+            experience=EXPERIENCE.intern(experience.get("name")),
+            employment=EMPLOYMENT.intern(employment.get("name")),
+            experience_hh_id=EXPERIENCE_IDS.intern(experience.get("id")),
+            employment_hh_id=EMPLOYMENT_IDS.intern(employment.get("id")),
+        )
+
+        salary_data = data.get("salary")
+        if salary_data:
+            vacancy.has_salary = True
+            vacancy.salary_from = salary_data.get("from")
+            vacancy.salary_to = salary_data.get("to")
+            vacancy.currency = CURRENCIES.intern(salary_data.get("currency"))
+            vacancy.gross = salary_data.get("gross")
+        return vacancy
+
+    @classmethod
+    def from_json_batch(
+        cls, items: Iterable[Dict[str, Any]], projection: Projection = FULL
+    ) -> "VacancyBatch":
+        """
+        Создать столбцовую пачку вакансий из JSON данных
+
+        Args:
+            items: элементы "items" одной или нескольких страниц ответа HH
+            projection: профиль проекции; поля вне профиля не разбираются
+
+        Returns:
+            VacancyBatch: пачка вакансий
+        """
+        batch = VacancyBatch()
+        for data in items:
+            batch.append_json(data, projection)
+        return batch
+
+
+def _compressed(value: Any) -> Optional[bytes]:
+    """Привести описание из текста или bytea к сжатым байтам"""
+    if isinstance(value, str):
+        return compress_text(value)
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return value
+
+
+def _new_int_column() -> "array[int]":
+    return array("q")
+
+
+# Коды словарей хранятся в int16; столбец, код которого не поместился,
+# расширяется до int32 (словари общие для процесса и растут без ограничений)
+CODE_TYPECODE = "h"
+WIDE_CODE_TYPECODE = "i"
+
+
+def _new_code_column() -> "array[int]":
+    return array(CODE_TYPECODE)
+
+
+# Общие словари для столбцов VacancyBatch, хранящихся в виде кодов
+DICTIONARY_COLUMNS: Dict[str, StringDictionary] = {
+    "currency": CURRENCIES,
+    "experience": EXPERIENCE,
+    "employment": EMPLOYMENT,
+    "experience_hh_id": EXPERIENCE_IDS,
+    "employment_hh_id": EMPLOYMENT_IDS,
+}
+
+
+@dataclass
+class VacancyBatch:
+    """
+    Пачка вакансий в столбцовом представлении
+
+    Числовые поля хранятся в типизированных массивах array, строки —
+    в списках. У полей, которые могут отсутствовать, есть маска:
+    1 — значение задано, 0 — отсутствует (в массиве при этом 0).
+    Валюта, опыт и тип занятости (названия и ID справочников HH)
+    хранятся кодами общих словарей из src.encoding (NULL_CODE —
+    значение отсутствует), описания —
+    сжатыми zlib (см. get_description).
+    Массивы поддерживают протокол буфера, поэтому при необходимости
+    их можно без копирования передать в numpy.frombuffer.
+    """
+
+    id: "array[int]" = field(default_factory=_new_int_column)
+    employer_id: "array[int]" = field(default_factory=_new_int_column)
+    has_salary: bytearray = field(default_factory=bytearray)
+    salary_from: "array[int]" = field(default_factory=_new_int_column)
+    salary_from_mask: bytearray = field(default_factory=bytearray)
+    salary_to: "array[int]" = field(default_factory=_new_int_column)
+    salary_to_mask: bytearray = field(default_factory=bytearray)
+    gross: bytearray = field(default_factory=bytearray)
+    gross_mask: bytearray = field(default_factory=bytearray)
+    name: List[str] = field(default_factory=list)
+    url: List[str] = field(default_factory=list)
+    alternate_url: List[str] = field(default_factory=list)
+    currency: "array[int]" = field(default_factory=_new_code_column)
+    description: List[Optional[bytes]] = field(default_factory=list)
+    experience: "array[int]" = field(default_factory=_new_code_column)
+    employment: "array[int]" = field(default_factory=_new_code_column)
+    experience_hh_id: "array[int]" = field(default_factory=_new_code_column)
+    employment_hh_id: "array[int]" = field(default_factory=_new_code_column)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def append_json(self, data: Dict[str, Any], projection: Projection = FULL) -> None:
+        """
+        Добавить вакансию из JSON данных
+
+        Args:
+            data: элемент "items" ответа HH
+            projection: профиль проекции; поля вне профиля остаются пустыми
+        """
+        salary = data.get("salary") or {}
+        salary_from = salary.get("from")
+        salary_to = salary.get("to")
+        gross = salary.get("gross")
+
+        self.id.append(int(data["id"]))
+        self.employer_id.append(int(data["employer"]["id"]))
+        self.has_salary.append(1 if salary else 0)
+        self.salary_from.append(salary_from or 0)
+        self.salary_from_mask.append(salary_from is not None)
+        self.salary_to.append(salary_to or 0)
+        self.salary_to_mask.append(salary_to is not None)
+        self.gross.append(bool(gross))
+        self.gross_mask.append(gross is not None)
+        self.name.append(data["name"])
+        self.url.append(data.get("url", "") if "url" in projection else "")
+        self.alternate_url.append(data.get("alternate_url", ""))
+        self._append_code("currency", CURRENCIES.encode(salary.get("currency")))
+        self.description.append(
+            compress_text(data.get("description")) if "description" in projection else None
+        )
+        experience = data.get("experience", {}) if "experience" in projection else {}
+        employment = data.get("employment", {}) if "employment" in projection else {}
+        self._append_code("experience", EXPERIENCE.encode(experience.get("name")))
+        self._append_code("employment", EMPLOYMENT.encode(employment.get("name")))
+        self._append_code("experience_hh_id", EXPERIENCE_IDS.encode(experience.get("id")))
+        self._append_code("employment_hh_id", EMPLOYMENT_IDS.encode(employment.get("id")))
+
+    def _append_code(self, name: str, code: int) -> None:
+        """Добавить код словаря в столбец, расширив его при переполнении int16"""
+        column = getattr(self, name)
+        try:
+            column.append(code)
+        except OverflowError:
+            column = array(WIDE_CODE_TYPECODE, column)
+            column.append(code)
+            setattr(self, name, column)
+
+    def append_row(self, row: Tuple[Any, ...]) -> None:
+        """
+        Добавить вакансию из строки таблицы vacancies
+
+        Args:
+            row: строка в порядке столбцов, как в rows(); описание может
+                быть как сжатым, так и текстом; за ними могут следовать
+                ID справочников HH опыта работы и типа занятости
+        """
+        salary_from, salary_to, currency, gross = row[5:9]
+        self.id.append(row[0])
+        self.employer_id.append(row[4])
+        self.has_salary.append(
+            salary_from is not None or salary_to is not None or currency is not None
         )
+        self.salary_from.append(salary_from or 0)
+        self.salary_from_mask.append(salary_from is not None)
+        self.salary_to.append(salary_to or 0)
+        self.salary_to_mask.append(salary_to is not None)
+        self.gross.append(bool(gross))
+        self.gross_mask.append(gross is not None)
+        self.name.append(row[1])
+        self.url.append(row[2])
+        self.alternate_url.append(row[3])
+        self._append_code("currency", CURRENCIES.encode(currency))
+        self.description.append(_compressed(row[9]))
+        self._append_code("experience", EXPERIENCE.encode(row[10]))
+        self._append_code("employment", EMPLOYMENT.encode(row[11]))
+        experience_id, employment_id = row[12:14] if len(row) > 12 else (None, None)
+        self._append_code("experience_hh_id", EXPERIENCE_IDS.encode(experience_id))
+        self._append_code("employment_hh_id", EMPLOYMENT_IDS.encode(employment_id))
+
+    def get_description(self, index: int) -> Optional[str]:
+        """
+        Распаковать описание вакансии
+
+        Args:
+            index: номер вакансии в пачке
+
+        Returns:
+            описание или None
+        """
+        return decompress_text(self.description[index])
+
+    def decode(self, name: str) -> List[Optional[str]]:
+        """
+        Раскодировать столбец, хранящийся в виде кодов словаря
+
+        Args:
+            name: имя столбца, закодированного словарем (см. DICTIONARY_COLUMNS)
+
+        Returns:
+            List: значения столбца
+        """
+        dictionary = DICTIONARY_COLUMNS[name]
+        return [dictionary.decode(code) for code in getattr(self, name)]
+
+    def count_by(self, name: str) -> Dict[Optional[str], int]:
+        """
+        Посчитать количество вакансий по значениям закодированного столбца
+
+        Подсчет идет по целочисленным кодам, строки не сравниваются.
+
+        Args:
+            name: имя столбца, закодированного словарем (см. DICTIONARY_COLUMNS)
+
+        Returns:
+            Dict: количество вакансий для каждого значения
+        """
+        dictionary = DICTIONARY_COLUMNS[name]
+        return {
+            dictionary.decode(code): count
+            for code, count in Counter(getattr(self, name)).items()
+        }
+
+    def lookup_keys(self, name: str) -> List[LookupKey]:
+        """
+        Ключи значений справочника для всех вакансий пачки
+
+        Args:
+            name: имя справочника (experience или employment)
+
+        Returns:
+            List: пары (ID элемента справочника HH, название) по вакансиям
+        """
+        return list(zip(self.decode(f"{name}_hh_id"), self.decode(name)))
+
+    def extend(self, other: "VacancyBatch") -> None:
+        """Добавить в конец вакансии другой пачки"""
+        for f in fields(self):
+            column, values = getattr(self, f.name), getattr(other, f.name)
+            if isinstance(column, array) and column.typecode != values.typecode:
+                # Один из столбцов кодов расширен до int32
+                column = array(WIDE_CODE_TYPECODE, column)
+                values = array(WIDE_CODE_TYPECODE, values)
+                setattr(self, f.name, column)
+            column.extend(values)
+
+    def deduplicate(self) -> "VacancyBatch":
+        """
+        Оставить для каждого id только последнюю версию вакансии
+
+        Повторяющиеся id в одном многострочном INSERT ... ON CONFLICT
+        приводят к ошибке, поэтому пачка очищается от них перед загрузкой.
+
+        Returns:
+            VacancyBatch: эта же пачка, если повторов нет, иначе новая
+        """
+        last = {vacancy_id: i for i, vacancy_id in enumerate(self.id)}
+        if len(last) == len(self):
+            return self
+        keep = sorted(last.values())
+        batch = VacancyBatch()
+        for f in fields(self):
+            column = getattr(self, f.name)
+            if isinstance(column, array):
+                setattr(batch, f.name, array(column.typecode, [column[i] for i in keep]))
+            else:
+                getattr(batch, f.name).extend([column[i] for i in keep])
+        return batch
+
+    def get_avg_salaries(self) -> "array[float]":
+        """
+        Посчитать среднюю зарплату для всех вакансий пачки за один проход
+
+        Returns:
+            array: средние зарплаты, NaN — если зарплата не указана
+        """
+        nan = math.nan
+        return array(
+            "d",
+            (
+                (f + t) / 2 if fm and tm else f if fm else t if tm else nan
+                for f, fm, t, tm in zip(
+                    self.salary_from,
+                    self.salary_from_mask,
+                    self.salary_to,
+                    self.salary_to_mask,
+                )
+            ),
+        )
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Строки пачки в порядке столбцов таблицы vacancies
+
+        Yields:
+            Tuple: id, name, url, alternate_url, employer_id, salary_from,
+            salary_to, currency, salary_gross, description, experience, employment;
+            description — сжатое описание для таблицы vacancy_descriptions
+        """
+        currency = self.decode("currency")
+        experience = self.decode("experience")
+        employment = self.decode("employment")
+        for i in range(len(self)):
+            yield (
+                self.id[i],
+                self.name[i],
+                self.url[i],
+                self.alternate_url[i],
+                self.employer_id[i],
+                self.salary_from[i] if self.salary_from_mask[i] else None,
+                self.salary_to[i] if self.salary_to_mask[i] else None,
+                currency[i],
+                bool(self.gross[i]) if self.gross_mask[i] else None,
+                self.description[i],
+                experience[i],
+                employment[i],
+            )
+
+    def to_vacancies(self) -> List[Vacancy]:
+        """Преобразовать пачку в список объектов Vacancy"""
+        vacancies = []
+        experience_ids = self.decode("experience_hh_id")
+        employment_ids = self.decode("employment_hh_id")
+        for i, row in enumerate(self.rows()):
+            vacancy = Vacancy(
+                id=row[0],
+                name=row[1],
+                url=row[2],
+                alternate_url=row[3],
+                employer_id=row[4],
+                experience=row[10],
+                employment=row[11],
+                experience_hh_id=experience_ids[i],
+                employment_hh_id=employment_ids[i],
+            )
+            vacancy.compressed_description = row[9]
+            if self.has_salary[i]:
+                vacancy.has_salary = True
+                vacancy.salary_from, vacancy.salary_to = row[5], row[6]
+                vacancy.currency, vacancy.gross = row[7], row[8]
+            vacancies.append(vacancy)
+        return vacancies
@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from typing import IO, Any, Iterable, Optional, Sequence
+
+FORMATS = ("text", "csv", "jsonl")
+
+# Размер буфера, после заполнения которого данные передаются в поток
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+class OutputWriter:
+    """
+    Буферизованный вывод строк отчетов в формате text, csv или jsonl
+
+    Строки форматируются в буфер в памяти и передаются в поток одним
+    вызовом write на каждые buffer_size символов, а не print на каждое
+    поле. Формат text — значения через " | ", csv — с заголовком,
+    jsonl — по объекту JSON на строку. Отсутствующие значения выводятся
+    пустыми строками (в jsonl — null).
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        columns: Sequence[str],
+        fmt: str = "text",
+        limit: Optional[int] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """
+        Инициализация вывода
+
+        Args:
+            stream: поток вывода
+            columns: названия столбцов
+            fmt: формат вывода из FORMATS
+            limit: максимальное количество строк, None — без ограничения
+            buffer_size: размер буфера в символах
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Неизвестный формат вывода: {fmt}")
+        if limit is not None and limit < 0:
+            raise ValueError("Ограничение количества строк не может быть отрицательным")
+        self.stream = stream
+        self.columns = tuple(columns)
+        self.format = fmt
+        self.limit = limit
+        self.buffer_size = buffer_size
+        self.rows_written = 0
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+        if fmt == "csv":
+            self._csv.writerow(self.columns)
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def write_row(self, row: Sequence[Any]) -> bool:
+        """
+        Вывести строку
+
+        Args:
+            row: значения в порядке columns
+
+        Returns:
+            bool: False, если достигнуто ограничение количества строк
+        """
+        if self.limit is not None and self.rows_written >= self.limit:
+            return False
+        if self.format == "csv":
+            self._csv.writerow(row)
+        elif self.format == "jsonl":
+            self._buffer.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False))
+            self._buffer.write("\n")
+        else:
+            self._buffer.write(" | ".join("" if v is None else str(v) for v in row))
+            self._buffer.write("\n")
+        self.rows_written += 1
+        if self._buffer.tell() >= self.buffer_size:
+            self.flush()
+        return True
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Вывести строки, остановившись на ограничении количества строк
+
+        Args:
+            rows: строки в порядке columns
+
+        Returns:
+            int: количество выведенных строк
+        """
+        written = self.rows_written
+        for row in rows:
+            if not self.write_row(row):
+                break
+        return self.rows_written - written
+
+    def flush(self) -> None:
+        """Передать содержимое буфера в поток"""
+        data = self._buffer.getvalue()
+        if data:
+            self.stream.write(data)
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self.stream.flush()
+
+
+class Pager:
+    """
+    Поток вывода через программу постраничного просмотра
+
+    Команда берется из переменной окружения PAGER (по умолчанию less).
+    Если вывод не в терминал, pager не запускается и данные пишутся
+    прямо в stdout.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self._process: Optional[subprocess.Popen] = None  # type: ignore[type-arg]
+        self.stream: IO[str] = sys.stdout
+        if enabled and sys.stdout.isatty():
+            self._process = subprocess.Popen(
+                os.environ.get("PAGER", "less -FRX"),
+                shell=True,
+                stdin=subprocess.PIPE,
+                encoding="utf-8",
+            )
+            assert self._process.stdin is not None
+            self.stream = self._process.stdin
+
+    def __enter__(self) -> IO[str]:
+        return self.stream
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._process is not None:
+            try:
+                self.stream.close()
+            except BrokenPipeError:
+                pass
+            self._process.wait()
@@ -0,0 +1,350 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import IO, Callable, ContextManager, Dict, Iterator, List, Optional
+
+# Интервал сбора стеков для flamegraph, секунды
+SAMPLE_INTERVAL = 0.005
+
+# Количество строк кода с наибольшим выделением памяти в отчете по стадии
+TOP_ALLOCATIONS = 10
+
+# Глубина стека tracemalloc: строка выделения и вызвавшая ее строка
+TRACEMALLOC_FRAMES = 2
+
+# tracemalloc.reset_peak появился в Python 3.9
+_reset_peak: Optional[Callable[[], None]] = getattr(tracemalloc, "reset_peak", None)
+
+
+@dataclass
+class StageStats:
+    """Статистика стадии конвейера"""
+
+    name: str
+    calls: int = 0
+    total_time: float = 0.0
+    peak_memory: int = 0
+    allocated: int = 0
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile, repr=False)
+    allocations: Counter = field(default_factory=Counter, repr=False)
+
+
+class Profiler:
+    """
+    Профилирование стадий конвейера сбора
+
+    Для каждой стадии (HTTP, разбор JSON, построение моделей, загрузка
+    в БД) собираются статистика cProfile, время, пиковая и выделенная
+    память и строки кода с наибольшим выделением памяти (tracemalloc).
+    Пик внешней стадии включает пики вложенных. На Python 3.8 пик
+    сбросить нельзя, и он оценивается снизу объемом памяти на границах
+    стадий. Снимки tracemalloc дороги, поэтому строки выделений
+    снимаются только на границах внешних стадий и включают выделения
+    вложенных.
+    Стек стадий у каждого потока свой. cProfile и память учитываются
+    только в потоке, запустившем профилирование: оба механизма общие
+    для процесса. В остальных потоках (например, потоках запросов
+    daemon) стадии учитывают вызовы и время, которое суммируется
+    по потокам.
+    Фоновый поток раз в interval записывает стеки основного потока
+    и потоков внутри стадий с именем текущей стадии в корне — в формате
+    folded для flamegraph.pl и speedscope. Вложенная стадия
+    приостанавливает cProfile внешней: время каждой функции учитывается
+    в одной стадии. Сами cProfile и tracemalloc замедляют код, поэтому
+    абсолютные времена завышены — сравнивать стоит доли стадий.
+    Дочерние процессы (sync --processes) не профилируются.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, top: int = TOP_ALLOCATIONS) -> None:
+        """
+        Инициализация профилировщика
+
+        Args:
+            interval: интервал сбора стеков, секунды
+            top: количество строк с наибольшим выделением памяти на стадию
+        """
+        self.interval = interval
+        self.top = top
+        self.stages: Dict[str, StageStats] = {}
+        self.stacks: Counter = Counter()
+        # Активные стадии потока; общий словарь нужен фоновому сбору стеков
+        self._local = threading.local()
+        self._active: Dict[int, List[StageStats]] = {}
+        # Пики отслеживаемой памяти активных стадий основного потока,
+        # измеренные до входа во вложенные
+        self._peaks: List[int] = []
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        # Счетчики одной стадии обновляются из нескольких потоков
+        self._lock = threading.Lock()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        """Начать профилирование: tracemalloc и сбор стеков"""
+        self._thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="hh-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Остановить профилирование"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.elapsed = time.perf_counter() - self._started
+
+    def _stages(self) -> List[StageStats]:
+        """Стек активных стадий текущего потока"""
+        active = getattr(self._local, "stages", None)
+        if active is None:
+            active = self._local.stages = []
+            self._active[threading.get_ident()] = active
+        return active
+
+    def _sample(self) -> None:
+        """Фоновый сбор стеков основного потока и потоков внутри стадий"""
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                # Срез не падает, если поток успел выйти из стадии
+                current = self._active.get(thread_id, [])[-1:]
+                if not current and thread_id != self._thread_id:
+                    continue
+                names: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stage = current[0].name if current else "other"
+                self.stacks[";".join([stage] + names[::-1])] += 1
+
+    @staticmethod
+    def _traced_peak() -> int:
+        """Пик отслеживаемой памяти с последнего сброса (без reset_peak — текущий объем)"""
+        current, peak = tracemalloc.get_traced_memory()
+        return peak if _reset_peak is not None else current
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Профилировать блок with как стадию name
+
+        Args:
+            name: имя стадии; повторные входы суммируются
+        """
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages.setdefault(name, StageStats(name))
+        active = self._stages()
+        if threading.get_ident() != self._thread_id:
+            active.append(stats)
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                with self._lock:
+                    stats.calls += 1
+                    stats.total_time += time.perf_counter() - start
+                active.pop()
+            return
+
+        outer = active[-1] if active else None
+        if outer is not None:
+            outer.profile.disable()
+        active.append(stats)
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            if outer is None:
+                self._snapshot = tracemalloc.take_snapshot()
+            # Сброс пика для вложенной стадии не должен терять пик внешней
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], self._traced_peak())
+            if _reset_peak is not None:
+                _reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            self._peaks.append(base)
+        start = time.perf_counter()
+        stats.profile.enable()
+        try:
+            yield
+        finally:
+            stats.profile.disable()
+            with self._lock:
+                stats.calls += 1
+                stats.total_time += time.perf_counter() - start
+            if tracing:
+                current, _ = tracemalloc.get_traced_memory()
+                peak = max(self._peaks.pop(), self._traced_peak())
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                stats.peak_memory = max(stats.peak_memory, peak - base)
+                stats.allocated += max(current - base, 0)
+                if outer is None and self._snapshot is not None:
+                    self._record_allocations(stats, self._snapshot)
+                    self._snapshot = None
+            active.pop()
+            if outer is not None:
+                outer.profile.enable()
+
+    def _record_allocations(self, stats: StageStats, before: tracemalloc.Snapshot) -> None:
+        """Учесть строки кода, выделившие память с момента снимка before"""
+        after = tracemalloc.take_snapshot()
+        for diff in after.compare_to(before, "lineno")[: self.top * 5]:
+            if diff.size_diff > 0:
+                frame = diff.traceback[0]
+                stats.allocations[f"{frame.filename}:{frame.lineno}"] += diff.size_diff
+
+    def detach(self) -> None:
+        """
+        Отключить профилировщик в дочернем процессе после fork
+
+        Результаты дочернего процесса не попадают в отчет родителя,
+        поэтому cProfile текущей стадии и tracemalloc выключаются.
+        """
+        for stats in self._stages():
+            stats.profile.disable()
+        self._stop.set()
+        self._sampler = None
+        self._snapshot = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def write(self, directory: str) -> None:
+        """
+        Записать результаты профилирования
+
+        В каталог записываются <стадия>.prof (pstats, открывается
+        snakeviz или python -m pstats), stacks.folded (flamegraph.pl,
+        speedscope) и allocations.txt (строки с наибольшим выделением
+        памяти по стадиям).
+
+        Args:
+            directory: каталог результатов
+        """
+        os.makedirs(directory, exist_ok=True)
+        for stats in self.stages.values():
+            stats.profile.dump_stats(os.path.join(directory, f"{stats.name}.prof"))
+        with open(os.path.join(directory, "stacks.folded"), "w", encoding="utf-8") as file:
+            for stack, count in sorted(self.stacks.items()):
+                file.write(f"{stack} {count}\n")
+        with open(os.path.join(directory, "allocations.txt"), "w", encoding="utf-8") as file:
+            for stats in self.stages.values():
+                file.write(f"[{stats.name}]\n")
+                for line, size in stats.allocations.most_common(self.top):
+                    file.write(f"{size / 1024:12.1f} KiB  {line}\n")
+                file.write("\n")
+
+    def print_summary(self, stream: IO[str] = sys.stderr, functions: int = 3) -> None:
+        """
+        Вывести сводную таблицу по стадиям
+
+        Args:
+            stream: поток вывода
+            functions: количество самых затратных функций на стадию
+        """
+        total = self.elapsed or sum(s.total_time for s in self.stages.values()) or 1.0
+        lines = [
+            f"{'Стадия':<16}{'Вызовы':>10}{'Время, с':>12}{'Доля':>8}"
+            f"{'Пик, КиБ':>12}{'Выделено, КиБ':>16}"
+        ]
+        for stats in sorted(self.stages.values(), key=lambda s: -s.total_time):
+            lines.append(
+                f"{stats.name:<16}{stats.calls:>10}{stats.total_time:>12.3f}"
+                f"{stats.total_time / total:>8.1%}{stats.peak_memory / 1024:>12.1f}"
+                f"{stats.allocated / 1024:>16.1f}"
+            )
+            for name, own_time in self._top_functions(stats, functions):
+                lines.append(f"    {own_time:8.3f} с  {name}")
+        lines.append(f"Всего: {total:.3f} с")
+        stream.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _top_functions(stats: StageStats, count: int) -> List[tuple]:
+        """Функции стадии с наибольшим собственным временем"""
+        try:
+            data = pstats.Stats(stats.profile).stats  # type: ignore[attr-defined]
+        except TypeError:
+            # Профиль стадии пуст
+            return []
+        items = sorted(data.items(), key=lambda item: -item[1][2])[:count]
+        return [
+            (f"{os.path.basename(filename)}:{line}({function})", values[2])
+            for (filename, line, function), values in items
+        ]
+
+
+# Профилировщик процесса; None — профилирование выключено
+_profiler: Optional[Profiler] = None
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    Включить профилирование стадий в процессе
+
+    Args:
+        profiler: профилировщик, по умолчанию новый
+
+    Returns:
+        Profiler: запущенный профилировщик
+    """
+    global _profiler
+    _profiler = profiler or Profiler()
+    _profiler.start()
+    return _profiler
+
+
+def disable() -> Optional[Profiler]:
+    """
+    Выключить профилирование
+
+    Returns:
+        Optional[Profiler]: остановленный профилировщик
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def _after_fork_in_child() -> None:
+    """Выключить унаследованное профилирование в дочернем процессе"""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.detach()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def stage(name: str) -> ContextManager[None]:
+    """
+    Отметить стадию конвейера
+
+    Без включенного профилирования возвращает пустой контекст
+    и почти ничего не стоит.
+
+    Args:
+        name: имя стадии
+    """
+    if _profiler is None:
+        return nullcontext()
+    return _profiler.stage(name)
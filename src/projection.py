@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+# Столбцы вакансии в порядке VacancyBatch.rows()
+VACANCY_FIELDS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "url",
+    "alternate_url",
+    "employer_id",
+    "salary_from",
+    "salary_to",
+    "currency",
+    "salary_gross",
+    "description",
+    "experience",
+    "employment",
+)
+
+# Поля, без которых можно обойтись: отчеты DBManager их не читают
+OPTIONAL_FIELDS: Tuple[str, ...] = ("url", "description", "experience", "employment")
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    Профиль проекции: какие необязательные поля вакансии разбираются
+    из JSON, хранятся в моделях и записываются в базу данных
+
+    Обязательные поля (id, название, работодатель, зарплата и ссылка
+    alternate_url) входят в любой профиль. Не вошедшие в профиль поля
+    не читаются из JSON и остаются пустыми (None или ""), а в таблицах
+    для них не создаются столбцы; разбивки аналитики по опыту и типу
+    занятости требуют соответствующих полей.
+    """
+
+    fields: FrozenSet[str] = frozenset(OPTIONAL_FIELDS)
+
+    def __post_init__(self) -> None:
+        unknown = sorted(set(self.fields) - set(OPTIONAL_FIELDS))
+        if unknown:
+            raise ValueError(f"Неизвестные поля проекции: {', '.join(unknown)}")
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.fields or name not in OPTIONAL_FIELDS
+
+    @property
+    def vacancy_columns(self) -> Tuple[str, ...]:
+        """Столбцы таблицы vacancies (описания хранятся отдельно)"""
+        return tuple(
+            name for name in VACANCY_FIELDS if name != "description" and name in self
+        )
+
+    @property
+    def row_indexes(self) -> Tuple[int, ...]:
+        """Номера столбцов vacancy_columns в строках VacancyBatch.rows()"""
+        return tuple(VACANCY_FIELDS.index(name) for name in self.vacancy_columns)
+
+    @classmethod
+    def of(cls, fields: Iterable[str]) -> "Projection":
+        """Создать профиль из перечня необязательных полей"""
+        return cls(frozenset(fields))
+
+
+FULL = Projection()
+LEAN = Projection(frozenset())
+
+PROFILES: Dict[str, Projection] = {"full": FULL, "lean": LEAN}
+
+
+def get_projection(value: Optional[str]) -> Projection:
+    """
+    Получить профиль проекции по имени или перечню полей
+
+    Args:
+        value: имя профиля (full, lean), перечень необязательных полей
+            через запятую или None — полный профиль
+
+    Returns:
+        Projection: профиль проекции
+    """
+    if value is None:
+        return FULL
+    value = value.strip()
+    if value in PROFILES:
+        return PROFILES[value]
+    return Projection.of(name.strip() for name in value.split(",") if name.strip())
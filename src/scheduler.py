@@ -0,0 +1,202 @@
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Файл состояния расписания по умолчанию
+DEFAULT_STATE_FILE = "config/scheduler.json"
+
+# Границы и начальное значение интервала обновления работодателя, секунды
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 24 * 60 * 60
+INITIAL_INTERVAL = 60 * 60
+
+# Во сколько раз интервал растет после обновления без изменений
+BACKOFF = 1.5
+
+# Доля интервала, на которую случайно сдвигается следующее обновление,
+# чтобы обновления работодателей не собирались в одни и те же моменты
+JITTER = 0.1
+
+
+@dataclass
+class EmployerSchedule:
+    """Расписание обновления одного работодателя"""
+
+    employer_id: int
+    interval: float = INITIAL_INTERVAL
+    next_run: float = 0.0
+    last_run: Optional[float] = None
+    fingerprint: Optional[str] = None
+    failures: int = 0
+
+
+class Scheduler:
+    """
+    Расписание обновлений работодателей с адаптивной частотой
+
+    После каждого обновления сравнивается отпечаток набора вакансий
+    работодателя. Если вакансии изменились, интервал уменьшается вдвое
+    (не ниже min_interval), если нет — увеличивается в BACKOFF раз
+    (не выше max_interval). Так часто меняющиеся работодатели
+    обновляются часто, а неактивные — почти не запрашиваются.
+    Расписание сохраняется в JSON-файл и переживает перезапуск.
+    """
+
+    def __init__(
+        self,
+        employer_ids: Iterable[int],
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        jitter: float = JITTER,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """
+        Инициализация расписания
+
+        Args:
+            employer_ids: ID работодателей; новые обновляются сразу
+            min_interval: минимальный интервал обновления, секунды
+            max_interval: максимальный интервал обновления, секунды
+            jitter: доля интервала для случайного сдвига
+            rng: генератор случайных чисел (для воспроизводимости)
+        """
+        if min_interval <= 0 or min_interval > max_interval:
+            raise ValueError("Некорректные границы интервала обновления")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.schedules: Dict[int, EmployerSchedule] = {}
+        for employer_id in employer_ids:
+            self.schedules[employer_id] = EmployerSchedule(
+                employer_id, self._clamp(INITIAL_INTERVAL)
+            )
+
+    def _clamp(self, interval: float) -> float:
+        """Ограничить интервал границами расписания"""
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _next_run(self, now: float, interval: float) -> float:
+        """Время следующего обновления со случайным сдвигом"""
+        return now + interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def due(
+        self,
+        now: Optional[float] = None,
+        limit: Optional[int] = None,
+        exclude: Iterable[int] = (),
+    ) -> List[int]:
+        """
+        Получить работодателей, которых пора обновить
+
+        Args:
+            now: текущее время, по умолчанию time.time()
+            limit: максимальное количество работодателей
+            exclude: работодатели, которых не нужно возвращать
+                (например, обновляемые сейчас)
+
+        Returns:
+            List[int]: ID работодателей, начиная с самых просроченных
+        """
+        now = time.time() if now is None else now
+        skip = set(exclude)
+        ready = sorted(
+            (
+                s
+                for s in self.schedules.values()
+                if s.next_run <= now and s.employer_id not in skip
+            ),
+            key=lambda s: s.next_run,
+        )
+        return [s.employer_id for s in ready[:limit]]
+
+    def next_wakeup(self, exclude: Iterable[int] = ()) -> Optional[float]:
+        """
+        Время ближайшего запланированного обновления
+
+        Args:
+            exclude: работодатели, которых не нужно учитывать
+        """
+        skip = set(exclude)
+        return min(
+            (s.next_run for s in self.schedules.values() if s.employer_id not in skip),
+            default=None,
+        )
+
+    def record(self, employer_id: int, fingerprint: str, now: Optional[float] = None) -> None:
+        """
+        Учесть успешное обновление работодателя и пересчитать интервал
+
+        Args:
+            employer_id: ID работодателя
+            fingerprint: отпечаток набора вакансий
+            now: время обновления, по умолчанию time.time()
+        """
+        now = time.time() if now is None else now
+        schedule = self.schedules[employer_id]
+        if schedule.fingerprint is not None:
+            if fingerprint != schedule.fingerprint:
+                schedule.interval = self._clamp(schedule.interval / 2)
+            else:
+                schedule.interval = self._clamp(schedule.interval * BACKOFF)
+        schedule.fingerprint = fingerprint
+        schedule.last_run = now
+        schedule.failures = 0
+        schedule.next_run = self._next_run(now, schedule.interval)
+
+    def record_failure(self, employer_id: int, now: Optional[float] = None) -> None:
+        """
+        Учесть неудачное обновление: повтор через min_interval,
+        удваивающийся с каждой неудачей подряд, но не позже интервала
+        работодателя
+
+        Args:
+            employer_id: ID работодателя
+            now: время попытки, по умолчанию time.time()
+        """
+        now = time.time() if now is None else now
+        schedule = self.schedules[employer_id]
+        schedule.failures += 1
+        delay = min(schedule.interval, self.min_interval * 2 ** (schedule.failures - 1))
+        schedule.next_run = self._next_run(now, delay)
+
+    def save(self, path: str = DEFAULT_STATE_FILE) -> None:
+        """
+        Сохранить расписание в файл
+
+        Файл заменяется атомарно, поэтому прерванная запись не портит
+        сохраненное состояние.
+
+        Args:
+            path: путь к файлу состояния
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump([asdict(s) for s in self.schedules.values()], file, indent=2)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str = DEFAULT_STATE_FILE) -> None:
+        """
+        Восстановить расписание из файла
+
+        Учитываются только работодатели текущего расписания; работодатели,
+        которых нет в файле, обновляются сразу.
+
+        Args:
+            path: путь к файлу состояния
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as file:
+                items = json.load(file)
+            for item in items:
+                if item["employer_id"] in self.schedules:
+                    schedule = EmployerSchedule(**item)
+                    schedule.interval = self._clamp(schedule.interval)
+                    self.schedules[schedule.employer_id] = schedule
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Не удалось прочитать состояние расписания: {e}")
@@ -0,0 +1,134 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Разобрать номер шарда вида "i/N"
+
+    Args:
+        value: номер шарда i (с нуля) и количество шардов N через "/"
+
+    Returns:
+        Tuple[int, int]: номер шарда и количество шардов
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Шард задается в виде i/N: {value}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Номер шарда должен быть от 0 до N-1: {value}")
+    return index, count
+
+
+def read_employer_file(path: str) -> Tuple[List[int], Dict[int, float]]:
+    """
+    Прочитать список работодателей из файла
+
+    Формат: по работодателю на строку, ID и необязательный вес (например,
+    количество вакансий) через запятую или пробел. Пустые строки и текст
+    после "#" пропускаются.
+
+    Args:
+        path: путь к файлу
+
+    Returns:
+        Tuple: ID работодателей в порядке файла без повторов и веса
+        тех работодателей, для которых они указаны
+    """
+    employer_ids: Dict[int, None] = {}
+    weights: Dict[int, float] = {}
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            fields = line.split("#", 1)[0].replace(",", " ").split()
+            if not fields:
+                continue
+            try:
+                employer_id = int(fields[0])
+                if len(fields) > 1:
+                    weights[employer_id] = float(fields[1])
+            except ValueError:
+                raise ValueError(f"{path}:{number}: некорректная строка: {line.strip()}") from None
+            employer_ids[employer_id] = None
+    return list(employer_ids), weights
+
+
+def balance(
+    employer_ids: Sequence[int], count: int, weights: Optional[Mapping[int, float]] = None
+) -> List[List[int]]:
+    """
+    Разбить работодателей на count шардов с близким суммарным весом
+
+    Работодатели по убыванию веса назначаются в шард с наименьшим
+    текущим весом (жадный алгоритм LPT); при равных весах — по
+    возрастанию ID. Разбиение детерминировано: при одинаковых списке
+    и весах все процессы и узлы получают одни и те же шарды. Работодатели
+    без веса получают средний вес остальных (или 1, если весов нет).
+
+    Args:
+        employer_ids: ID работодателей
+        count: количество шардов
+        weights: веса работодателей, например количество вакансий
+
+    Returns:
+        List[List[int]]: ID работодателей каждого шарда по возрастанию
+    """
+    if count < 1:
+        raise ValueError("Количество шардов должно быть положительным")
+    weights = weights or {}
+    known = [weights[e] for e in employer_ids if e in weights]
+    default = sum(known) / len(known) if known else 1.0
+
+    shards: List[List[int]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+    unique_ids = sorted(set(employer_ids))
+    for employer_id in sorted(unique_ids, key=lambda e: (-weights.get(e, default), e)):
+        shard = min(range(count), key=lambda i: (loads[i], i))
+        shards[shard].append(employer_id)
+        loads[shard] += weights.get(employer_id, default)
+    return [sorted(shard) for shard in shards]
+
+
+def shard_employers(
+    employer_ids: Sequence[int],
+    index: int,
+    count: int,
+    weights: Optional[Mapping[int, float]] = None,
+) -> List[int]:
+    """
+    Получить работодателей шарда index из count (см. balance)
+
+    Args:
+        employer_ids: ID работодателей
+        index: номер шарда с нуля
+        count: количество шардов
+        weights: веса работодателей
+
+    Returns:
+        List[int]: ID работодателей шарда
+    """
+    if not 0 <= index < count:
+        raise ValueError(f"Номер шарда должен быть от 0 до {count - 1}")
+    return balance(employer_ids, count, weights)[index]
+
+
+def run_local_shards(
+    shards: Sequence[List[int]], target: Callable[[List[int]], bool]
+) -> List[bool]:
+    """
+    Обработать шарды параллельно, по процессу на шард
+
+    Args:
+        shards: ID работодателей каждого шарда
+        target: функция обработки шарда (должна поддерживать pickle)
+
+    Returns:
+        List[bool]: результат target для каждого шарда
+    """
+    shards = [shard for shard in shards if shard]
+    if not shards:
+        return []
+    if len(shards) == 1:
+        return [target(shards[0])]
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        return list(executor.map(target, shards))
@@ -0,0 +1,427 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union, cast
+
+from src.database import DatabaseManager
+from src.encoding import NULL_CODE, StringDictionary, compress_text, decompress_text
+from src.models import DICTIONARY_COLUMNS, Employer, VacancyBatch
+
+MAGIC = b"HHSNAP01"
+VERSION = 1
+_ALIGNMENT = 8
+# Сигнатура, смещение и длина заголовка
+_PREFIX = struct.Struct("<8sQI")
+# Место под заголовок в начале файла
+_HEADER_SPACE = 4096
+
+# Столбцы таблиц снимка: имя -> тип хранения
+EMPLOYER_COLUMNS: Dict[str, str] = {
+    "id": "q",
+    "name": "string",
+    "url": "string",
+    "alternate_url": "string",
+    "description": "string",
+}
+VACANCY_COLUMNS: Dict[str, str] = {
+    "id": "q",
+    "employer_id": "q",
+    "has_salary": "B",
+    "salary_from": "q",
+    "salary_from_mask": "B",
+    "salary_to": "q",
+    "salary_to_mask": "B",
+    "gross": "B",
+    "gross_mask": "B",
+    "name": "string",
+    "url": "string",
+    "alternate_url": "string",
+    "currency": "dict",
+    "description": "string",
+    "experience": "dict",
+    "employment": "dict",
+    "experience_hh_id": "dict",
+    "employment_hh_id": "dict",
+}
+
+# Необязательные поля вакансии при чтении из базы данных: выражение SELECT,
+# значение для поля вне профиля проекции и нужное соединение. Опыт работы
+# и тип занятости берутся из таблиц-справочников
+_OPTIONAL_SOURCES: Dict[str, Tuple[str, str, str]] = {
+    "url": ("v.url", "''", ""),
+    "description": (
+        "d.description",
+        "NULL",
+        "LEFT JOIN vacancy_descriptions d ON d.vacancy_id = v.id",
+    ),
+    "experience": ("ex.name", "NULL", "LEFT JOIN experience ex ON ex.id = v.experience_id"),
+    "employment": ("em.name", "NULL", "LEFT JOIN employment em ON em.id = v.employment_id"),
+}
+
+
+class StringColumn(Sequence[Optional[str]]):
+    """
+    Строковый столбец снимка
+
+    Строки лежат подряд в одном блоке UTF-8, границы i-й строки —
+    offsets[i] и offsets[i + 1]. Строка декодируется только при обращении.
+    """
+
+    def __init__(self, offsets: memoryview, data: memoryview, nulls: Optional[memoryview]) -> None:
+        self.offsets = offsets
+        self.data = data
+        self.nulls = nulls
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс за пределами столбца")
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        return str(self.data[self.offsets[index] : self.offsets[index + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class DictColumn(Sequence[Optional[str]]):
+    """Столбец снимка, закодированный словарем: коды int16 (int32) и список значений"""
+
+    def __init__(self, codes: memoryview, values: List[str]) -> None:
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        code = self.codes[index]
+        return None if code == NULL_CODE else self.values[code]
+
+
+Column = Union[memoryview, StringColumn, DictColumn]
+
+
+class _Writer:
+    """Последовательная запись блоков снимка с выравниванием"""
+
+    def __init__(self, file: BinaryIO, start: int) -> None:
+        self.file = file
+        self.position = start
+
+    def write(self, data: Union[bytes, bytearray, "array[Any]"]) -> Dict[str, int]:
+        padding = -self.position % _ALIGNMENT
+        self.file.write(b"\0" * padding)
+        self.position += padding
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        self.file.write(raw)
+        block = {"offset": self.position, "length": len(raw)}
+        self.position += len(raw)
+        return block
+
+    def write_stream(self, chunks: Iterator[bytes]) -> Dict[str, int]:
+        padding = -self.position % _ALIGNMENT
+        self.file.write(b"\0" * padding)
+        self.position += padding
+        start = self.position
+        for chunk in chunks:
+            self.file.write(chunk)
+            self.position += len(chunk)
+        return {"offset": start, "length": self.position - start}
+
+
+def _encode_strings(writer: _Writer, values: Sequence[Optional[str]]) -> Dict[str, Any]:
+    """Записать строковый столбец: данные, смещения и маску пропусков"""
+    offsets = array("q", [0])
+    nulls = bytearray()
+
+    def chunks() -> Iterator[bytes]:
+        position = 0
+        for value in values:
+            raw = value.encode("utf-8") if value is not None else b""
+            position += len(raw)
+            offsets.append(position)
+            nulls.append(value is None)
+            yield raw
+
+    meta: Dict[str, Any] = {"data": writer.write_stream(chunks())}
+    meta["offsets"] = writer.write(offsets)
+    if any(nulls):
+        meta["nulls"] = writer.write(nulls)
+    return meta
+
+
+def write_snapshot(path: str, employers: Sequence[Employer], vacancies: VacancyBatch) -> None:
+    """
+    Записать работодателей и вакансии в столбцовый снимок
+
+    Формат файла: сигнатура, смещение и длина JSON-заголовка с расположением
+    столбцов, затем блоки столбцов, выровненные по 8 байт. Числовые
+    столбцы хранятся массивами фиксированной ширины, строковые —
+    смещениями и данными UTF-8, валюта, опыт и занятость — кодами словаря.
+
+    Args:
+        path: путь к файлу снимка
+        employers: работодатели
+        vacancies: пачка вакансий
+    """
+    employer_values: Dict[str, Sequence[Any]] = {
+        "id": array("q", (e.id for e in employers)),
+        "name": [e.name for e in employers],
+        "url": [e.url for e in employers],
+        "alternate_url": [e.alternate_url for e in employers],
+        "description": [e.description for e in employers],
+    }
+    vacancy_values: Dict[str, Sequence[Any]] = {
+        name: vacancies.decode(name) if kind == "dict" else getattr(vacancies, name)
+        for name, kind in VACANCY_COLUMNS.items()
+    }
+    # В снимке описания хранятся текстом, в пачке — сжатыми
+    vacancy_values["description"] = [decompress_text(d) for d in vacancies.description]
+
+    with open(path, "wb") as file:
+        file.write(b"\0" * _HEADER_SPACE)
+        writer = _Writer(file, _HEADER_SPACE)
+        tables: Dict[str, Any] = {}
+        for table, columns, values, rows in [
+            ("employers", EMPLOYER_COLUMNS, employer_values, len(employers)),
+            ("vacancies", VACANCY_COLUMNS, vacancy_values, len(vacancies)),
+        ]:
+            meta: Dict[str, Any] = {}
+            for name, kind in columns.items():
+                data = values[name]
+                if kind == "string":
+                    meta[name] = {"kind": kind, **_encode_strings(writer, data)}
+                elif kind == "dict":
+                    dictionary = StringDictionary()
+                    encoded = [dictionary.encode(v) for v in data]
+                    # Коды int16, если словарь снимка в них помещается, иначе int32
+                    typecode = "h" if len(dictionary) <= 0x7FFF else "i"
+                    meta[name] = {
+                        "kind": kind,
+                        "codes": writer.write(array(typecode, encoded)),
+                        "typecode": typecode,
+                        "values": dictionary.values,
+                    }
+                else:
+                    column = data if isinstance(data, (array, bytearray)) else array(kind, data)
+                    meta[name] = {"kind": kind, **writer.write(column)}
+            tables[table] = {"rows": rows, "columns": meta}
+
+        header = json.dumps(
+            {"version": VERSION, "byteorder": sys.byteorder, "tables": tables},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        if _PREFIX.size + len(header) > _HEADER_SPACE:
+            # Заголовок не поместился перед данными — записываем его в конец
+            header_offset = writer.position
+        else:
+            header_offset = _PREFIX.size
+        file.seek(header_offset)
+        file.write(header)
+        file.seek(0)
+        file.write(_PREFIX.pack(MAGIC, header_offset, len(header)))
+
+
+class Snapshot:
+    """
+    Снимок, открытый только для чтения через mmap
+
+    Столбцы возвращаются как представления памяти файла без копирования;
+    после close() они становятся недействительными.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Открыть снимок
+
+        Args:
+            path: путь к файлу снимка
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._views: List[memoryview] = []
+        self._columns: Dict[Any, Column] = {}
+
+        magic, header_offset, header_length = (
+            _PREFIX.unpack_from(self._mmap) if len(self._mmap) >= _PREFIX.size else (b"", 0, 0)
+        )
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Файл {path} не является снимком вакансий")
+        raw = self._mmap[header_offset : header_offset + header_length]
+        self.header = json.loads(raw.decode("utf-8"))
+        if self.header["version"] != VERSION or self.header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError("Неподдерживаемая версия или порядок байт снимка")
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрыть снимок и освободить отображение файла"""
+        self._columns.clear()
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def _block(self, block: Dict[str, int], typecode: str = "B") -> memoryview:
+        view = self._view[block["offset"] : block["offset"] + block["length"]].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def rows(self, table: str) -> int:
+        """Количество строк в таблице снимка"""
+        return int(self.header["tables"][table]["rows"])
+
+    def column(self, table: str, name: str) -> Column:
+        """
+        Получить столбец таблицы без копирования данных
+
+        Args:
+            table: "employers" или "vacancies"
+            name: имя столбца
+
+        Returns:
+            memoryview для числовых столбцов, StringColumn или DictColumn
+        """
+        key = (table, name)
+        if key not in self._columns:
+            meta = self.header["tables"][table]["columns"][name]
+            kind = meta["kind"]
+            column: Column
+            if kind == "string":
+                column = StringColumn(
+                    self._block(meta["offsets"], "q"),
+                    self._block(meta["data"]),
+                    self._block(meta["nulls"]) if "nulls" in meta else None,
+                )
+            elif kind == "dict":
+                column = DictColumn(
+                    self._block(meta["codes"], meta.get("typecode", "h")), meta["values"]
+                )
+            else:
+                column = self._block(meta, kind)
+            self._columns[key] = column
+        return self._columns[key]
+
+    def employers(self) -> List[Employer]:
+        """Прочитать всех работодателей снимка"""
+        columns = [self.column("employers", name) for name in EMPLOYER_COLUMNS]
+        return [Employer(*values) for values in zip(*columns)]
+
+    def to_batch(self) -> VacancyBatch:
+        """Прочитать вакансии снимка в пачку VacancyBatch (с копированием)"""
+        batch = VacancyBatch()
+        stored = self.header["tables"]["vacancies"]["columns"]
+        for name, kind in VACANCY_COLUMNS.items():
+            target = getattr(batch, name)
+            if name not in stored:
+                # ID справочников HH появились в снимках позже
+                target.extend([NULL_CODE] * self.rows("vacancies"))
+                continue
+            column = self.column("vacancies", name)
+            if kind == "dict":
+                dictionary = DICTIONARY_COLUMNS[name]
+                target.extend(dictionary.encode(value) for value in column)
+            elif name == "description":
+                target.extend(compress_text(value) for value in column)
+            elif kind == "string":
+                target.extend(column)
+            else:
+                target.extend(cast(memoryview, column).tolist())
+        return batch
+
+
+def read_tables(
+    db_manager: DatabaseManager, chunk_size: int = 10000
+) -> Tuple[List[Employer], VacancyBatch]:
+    """
+    Прочитать таблицы employers и vacancies
+
+    Вакансии читаются серверным курсором порциями по chunk_size строк.
+
+    Args:
+        db_manager: менеджер базы данных
+        chunk_size: количество строк, получаемых с сервера за раз
+
+    Returns:
+        Tuple: работодатели и пачка вакансий
+    """
+    if not db_manager.connection:
+        db_manager.connect()
+    assert db_manager.connection is not None
+
+    with db_manager.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id, name, url, alternate_url, description FROM employers ORDER BY id"
+        )
+        employers = [Employer(*row) for row in cursor.fetchall()]
+
+    batch = VacancyBatch()
+    with db_manager.connection.cursor(name="hh_snapshot") as cursor:
+        cursor.itersize = chunk_size
+        # Столбцы вне профиля проекции в таблицах отсутствуют
+        projection = db_manager.projection
+        selected = {
+            name: column if name in projection else missing
+            for name, (column, missing, _) in _OPTIONAL_SOURCES.items()
+        }
+        hh_ids = ", ".join(
+            f"{alias}.hh_id" if name in projection else "NULL"
+            for name, alias in (("experience", "ex"), ("employment", "em"))
+        )
+        joins = " ".join(
+            join
+            for name, (_, _, join) in _OPTIONAL_SOURCES.items()
+            if join and name in projection
+        )
+        cursor.execute(
+            f"""
+            SELECT
+                v.id, v.name, {selected["url"]}, v.alternate_url, v.employer_id,
+                v.salary_from, v.salary_to, v.currency, v.salary_gross,
+                {selected["description"]}, {selected["experience"]}, {selected["employment"]},
+                {hh_ids}
+            FROM vacancies v
+            {joins}
+            ORDER BY v.id
+            """
+        )
+        for row in cursor:
+            batch.append_row(row)
+    db_manager.connection.commit()
+    return employers, batch
+
+
+def write_snapshot_from_db(db_manager: DatabaseManager, path: str, chunk_size: int = 10000) -> None:
+    """
+    Записать в снимок содержимое таблиц employers и vacancies
+
+    Args:
+        db_manager: менеджер базы данных
+        path: путь к файлу снимка
+        chunk_size: количество строк, получаемых с сервера за раз
+    """
+    employers, batch = read_tables(db_manager, chunk_size)
+    write_snapshot(path, employers, batch)
+    print(f"Снимок {path}: {len(employers)} работодателей, {len(batch)} вакансий")
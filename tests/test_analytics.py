@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from src.analytics import (
+    SalaryStats,
+    build_salary_analytics_query,
+    parse_salary_analytics,
+    query_params,
+)
+from src.db_manager import DBManager
+
+
+class TestSalaryAnalyticsQuery(unittest.TestCase):
+    """Тесты построения запроса аналитики зарплат"""
+
+    def test_grouping_sets(self):
+        """Тест наборов группировки для выбранных измерений"""
+        query = build_salary_analytics_query(["employer", "experience", "currency"], bins=2)
+
+        self.assertIn(
+            "GROUPING SETS ((currency), (employer, currency), (experience, currency))", query
+        )
+        self.assertIn("GROUPING(employer, experience)", query)
+        self.assertIn("percentile_cont", query)
+        self.assertEqual(query.count("COUNT(*) FILTER"), 4)
+
+    def test_lookup_joins(self):
+        """Тест соединения со справочниками только для их измерений"""
+        query = build_salary_analytics_query(["experience"])
+
+        self.assertIn("LEFT JOIN experience ex ON ex.id = v.experience_id", query)
+        self.assertIn("ex.name AS experience", query)
+        self.assertNotIn("LEFT JOIN", build_salary_analytics_query(["employer"]))
+
+    def test_employer_grouped_by_id(self):
+        """Тест группировки работодателей по ID с выводом названия"""
+        query = build_salary_analytics_query(["employer"])
+
+        self.assertIn("e.id AS employer", query)
+        self.assertIn("e.name AS employer_label", query)
+        self.assertIn("MAX(employer_label)", query)
+
+    def test_unknown_dimension(self):
+        """Тест недопустимого измерения"""
+        with self.assertRaises(ValueError):
+            build_salary_analytics_query(["name; DROP TABLE vacancies"])
+
+    def test_invalid_bins(self):
+        """Тест недопустимого количества корзин"""
+        with self.assertRaises(ValueError):
+            build_salary_analytics_query(bins=0)
+
+    def test_params_order(self):
+        """Тест порядка параметров запроса"""
+        query = build_salary_analytics_query(["currency"], bins=5, currency=True)
+        params = query_params([0.5], 0, 100, 5, "RUR")
+
+        self.assertEqual(query.count("%s"), len(params))
+        self.assertEqual(params, ("RUR", 0, 100, 5, [0.5]))
+
+    def test_invalid_bounds(self):
+        """Тест недопустимых границ гистограммы"""
+        with self.assertRaises(ValueError):
+            query_params([0.5], 100, 100, 5)
+
+
+class TestParseSalaryAnalytics(unittest.TestCase):
+    """Тесты разбора результата аналитики зарплат"""
+
+    def test_parse_rows(self):
+        """Тест распределения строк по измерениям и валютам"""
+        rows = [
+            (1, "RUR", None, 3, 100.0, 300.0, 200.0, [150.0, 200.0], [0, 2, 1, 0]),
+            (1, "USD", None, 1, 5.0, 5.0, 5.0, [5.0], [1, 0, 0, 0]),
+            (0, "RUR", "Company A", 2, 100.0, 200.0, 150.0, [125.0], [0, 2, 0, 0]),
+            (0, "RUR", "Company A", 1, 300.0, 300.0, 300.0, [300.0], [0, 0, 1, 0]),
+            (0, "USD", "Company B", 1, 5.0, 5.0, 5.0, [5.0], [1, 0, 0, 0]),
+        ]
+
+        result = parse_salary_analytics(rows, ["employer", "currency"])
+
+        self.assertEqual(
+            result["all"][0],
+            SalaryStats(
+                "all", None, 3, 100.0, 300.0, 200.0, (150.0, 200.0), (0, 2, 1, 0), "RUR"
+            ),
+        )
+        self.assertEqual(
+            [(s.key, s.currency, s.count) for s in result["employer"]],
+            [("Company A", "RUR", 2), ("Company A", "RUR", 1), ("Company B", "USD", 1)],
+        )
+        self.assertEqual(
+            [(s.key, s.currency) for s in result["currency"]], [("RUR", "RUR"), ("USD", "USD")]
+        )
+
+    def test_parse_empty(self):
+        """Тест разбора результата по пустой таблице"""
+        result = parse_salary_analytics([], ["currency", "employer"])
+
+        self.assertEqual(result, {"all": [], "currency": [], "employer": []})
+
+
+class TestDBManagerSalaryAnalytics(unittest.TestCase):
+    """Тесты аналитики зарплат в DBManager"""
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_get_salary_analytics(self, mock_disconnect, mock_connect):
+        """Тест получения аналитики за один запрос"""
+        db_manager = DBManager()
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        db_manager.connection = mock_conn
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=None)
+        mock_cursor.fetchall.return_value = [
+            (0, "RUR", 1, 100.0, 100.0, 100.0, [100.0], [0, 1, 0]),
+        ]
+
+        result = db_manager.get_salary_analytics(
+            dimensions=("currency",), percentiles=(0.5,), bins=1, upper=200
+        )
+
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (0, 200, 1, [0.5]))
+        self.assertEqual(result["currency"][0].key, "RUR")
+        self.assertEqual(result["all"][0].avg, 100.0)
+        mock_disconnect.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ from unittest.mock import patch
 import requests_mock
 
 from src.api import HHAPI, get_employer_data, get_vacancies_data
+from src.metrics import HTTP_BYTES, HTTP_REQUESTS
 
 
 class TestHHAPI(unittest.TestCase):
@@ -59,6 +60,18 @@ class TestHHAPI(unittest.TestCase):
 
         self.assertIsNone(result)
 
+    @requests_mock.Mocker()
+    def test_get_dictionaries(self, mock):
+        """Тест получения справочников HH"""
+        mock.get(
+            "https://api.hh.ru/dictionaries",
+            json={"experience": [{"id": "noExperience", "name": "Нет опыта"}]},
+        )
+
+        result = self.api.get_dictionaries()
+
+        self.assertEqual(result["experience"][0]["id"], "noExperience")
+
     @requests_mock.Mocker()
     def test_get_vacancies_success(self, mock):
         """Тест успешного получения вакансий"""
@@ -120,6 +133,32 @@ class TestHHAPI(unittest.TestCase):
         self.assertEqual(result[0]["id"], 1)
         self.assertEqual(result[1]["id"], 2)
 
+    @requests_mock.Mocker()
+    def test_get_all_vacancies_page_drift(self, mock):
+        """Тест повторов и повторного запроса страницы при сдвиге выдачи"""
+
+        def page(ids, found):
+            items = [{"id": i, "name": f"Vacancy {i}", "employer": {"id": 1}} for i in ids]
+            return {"json": {"items": items, "pages": 3, "found": found}}
+
+        mock.get(
+            "https://api.hh.ru/vacancies",
+            [
+                page([1, 2], 6),
+                # Появилась вакансия 0: вакансия 2 повторяется на второй странице
+                page([2, 3], 7),
+                # Закрыты вакансии 0 и 1: вакансия 4 ушла на вторую страницу
+                page([5, 6], 5),
+                page([3, 4], 5),
+            ],
+        )
+
+        result = self.api.get_all_vacancies(self.employer_id)
+        pages = [int(request.qs["page"][0]) for request in mock.request_history]
+
+        self.assertEqual(sorted(v["id"] for v in result), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(pages, [0, 1, 2, 1])
+
     @requests_mock.Mocker()
     def test_get_all_vacancies_empty(self, mock):
         """Тест получения всех вакансий при их отсутствии"""
@@ -129,6 +168,47 @@ class TestHHAPI(unittest.TestCase):
 
         self.assertEqual(len(result), 0)
 
+    @requests_mock.Mocker()
+    def test_iter_pages_resume(self, mock):
+        """Тест продолжения сбора с заданной страницы"""
+        items = [{"id": 3, "name": "Vacancy 3", "employer": {"id": 1}}]
+        mock.get("https://api.hh.ru/vacancies", json={"items": items, "pages": 3, "found": 5})
+
+        pages = list(self.api.iter_pages(self.employer_id, start_page=2))
+
+        self.assertEqual(mock.request_history[0].qs["page"], ["2"])
+        self.assertEqual([(p.number, p.is_last) for p in pages], [(2, True)])
+
+    @requests_mock.Mocker()
+    def test_iter_pages_interrupted(self, mock):
+        """Тест: при ошибке запроса перебор прекращается на неполной выдаче"""
+        items = [{"id": 1, "name": "Vacancy 1", "employer": {"id": 1}}]
+        mock.get(
+            "https://api.hh.ru/vacancies",
+            [{"json": {"items": items, "pages": 2}}, {"status_code": 500}],
+        )
+
+        pages = list(self.api.iter_pages(self.employer_id))
+
+        self.assertEqual(len(pages), 1)
+        self.assertFalse(pages[-1].is_last)
+
+    @requests_mock.Mocker()
+    def test_request_metrics(self, mock):
+        """Тест учета запросов в метриках"""
+        requests_ok = HTTP_REQUESTS.value("employers", "200")
+        requests_failed = HTTP_REQUESTS.value("employers", "404")
+        received = HTTP_BYTES.value("employers")
+        mock.get(f"https://api.hh.ru/employers/{self.employer_id}", text='{"id": 123}')
+        mock.get("https://api.hh.ru/employers/404", status_code=404)
+
+        self.api.get_employer(self.employer_id)
+        self.api.get_employer(404)
+
+        self.assertEqual(HTTP_REQUESTS.value("employers", "200"), requests_ok + 1)
+        self.assertEqual(HTTP_REQUESTS.value("employers", "404"), requests_failed + 1)
+        self.assertEqual(HTTP_BYTES.value("employers"), received + len('{"id": 123}'))
+
 
 class TestAPIFunctions(unittest.TestCase):
     """Тесты для функций API модуля"""
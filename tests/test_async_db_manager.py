@@ -0,0 +1,120 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from psycopg2 import extensions
+
+from src.async_db_manager import AsyncDBManager
+
+
+def make_connection(rows):
+    """Асинхронное соединение, сразу возвращающее заданные строки"""
+    connection = MagicMock(closed=False)
+    connection.poll.return_value = extensions.POLL_OK
+    connection.cursor.return_value.fetchall.return_value = rows
+    return connection
+
+
+class TestAsyncDBManager(unittest.TestCase):
+    """Тесты для класса AsyncDBManager"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.db_manager = AsyncDBManager()
+
+    @patch("psycopg2.connect")
+    def test_get_companies_and_vacancies_count(self, mock_connect):
+        """Тест получения компаний и количества вакансий"""
+        mock_connect.return_value = make_connection([("Company A", 5)])
+
+        result = asyncio.run(self.db_manager.get_companies_and_vacancies_count())
+
+        self.assertEqual(result, [{"company": "Company A", "vacancies_count": 5}])
+        self.assertTrue(mock_connect.call_args[1]["async_"])
+
+    @patch("psycopg2.connect")
+    def test_connection_reused(self, mock_connect):
+        """Тест повторного использования свободного соединения"""
+        mock_connect.return_value = make_connection([(125000.5,)])
+
+        async def run():
+            first = await self.db_manager.get_avg_salary()
+            second = await self.db_manager.get_avg_salary()
+            return first, second
+
+        self.assertEqual(asyncio.run(run()), (125000.5, 125000.5))
+        mock_connect.assert_called_once()
+
+    @patch("psycopg2.connect")
+    def test_get_vacancies_with_keyword(self, mock_connect):
+        """Тест поиска вакансий по ключевому слову"""
+        connection = make_connection(
+            [("Company A", "Python Dev", 100000, None, "RUR", "http://example.com/1")]
+        )
+        mock_connect.return_value = connection
+
+        result = asyncio.run(self.db_manager.get_vacancies_with_keyword("Python"))
+
+        self.assertEqual(result[0]["salary"], "от 100000 RUR")
+        params = connection.cursor.return_value.execute.call_args[0][1]
+        self.assertEqual(params, ("%python%",))
+
+    @patch("psycopg2.connect")
+    def test_dashboard_runs_concurrently(self, mock_connect):
+        """Тест одновременного выполнения запросов сводной страницы"""
+        mock_connect.side_effect = lambda **kwargs: make_connection([])
+
+        async def slow_wait(connection):
+            await asyncio.sleep(0.2)
+
+        with patch("src.async_db_manager._wait", slow_wait):
+            start = time.perf_counter()
+            result = asyncio.run(self.db_manager.get_dashboard("python"))
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(result, {"companies": [], "avg_salary": 0.0, "vacancies": []})
+        # Три запроса по 0.2 с на подключение и выполнение, но не последовательно
+        self.assertLess(elapsed, 0.8)
+
+    @patch("psycopg2.connect")
+    def test_timeout_cancels_query(self, mock_connect):
+        """Тест отмены запроса по таймауту"""
+        connection = make_connection([])
+        mock_connect.return_value = connection
+        self.db_manager.query_timeout = 0.05
+
+        async def hanging_wait(conn):
+            if conn.cursor.called:
+                await asyncio.sleep(10)
+
+        with patch("src.async_db_manager._wait", hanging_wait):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(self.db_manager.get_avg_salary())
+
+        connection.cancel.assert_called_once()
+        connection.close.assert_called_once()
+        self.assertEqual(self.db_manager._idle, [])
+
+
+    @patch("psycopg2.connect")
+    def test_timeout_while_connecting(self, mock_connect):
+        """Тест закрытия соединения при таймауте во время подключения"""
+        connection = make_connection([])
+        mock_connect.return_value = connection
+        self.db_manager.query_timeout = 0.05
+
+        async def hanging_wait(conn):
+            await asyncio.sleep(10)
+
+        with patch("src.async_db_manager._wait", hanging_wait):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(self.db_manager.get_avg_salary())
+
+        connection.close.assert_called_once()
+        connection.cursor.assert_not_called()
+        self.assertEqual(self.db_manager._idle, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from src.cache import QueryCache, bump_generation, current_generation
+from src.db_manager import DBManager, QueryError
+
+
+class TestQueryCache(unittest.TestCase):
+    """Тесты для класса QueryCache"""
+
+    def test_put_and_get(self):
+        """Тест сохранения и получения результата"""
+        cache = QueryCache(max_size=2)
+        cache.put("key", [1, 2])
+
+        self.assertEqual(cache.get("key"), (True, [1, 2]))
+        self.assertEqual(cache.get("missing"), (False, None))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованного результата"""
+        cache = QueryCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get("a")[0])
+        self.assertFalse(cache.get("b")[0])
+        self.assertTrue(cache.get("c")[0])
+
+    def test_generation_invalidates(self):
+        """Тест сброса кэша после новой загрузки данных"""
+        cache = QueryCache()
+        cache.put("key", 1)
+
+        generation = current_generation()
+        self.assertEqual(bump_generation(), generation + 1)
+
+        self.assertFalse(cache.get("key")[0])
+
+    def test_stale_put_skipped(self):
+        """Тест: результат запроса, начатого до новой загрузки, не сохраняется"""
+        cache = QueryCache()
+        generation = current_generation()
+        bump_generation()
+
+        cache.put("key", 1, generation)
+
+        self.assertFalse(cache.get("key")[0])
+
+    def test_invalid_size(self):
+        """Тест недопустимого размера кэша"""
+        with self.assertRaises(ValueError):
+            QueryCache(max_size=0)
+
+
+class TestDBManagerCache(unittest.TestCase):
+    """Тесты кэширования отчетов DBManager"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.db_manager = DBManager()
+        self.mock_cursor = Mock()
+        mock_conn = Mock()
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=self.mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=None)
+        self.db_manager.connection = mock_conn
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_repeated_report_served_from_cache(self, mock_disconnect, mock_connect):
+        """Тест повторного отчета без обращения к БД"""
+        self.mock_cursor.fetchall.return_value = [("Company A", 5)]
+
+        first = self.db_manager.get_companies_and_vacancies_count()
+        second = self.db_manager.get_companies_and_vacancies_count()
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_cached_result_isolated(self, mock_disconnect, mock_connect):
+        """Тест того, что изменение результата не затрагивает кэш"""
+        self.mock_cursor.fetchall.return_value = [("Company A", "Python", 1, 2, "RUR", "url")]
+
+        first = self.db_manager.get_all_vacancies()
+        first[0]["vacancy"] = "changed"
+        columns = self.db_manager.get_all_vacancies(row_format="columns")
+        columns["vacancy"].append("extra")
+
+        self.assertEqual(self.db_manager.get_all_vacancies()[0]["vacancy"], "Python")
+        self.assertEqual(
+            self.db_manager.get_all_vacancies(row_format="columns")["vacancy"], ["Python"]
+        )
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_keyword_is_part_of_key(self, mock_disconnect, mock_connect):
+        """Тест кэширования поиска отдельно для каждого ключевого слова"""
+        self.mock_cursor.fetchall.return_value = []
+
+        self.db_manager.get_vacancies_with_keyword("python")
+        self.db_manager.get_vacancies_with_keyword("java")
+        self.db_manager.get_vacancies_with_keyword("python")
+
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_load_invalidates_cache(self, mock_disconnect, mock_connect):
+        """Тест повторного запроса после новой загрузки данных"""
+        self.mock_cursor.fetchone.return_value = (100000,)
+
+        self.db_manager.get_avg_salary()
+        bump_generation()
+        self.db_manager.get_avg_salary()
+
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_failed_query_not_cached(self, mock_disconnect, mock_connect):
+        """Тест того, что результат ошибочного запроса не кэшируется"""
+        self.mock_cursor.execute.side_effect = [Exception("DB error"), None]
+        self.mock_cursor.fetchall.return_value = [("Company A", 5)]
+
+        self.assertEqual(self.db_manager.get_companies_and_vacancies_count(), [])
+        result = self.db_manager.get_companies_and_vacancies_count()
+
+        self.assertEqual(result, [{"company": "Company A", "vacancies_count": 5}])
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_load_during_query_not_cached(self, mock_disconnect, mock_connect):
+        """Тест: результат, полученный во время новой загрузки, не кэшируется"""
+
+        def fetchone():
+            bump_generation()
+            return (100000,)
+
+        self.mock_cursor.fetchone.side_effect = fetchone
+
+        self.db_manager.get_avg_salary()
+        self.db_manager.get_avg_salary()
+
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_failed_nested_query_not_cached(self, mock_disconnect, mock_connect):
+        """Тест: ошибка вложенного отчета (средней зарплаты) не кэширует внешний"""
+        self.mock_cursor.execute.side_effect = [Exception("DB error"), None, None]
+        self.mock_cursor.fetchone.return_value = (100000,)
+        self.mock_cursor.fetchall.return_value = [
+            ("Company A", "Python", 200000, None, "RUR", "url")
+        ]
+
+        self.assertEqual(self.db_manager.get_vacancies_with_higher_salary(), [])
+        result = self.db_manager.get_vacancies_with_higher_salary()
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(self.mock_cursor.execute.call_args[0][1], (100000,))
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_raise_errors(self, mock_disconnect, mock_connect):
+        """Тест проброса ошибки запроса с raise_errors"""
+        self.db_manager.raise_errors = True
+        self.mock_cursor.execute.side_effect = Exception("DB error")
+
+        with self.assertRaises(QueryError) as context:
+            self.db_manager.get_vacancies_with_higher_salary(row_format="tuple")
+
+        self.assertEqual(context.exception.result, [])
+        self.assertEqual(str(context.exception), "DB error")
+
+    @patch("psycopg2.connect")
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_notification_invalidates_cache(
+        self, mock_disconnect, mock_connect, mock_pg_connect
+    ):
+        """Тест сброса кэша по уведомлению из другого процесса"""
+        listen_conn = MagicMock(closed=False, notifies=[])
+        mock_pg_connect.return_value = listen_conn
+        self.db_manager.listen = True
+        self.mock_cursor.fetchone.return_value = (100000,)
+
+        self.db_manager.get_avg_salary()
+        listen_conn.notifies.append(Mock(payload="1"))
+        self.db_manager.get_avg_salary()
+
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+        self.assertEqual(listen_conn.notifies, [])
+
+    def test_cache_disabled(self):
+        """Тест отключения кэша"""
+        self.assertIsNone(DBManager(cache_size=0).cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
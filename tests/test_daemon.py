@@ -0,0 +1,136 @@
+import random
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.api import VacancyPage
+from src.daemon import SyncDaemon, vacancy_fingerprint
+from src.projection import FULL
+from src.scheduler import Scheduler
+
+
+def vacancy(vacancy_id, employer_id, salary_from=100000):
+    return {
+        "id": vacancy_id,
+        "name": f"Vacancy {vacancy_id}",
+        "alternate_url": f"http://hh.ru/vacancy/{vacancy_id}",
+        "employer": {"id": employer_id},
+        "salary": {"from": salary_from, "to": None, "currency": "RUR"},
+    }
+
+
+class TestSyncDaemon(unittest.TestCase):
+    """Тесты фоновой синхронизации"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.api = MagicMock()
+        self.api.get_employer.side_effect = lambda employer_id: (
+            {"id": employer_id, "name": f"Company {employer_id}"} if employer_id != 3 else None
+        )
+        self.api.iter_pages.side_effect = lambda employer_id: iter(
+            [VacancyPage(0, [vacancy(employer_id * 10, employer_id)], 1)]
+        )
+        self.db_manager = MagicMock(projection=FULL)
+        self.scheduler = Scheduler([1, 2, 3], jitter=0, rng=random.Random(0))
+        self.daemon = SyncDaemon(
+            self.api, self.db_manager, self.scheduler, state_file="unused.json", concurrency=2
+        )
+        self.addCleanup(self.daemon.close)
+
+    def test_vacancy_fingerprint(self):
+        """Тест отпечатка набора вакансий"""
+        first = vacancy_fingerprint([vacancy(1, 1), vacancy(2, 1)])
+        self.assertEqual(first, vacancy_fingerprint([vacancy(2, 1), vacancy(1, 1)]))
+        self.assertNotEqual(first, vacancy_fingerprint([vacancy(1, 1)]))
+        self.assertNotEqual(first, vacancy_fingerprint([vacancy(1, 1, 90000), vacancy(2, 1)]))
+
+    @patch("src.scheduler.Scheduler.save")
+    def test_run_once(self, mock_save):
+        """Тест прохода: не больше concurrency работодателей, загрузка по одному"""
+        self.assertEqual(self.daemon.run_once(now=0), 2)
+
+        loaded = sorted(
+            ([e.id for e in employers], list(batch.id))
+            for employers, batch in (c[0] for c in self.db_manager.load_batch.call_args_list)
+        )
+        self.assertEqual(loaded, [([1], [10]), ([2], [20])])
+        synced = sorted(c[0][0][0] for c in self.db_manager.mark_synced.call_args_list)
+        self.assertEqual(synced, [1, 2])
+        self.assertIsNotNone(self.scheduler.schedules[1].fingerprint)
+        self.assertEqual(self.scheduler.due(now=0), [3])
+        mock_save.assert_called_once_with("unused.json")
+
+    @patch("src.scheduler.Scheduler.save")
+    def test_run_once_failures(self, mock_save):
+        """Тест повтора при ошибке запроса и при ошибке загрузки"""
+        self.scheduler.schedules[1].next_run = self.scheduler.schedules[2].next_run = 10
+
+        self.daemon.run_once(now=0)
+        self.assertEqual(self.scheduler.schedules[3].failures, 1)
+        self.db_manager.load_batch.assert_not_called()
+
+        self.db_manager.load_batch.side_effect = Exception("connection lost")
+        self.daemon.run_once(now=10)
+        self.assertEqual(self.scheduler.schedules[1].failures, 1)
+        self.assertEqual(self.scheduler.schedules[2].failures, 1)
+        self.assertEqual(self.db_manager.disconnect.call_count, 2)
+        self.db_manager.mark_synced.assert_not_called()
+
+    @patch("src.scheduler.Scheduler.save")
+    def test_run_once_interrupted(self, mock_save):
+        """Тест прерванной пагинации: страницы загружаются, сбор не завершен"""
+        self.api.iter_pages.side_effect = lambda employer_id: iter(
+            [VacancyPage(0, [vacancy(employer_id * 10, employer_id)], 2)]
+            if employer_id == 1
+            else [VacancyPage(0, [vacancy(employer_id * 10, employer_id)], 1)]
+        )
+
+        self.daemon.run_once(now=0)
+
+        batches = [c[0][1] for c in self.db_manager.load_batch.call_args_list]
+        self.assertEqual(sorted(i for batch in batches for i in batch.id), [10, 20])
+        self.db_manager.mark_synced.assert_called_once_with([2])
+        self.assertEqual(self.scheduler.schedules[1].failures, 1)
+        self.assertIsNone(self.scheduler.schedules[1].fingerprint)
+        self.assertIsNotNone(self.scheduler.schedules[2].fingerprint)
+
+    @patch("src.scheduler.Scheduler.save")
+    def test_run_once_slow_employer(self, mock_save):
+        """Тест: медленный работодатель не задерживает загрузку остальных"""
+        released = threading.Event()
+
+        def iter_pages(employer_id):
+            if employer_id == 1:
+                # Ждет, пока загрузятся работодатели, запущенные после него
+                released.wait(5)
+            return iter([VacancyPage(0, [vacancy(employer_id * 10, employer_id)], 1)])
+
+        def load_batch(employers, batch):
+            if employers[0].id == 3:
+                released.set()
+
+        self.api.get_employer.side_effect = lambda employer_id: {
+            "id": employer_id,
+            "name": f"Company {employer_id}",
+        }
+        self.api.iter_pages.side_effect = iter_pages
+        self.db_manager.load_batch.side_effect = load_batch
+
+        stop = threading.Event()
+        self.db_manager.mark_synced.side_effect = lambda ids: (
+            stop.set() if len(self.db_manager.mark_synced.call_args_list) == 3 else None
+        )
+        worker = threading.Thread(target=self.daemon.run, args=(stop,))
+        worker.start()
+        worker.join(10)
+
+        self.assertFalse(worker.is_alive())
+        self.assertTrue(released.is_set())
+        order = [c[0][0][0] for c in self.db_manager.mark_synced.call_args_list]
+        self.assertEqual(order[-1], 1)
+        self.assertEqual(sorted(order), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
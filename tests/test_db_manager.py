@@ -1,7 +1,17 @@
+import io
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
-from src.db_manager import DBManager
+import psycopg2
+
+from src.db_manager import (
+    DBManager,
+    VacancyRow,
+    _to_positional,
+    build_vacancy_rows,
+    format_salary,
+    salary_range_params,
+)
 
 
 class TestDBManager(unittest.TestCase):
@@ -227,6 +237,248 @@ class TestDBManager(unittest.TestCase):
         self.assertEqual(result, [])
         mock_disconnect.assert_called_once()
 
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_get_vacancies_in_salary_range(self, mock_disconnect, mock_connect):
+        """Тест поиска вакансий по пересечению зарплатной вилки с диапазоном"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        self.db_manager.connection = mock_conn
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=None)
+        mock_cursor.fetchall.return_value = [
+            ("Company A", "Python Developer", 100000, None, "RUR", "http://example.com/1")
+        ]
+
+        result = self.db_manager.get_vacancies_in_salary_range(
+            120000, None, employer_ids=(1, 2), keyword="Python"
+        )
+
+        self.assertEqual(result[0]["salary"], "от 100000 RUR")
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn("v.salary_range && int4range", query)
+        self.assertEqual(
+            params, (120000, None, None, None, [1, 2], [1, 2], "%python%", "%python%")
+        )
+
+    def test_salary_range_params_invalid(self):
+        """Тест ошибки при нижней границе больше верхней"""
+        self.assertEqual(salary_range_params(), (None,) * 8)
+        with self.assertRaises(ValueError):
+            salary_range_params(200000, 100000)
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_export(self, mock_disconnect, mock_connect):
+        """Тест выгрузки таблицы через COPY TO STDOUT"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        self.db_manager.connection = mock_conn
+        stream = io.BytesIO()
+
+        self.db_manager.export("employers", stream, "csv")
+
+        query, target = mock_cursor.copy_expert.call_args[0]
+        self.assertEqual(
+            query,
+            "COPY (SELECT id, name, url, alternate_url, description FROM employers ORDER BY id) "
+            "TO STDOUT WITH (FORMAT csv, HEADER)",
+        )
+        self.assertIs(target, stream)
+        mock_cursor.mogrify.assert_not_called()
+        mock_disconnect.assert_called_once()
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_export_report_params(self, mock_disconnect, mock_connect):
+        """Тест подстановки параметров запроса отчета в COPY"""
+        mock_conn = MagicMock(encoding="UTF8")
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.mogrify.return_value = "COPY (...) TO STDOUT".encode()
+        self.db_manager.connection = mock_conn
+
+        self.db_manager.export("vacancies_with_keyword", io.BytesIO(), "jsonl", ("%python%",))
+
+        query, params = mock_cursor.mogrify.call_args[0]
+        self.assertIn("row_to_json", query)
+        self.assertIn("LOWER(v.name) LIKE %s::text", query)
+        self.assertEqual(params, ("%python%",))
+        self.assertEqual(mock_cursor.copy_expert.call_args[0][0], "COPY (...) TO STDOUT")
+
+    def test_export_unknown_source(self):
+        """Тест ошибки при неизвестном источнике выгрузки"""
+        with self.assertRaises(ValueError):
+            self.db_manager.export("salaries", io.BytesIO())
+
+
+class TestVacancyRowFormats(unittest.TestCase):
+    """Тесты компактных форматов результата"""
+
+    rows = [
+        ("Company A", "Python Dev", 100000, 150000, "RUR", "http://example.com/1"),
+        ("Company B", "Java Dev", None, 200000, "RUR", "http://example.com/2"),
+    ]
+
+    def test_format_salary(self):
+        """Тест строкового представления зарплаты"""
+        self.assertEqual(format_salary(100000, 150000, "RUR"), "100000 - 150000 RUR")
+        self.assertEqual(format_salary(100000, None, "RUR"), "от 100000 RUR")
+        self.assertEqual(format_salary(None, 200000, "RUR"), "до 200000 RUR")
+        self.assertEqual(format_salary(None, None, None), "")
+
+    def test_tuple_rows(self):
+        """Тест строк в виде именованных кортежей"""
+        result = build_vacancy_rows(self.rows, "tuple")
+
+        self.assertIsInstance(result[0], VacancyRow)
+        self.assertEqual(result[0].company, "Company A")
+        self.assertEqual(result[0].salary, "100000 - 150000 RUR")
+        self.assertEqual(result[1].salary, "до 200000 RUR")
+
+    def test_columns(self):
+        """Тест результата по столбцам"""
+        result = build_vacancy_rows(self.rows, "columns")
+
+        self.assertEqual(result["company"], ["Company A", "Company B"])
+        self.assertEqual(result["salary_from"], [100000, None])
+        self.assertEqual(result["url"], ["http://example.com/1", "http://example.com/2"])
+
+    def test_company_names_shared(self):
+        """Тест общего экземпляра строки для повторяющихся компаний"""
+        rows = [
+            ("".join(["Company ", "A"]), "Dev", 1, 2, "RUR", ""),
+            ("".join(["Company ", "A"]), "QA", 1, 2, "RUR", ""),
+        ]
+
+        for row_format in ("dict", "tuple"):
+            result = build_vacancy_rows(rows, row_format)
+            first, second = (
+                (r["company"] if row_format == "dict" else r.company) for r in result
+            )
+            self.assertIs(first, second)
+        columns = build_vacancy_rows(rows, "columns")
+        self.assertIs(columns["company"][0], columns["company"][1])
+
+    def test_empty_columns(self):
+        """Тест пустого результата по столбцам"""
+        result = build_vacancy_rows([], "columns")
+
+        self.assertEqual(set(result), set(VacancyRow._fields))
+        self.assertTrue(all(values == [] for values in result.values()))
+
+    def test_unknown_format(self):
+        """Тест неизвестного формата результата"""
+        with self.assertRaises(ValueError):
+            build_vacancy_rows(self.rows, "xml")
+
+    @patch("src.db_manager.DBManager.connect")
+    def test_unknown_format_before_connect(self, mock_connect):
+        """Тест отклонения неизвестного формата без подключения к БД"""
+        db_manager = DBManager(cache_size=0)
+
+        with self.assertRaises(ValueError):
+            db_manager.get_all_vacancies(row_format="xml")
+        with self.assertRaises(ValueError):
+            db_manager.get_vacancies_with_keyword("python", row_format="xml")
+
+        mock_connect.assert_not_called()
+
+    @patch("src.db_manager.DBManager.connect")
+    @patch("src.db_manager.DBManager.disconnect")
+    def test_get_all_vacancies_tuple(self, mock_disconnect, mock_connect):
+        """Тест получения всех вакансий в компактном формате"""
+        db_manager = DBManager()
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        db_manager.connection = mock_conn
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=None)
+        mock_cursor.fetchall.return_value = self.rows
+
+        result = db_manager.get_all_vacancies(row_format="tuple")
+
+        self.assertEqual(result, [VacancyRow(*row) for row in self.rows])
+
+
+class TestDBManagerPersistentSession(unittest.TestCase):
+    """Тесты постоянной сессии с подготовленными запросами"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.db_manager = DBManager(cache_size=0, persistent=True)
+        self.mock_cursor = MagicMock()
+        self.mock_conn = MagicMock(closed=False)
+        self.mock_conn.cursor.return_value.__enter__.return_value = self.mock_cursor
+
+    def executed(self):
+        return [c[0][0] for c in self.mock_cursor.execute.call_args_list]
+
+    def test_to_positional(self):
+        """Тест замены плейсхолдеров на параметры PREPARE"""
+        self.assertEqual(
+            _to_positional("SELECT %s::text, %s"), "SELECT $1::text, $2"
+        )
+
+    @patch("psycopg2.connect")
+    def test_statement_prepared_once(self, mock_connect):
+        """Тест однократной подготовки запроса и переиспользования соединения"""
+        mock_connect.return_value = self.mock_conn
+        self.mock_cursor.fetchall.return_value = []
+
+        self.db_manager.get_vacancies_with_keyword("python")
+        self.db_manager.get_vacancies_with_keyword("java")
+
+        mock_connect.assert_called_once()
+        self.assertTrue(self.mock_conn.autocommit)
+        statements = self.executed()
+        self.assertTrue(statements[0].startswith("PREPARE hh_vacancies_with_keyword AS"))
+        self.assertIn("LIKE $1::text", statements[0])
+        self.assertEqual(statements[1:], ["EXECUTE hh_vacancies_with_keyword (%s)"] * 2)
+        self.mock_conn.close.assert_not_called()
+
+    @patch("psycopg2.connect")
+    def test_reprepare_after_reconnect(self, mock_connect):
+        """Тест повторной подготовки запроса после обрыва соединения"""
+        new_conn = MagicMock(closed=False)
+        new_cursor = MagicMock()
+        new_conn.cursor.return_value.__enter__.return_value = new_cursor
+        new_cursor.fetchall.return_value = [("Company A", 5)]
+        mock_connect.side_effect = [self.mock_conn, new_conn]
+        self.mock_cursor.fetchall.side_effect = psycopg2.OperationalError("closed")
+
+        result = self.db_manager.get_companies_and_vacancies_count()
+
+        self.assertEqual(result, [{"company": "Company A", "vacancies_count": 5}])
+        self.assertEqual(mock_connect.call_count, 2)
+        statements = [c[0][0] for c in new_cursor.execute.call_args_list]
+        self.assertTrue(statements[0].startswith("PREPARE hh_companies_and_vacancies_count"))
+
+    @patch("psycopg2.connect")
+    def test_statement_stats(self, mock_connect):
+        """Тест статистики выполнения запросов"""
+        mock_connect.return_value = self.mock_conn
+        self.mock_cursor.fetchone.return_value = (100000,)
+
+        self.db_manager.get_avg_salary()
+        self.db_manager.get_avg_salary()
+
+        stats = self.db_manager.get_statement_stats()["avg_salary"]
+        self.assertEqual(stats.calls, 2)
+        self.assertGreaterEqual(stats.max_time, 0)
+        self.assertLessEqual(stats.max_time, stats.total_time)
+
+    @patch("psycopg2.connect")
+    def test_context_manager_closes_session(self, mock_connect):
+        """Тест закрытия постоянной сессии при выходе из контекста"""
+        mock_connect.return_value = self.mock_conn
+        self.mock_cursor.fetchone.return_value = (100000,)
+
+        with self.db_manager as db:
+            db.get_avg_salary()
+
+        self.mock_conn.close.assert_called_once()
+        self.assertIsNone(self.db_manager.connection)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from src.dedup import BloomFilter, IntSet, SeenIds, unique
+
+
+class TestIntSet(unittest.TestCase):
+    """Тесты для класса IntSet"""
+
+    def test_add_and_contains(self):
+        """Тест добавления с многократным слиянием буфера"""
+        values = IntSet(min_buffer=4)
+        for value in range(100, 0, -3):
+            self.assertTrue(values.add(value))
+        self.assertFalse(values.add(100))
+        self.assertFalse(values.add(1))
+
+        self.assertEqual(len(values), 34)
+        self.assertIn(52, values)
+        self.assertNotIn(51, values)
+        self.assertEqual(list(values), list(range(1, 101, 3)))
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Тесты для класса BloomFilter"""
+
+    def test_no_false_negatives(self):
+        """Тест отсутствия пропусков добавленных значений"""
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for value in range(0, 2000, 2):
+            bloom.add(value)
+
+        self.assertTrue(all(value in bloom for value in range(0, 2000, 2)))
+        false_positives = sum(value in bloom for value in range(1, 20001, 2))
+        self.assertLess(false_positives, 300)
+
+    def test_invalid_parameters(self):
+        """Тест проверки параметров"""
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, error_rate=1.5)
+
+
+class TestSeenIds(unittest.TestCase):
+    """Тесты для класса SeenIds"""
+
+    def test_duplicates(self):
+        """Тест подсчета повторов"""
+        seen = SeenIds()
+        self.assertTrue(seen.add(1))
+        self.assertFalse(seen.add(1))
+        self.assertEqual(seen.duplicates, 1)
+        self.assertFalse(seen.approximate)
+
+    def test_switch_to_bloom_filter(self):
+        """Тест перехода на фильтры Блума после max_exact id"""
+        seen = SeenIds(max_exact=10)
+        with redirect_stdout(io.StringIO()) as output:
+            for value in range(20):
+                seen.add(value)
+
+        self.assertTrue(seen.approximate)
+        self.assertIn("фильтру Блума", output.getvalue())
+        self.assertEqual(len(seen), 20)
+        self.assertTrue(all(value in seen for value in range(20)))
+        self.assertFalse(seen.add(5))
+        self.assertEqual(seen.approximate_duplicates, 1)
+
+    def test_bloom_filters_sized_from_count(self):
+        """Тест размера фильтров Блума по количеству id и их росту"""
+        seen = SeenIds(max_exact=100, growth=2.0)
+        with redirect_stdout(io.StringIO()):
+            for value in range(1000):
+                seen.add(value)
+
+        capacities = [bloom.capacity for bloom in seen._filters]
+        self.assertEqual(capacities[:2], [202, 404])
+        self.assertTrue(all(len(bloom) <= bloom.capacity for bloom in seen._filters))
+        self.assertTrue(all(value in seen for value in range(1000)))
+        self.assertLess(seen.approximate_duplicates, 10)
+
+    def test_invalid_growth(self):
+        """Тест проверки коэффициента роста"""
+        with self.assertRaises(ValueError):
+            SeenIds(growth=1)
+
+    def test_unique(self):
+        """Тест потоковой фильтрации элементов с общим множеством"""
+        seen = SeenIds()
+        first = list(unique([{"id": "1"}, {"id": "2"}, {"id": "1"}], seen))
+        second = list(unique([{"id": "2"}, {"id": "3"}], seen))
+
+        self.assertEqual([item["id"] for item in first], ["1", "2"])
+        self.assertEqual([item["id"] for item in second], ["3"])
+        self.assertEqual(seen.duplicates, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
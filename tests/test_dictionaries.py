@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.dictionaries import BUNDLED_DICTIONARIES, load_dictionaries
+
+
+class TestLoadDictionaries(unittest.TestCase):
+    """Тесты загрузки справочников HH"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "dictionaries.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_bundled_without_cache(self):
+        """Тест офлайн-копии при отсутствии кэша"""
+        self.assertIs(load_dictionaries(cache_file=self.cache_file), BUNDLED_DICTIONARIES)
+
+    def test_fetch_and_cache(self):
+        """Тест получения справочников из API и сохранения в кэш"""
+        api = MagicMock()
+        api.get_dictionaries.return_value = {
+            "experience": [{"id": "noExperience", "name": "Нет опыта", "uid": "x"}],
+            "employment": [{"id": "full", "name": "Полная занятость"}],
+            "schedule": [{"id": "remote", "name": "Удаленная работа"}],
+        }
+
+        fetched = load_dictionaries(api, self.cache_file)
+        cached = load_dictionaries(cache_file=self.cache_file)
+
+        self.assertEqual(fetched["experience"], [{"id": "noExperience", "name": "Нет опыта"}])
+        self.assertNotIn("schedule", fetched)
+        self.assertEqual(cached, fetched)
+
+    def test_api_failure_uses_cache(self):
+        """Тест чтения кэша при ошибке API"""
+        with open(self.cache_file, "w", encoding="utf-8") as file:
+            json.dump({"experience": [{"id": "moreThan6", "name": "Более 6 лет"}]}, file)
+        api = MagicMock()
+        api.get_dictionaries.return_value = None
+
+        dictionaries = load_dictionaries(api, self.cache_file)
+
+        self.assertEqual(dictionaries["experience"][0]["id"], "moreThan6")
+        self.assertEqual(dictionaries["employment"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from src.encoding import (
+    NULL_CODE,
+    StringDictionary,
+    compress_text,
+    decompress_text,
+    intern_strings,
+)
+
+
+class TestStringDictionary(unittest.TestCase):
+    """Тесты для класса StringDictionary"""
+
+    def test_encode_decode(self):
+        """Тест кодирования и декодирования строк"""
+        dictionary = StringDictionary(["RUR"])
+
+        self.assertEqual(dictionary.encode("RUR"), 0)
+        self.assertEqual(dictionary.encode("USD"), 1)
+        self.assertEqual(dictionary.encode("USD"), 1)
+        self.assertEqual(dictionary.encode(None), NULL_CODE)
+        self.assertEqual(dictionary.decode(1), "USD")
+        self.assertIsNone(dictionary.decode(NULL_CODE))
+        self.assertEqual(len(dictionary), 2)
+
+    def test_intern(self):
+        """Тест получения единственного экземпляра строки"""
+        dictionary = StringDictionary()
+        first = "".join(["full", "time"])
+        second = "".join(["full", "time"])
+
+        self.assertIsNot(first, second)
+        self.assertIs(dictionary.intern(first), dictionary.intern(second))
+        self.assertIsNone(dictionary.intern(None))
+
+    def test_intern_strings(self):
+        """Тест замены равных строк одним экземпляром"""
+        names = intern_strings(["".join(["Company ", "A"]), "".join(["Company ", "A"]), "B"])
+
+        self.assertEqual(names, ["Company A", "Company A", "B"])
+        self.assertIs(names[0], names[1])
+
+
+class TestCompressText(unittest.TestCase):
+    """Тесты сжатия описаний"""
+
+    def test_round_trip(self):
+        """Тест сжатия и распаковки текста"""
+        text = "<p>Обязанности и требования</p>" * 50
+        data = compress_text(text)
+
+        self.assertLess(len(data), len(text.encode("utf-8")))
+        self.assertEqual(decompress_text(data), text)
+        self.assertEqual(decompress_text(memoryview(data)), text)
+        self.assertIsNone(compress_text(None))
+        self.assertIsNone(decompress_text(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
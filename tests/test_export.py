@@ -0,0 +1,84 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from src.export import build_copy_query, build_table_query, open_export_stream
+from src.projection import LEAN
+
+
+class TestBuildCopyQuery(unittest.TestCase):
+    """Тесты построения запросов COPY"""
+
+    def test_csv(self):
+        """Тест выгрузки в CSV с заголовком"""
+        self.assertEqual(
+            build_copy_query("SELECT * FROM employers", "csv"),
+            "COPY (SELECT * FROM employers) TO STDOUT WITH (FORMAT csv, HEADER)",
+        )
+
+    def test_jsonl(self):
+        """Тест выгрузки строк объектами JSON без экранирования COPY"""
+        query = build_copy_query("SELECT * FROM employers", "jsonl")
+        self.assertIn("SELECT row_to_json(q) FROM (SELECT * FROM employers) q", query)
+        self.assertIn("QUOTE e'\\x01'", query)
+
+    def test_unknown_format(self):
+        """Тест ошибки при неизвестном формате"""
+        with self.assertRaises(ValueError):
+            build_copy_query("SELECT 1", "xml")
+
+
+class TestBuildTableQuery(unittest.TestCase):
+    """Тесты запросов выгрузки таблиц"""
+
+    def test_vacancies(self):
+        """Тест выгрузки полей вакансии с названиями из справочников"""
+        query = build_table_query("vacancies")
+
+        self.assertTrue(query.startswith("SELECT v.id, v.name, v.url"))
+        self.assertIn("experience.name AS experience", query)
+        self.assertIn("LEFT JOIN employment ON employment.id = v.employment_id", query)
+        self.assertNotIn("salary_range", query)
+        self.assertNotIn("*", query)
+
+    def test_vacancies_lean(self):
+        """Тест выгрузки только столбцов профиля проекции"""
+        query = build_table_query("vacancies", LEAN)
+
+        self.assertNotIn("url,", query.replace("alternate_url", ""))
+        self.assertNotIn("JOIN", query)
+
+    def test_unknown_table(self):
+        """Тест ошибки при неизвестной таблице"""
+        with self.assertRaises(ValueError):
+            build_table_query("vacancy_descriptions")
+
+
+class TestOpenExportStream(unittest.TestCase):
+    """Тесты потоков выгрузки"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_file(self):
+        """Тест записи в файл"""
+        path = os.path.join(self.directory.name, "employers.csv")
+        with open_export_stream(path) as stream:
+            stream.write(b"id,name\n")
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), b"id,name\n")
+
+    def test_gzip(self):
+        """Тест сжатия выгрузки"""
+        path = os.path.join(self.directory.name, "employers.csv.gz")
+        with open_export_stream(path, compress=True) as stream:
+            stream.write(b"id,name\n")
+            stream.write(b"1,A\n")
+        with gzip.open(path, "rb") as file:
+            self.assertEqual(file.read(), b"id,name\n1,A\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 import unittest
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 from src.database import DatabaseManager
+from src.encoding import decompress_text
 from src.models import Employer, Salary, Vacancy
+from src.projection import LEAN
 
 
 class TestDatabaseIntegration(unittest.TestCase):
@@ -103,6 +106,260 @@ class TestDatabaseIntegration(unittest.TestCase):
         self.assertEqual(mock_insert_employer.call_count, 2)
         self.assertEqual(mock_insert_vacancy.call_count, 2)
 
+    @patch("src.database.execute_values")
+    def test_load_batch(self, mock_execute_values):
+        """Тест пакетной загрузки данных"""
+        mock_conn = MagicMock()
+        self.db_manager.connection = mock_conn
+        employers = [Employer(id=1, name="Company A", url="", alternate_url="")]
+        batch = Vacancy.from_json_batch(
+            [{"id": 1, "name": "Vacancy 1", "employer": {"id": 1}}]
+        )
+
+        self.db_manager.load_batch(employers, batch)
+
+        self.assertEqual(mock_execute_values.call_count, 2)
+        employer_rows = mock_execute_values.call_args_list[0][0][2]
+        vacancy_rows = list(mock_execute_values.call_args_list[1][0][2])
+        self.assertEqual(employer_rows, [(1, "Company A", "", "", None)])
+        self.assertEqual(vacancy_rows[0][:5], (1, "Vacancy 1", "", "", 1))
+        self.assertEqual(len(vacancy_rows[0]), 11)
+        mock_conn.commit.assert_called()
+
+    @patch("src.database.execute_values")
+    def test_load_batch_descriptions(self, mock_execute_values):
+        """Тест записи сжатых описаний в отдельную таблицу"""
+        self.db_manager.connection = MagicMock()
+        batch = Vacancy.from_json_batch(
+            [{"id": 1, "name": "Vacancy 1", "employer": {"id": 1}, "description": "<p>Текст</p>"}]
+        )
+
+        self.db_manager.load_batch([], batch)
+
+        self.assertEqual(mock_execute_values.call_count, 3)
+        query, rows = mock_execute_values.call_args_list[2][0][1:3]
+        self.assertIn("vacancy_descriptions", query)
+        self.assertEqual(rows[0][0], 1)
+        self.assertEqual(decompress_text(rows[0][1].adapted), "<p>Текст</p>")
+
+    @patch("src.database.execute_values")
+    def test_load_batch_deduplicates(self, mock_execute_values):
+        """Тест удаления повторяющихся id перед пакетной загрузкой"""
+        self.db_manager.connection = MagicMock()
+        employer = Employer(id=1, name="Company A", url="", alternate_url="")
+        batch = Vacancy.from_json_batch(
+            [
+                {"id": 1, "name": "Vacancy 1", "employer": {"id": 1}},
+                {"id": 1, "name": "Vacancy 1 (updated)", "employer": {"id": 1}},
+            ]
+        )
+
+        self.db_manager.load_batch([employer, employer], batch)
+
+        employer_rows = mock_execute_values.call_args_list[0][0][2]
+        vacancy_rows = list(mock_execute_values.call_args_list[1][0][2])
+        self.assertEqual(len(employer_rows), 1)
+        self.assertEqual([row[1] for row in vacancy_rows], ["Vacancy 1 (updated)"])
+
+    @patch("src.database.execute_values")
+    def test_load_batch_lookup_codes(self, mock_execute_values):
+        """Тест замены опыта и типа занятости кодами справочников"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[("noExperience", 1)], []]
+        mock_execute_values.side_effect = [None, [], [("full", 3)], None]
+        self.db_manager.connection = mock_conn
+        batch = Vacancy.from_json_batch(
+            [
+                {
+                    "id": 1,
+                    "name": "Vacancy 1",
+                    "employer": {"id": 1},
+                    "experience": {"id": "noExperience", "name": "Нет опыта"},
+                    "employment": {"id": "full", "name": "Полная занятость"},
+                }
+            ]
+        )
+
+        self.db_manager.load_batch([], batch)
+
+        legacy, insert = mock_execute_values.call_args_list[1:3]
+        self.assertIn("t.hh_id IS NULL", legacy[0][1])
+        self.assertIn("ON CONFLICT (hh_id) DO UPDATE SET name", insert[0][1])
+        self.assertEqual(insert[0][2], [("full", "Полная занятость")])
+        query, rows = mock_execute_values.call_args_list[3][0][1:3]
+        self.assertIn("experience_id", query)
+        self.assertEqual(list(rows)[0][-2:], (1, 3))
+
+    def test_create_tables_lookups(self):
+        """Тест создания и заполнения таблиц-справочников"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = None
+        self.db_manager.connection = mock_conn
+        dictionaries = {
+            "experience": [{"id": "noExperience", "name": "Нет опыта"}],
+            "employment": [],
+        }
+
+        self.db_manager.create_tables(dictionaries)
+
+        queries = " ".join(call[0][0] for call in mock_cursor.execute.call_args_list)
+        self.assertIn("CREATE TABLE IF NOT EXISTS experience", queries)
+        self.assertIn("experience_id SMALLINT REFERENCES experience(id)", queries)
+        self.assertIn("USING GIST (salary_range)", queries)
+        self.assertIn(
+            [("noExperience", "Нет опыта", "noExperience")],
+            mock_cursor.executemany.call_args[0],
+        )
+
+    def test_create_tables_existing_lookups(self):
+        """Тест повторного заполнения справочников без вставки существующих элементов"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = None
+        mock_cursor.fetchall.return_value = [("noExperience", "Нет опыта")]
+        self.db_manager.connection = mock_conn
+        dictionaries = {
+            "experience": [
+                {"id": "noExperience", "name": "Нет опыта"},
+                {"id": "between1And3", "name": "От 1 года до 3 лет"},
+            ],
+            "employment": [{"id": "noExperience", "name": "Без опыта"}],
+        }
+
+        self.db_manager.create_tables(dictionaries)
+
+        calls = [call[0] for call in mock_cursor.executemany.call_args_list]
+        inserted = [values for query, values in calls if "INSERT" in query]
+        self.assertEqual(
+            inserted, [[("between1And3", "От 1 года до 3 лет", "between1And3")]]
+        )
+        renamed = [values for query, values in calls if "SET name" in query]
+        self.assertEqual(renamed, [[("Без опыта", "noExperience")]])
+
+    @patch("src.database.execute_values")
+    def test_load_batch_lean_projection(self, mock_execute_values):
+        """Тест загрузки только столбцов профиля проекции"""
+        self.db_manager.connection = MagicMock()
+        self.db_manager.projection = LEAN
+        batch = Vacancy.from_json_batch(
+            [{"id": 1, "name": "Vacancy 1", "employer": {"id": 1}, "description": "Текст"}],
+            LEAN,
+        )
+
+        self.db_manager.load_batch([], batch)
+
+        self.assertEqual(mock_execute_values.call_count, 2)
+        query, rows = mock_execute_values.call_args_list[1][0][1:3]
+        self.assertNotIn("experience", query)
+        self.assertEqual(list(rows), [(1, "Vacancy 1", "", 1, None, None, None, None)])
+
+    def test_create_tables_lean_projection(self):
+        """Тест создания таблиц без столбцов вне профиля проекции"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        self.db_manager.connection = mock_conn
+        self.db_manager.projection = LEAN
+
+        self.db_manager.create_tables()
+
+        queries = " ".join(call[0][0] for call in mock_cursor.execute.call_args_list)
+        self.assertIn("salary_gross BOOLEAN", queries)
+        self.assertNotIn("experience", queries)
+        self.assertNotIn("vacancy_descriptions", queries)
+        self.assertNotIn("ADD COLUMN IF NOT EXISTS url", queries)
+
+    def test_create_tables_widened_projection(self):
+        """Тест добавления столбцов профиля в таблицу, созданную с более узким"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = None
+        self.db_manager.connection = mock_conn
+
+        self.db_manager.create_tables({"experience": [], "employment": []})
+
+        queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        self.assertIn("ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS url TEXT", queries)
+        self.assertIn(
+            "ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS experience_id "
+            "SMALLINT REFERENCES experience(id)",
+            queries,
+        )
+
+    @patch("src.database.execute_values")
+    def test_mark_synced(self, mock_execute_values):
+        """Тест записи времени сбора по работодателям"""
+        self.db_manager.connection = MagicMock()
+
+        self.db_manager.mark_synced([1740, 3529, 1740])
+
+        query, rows = mock_execute_values.call_args[0][1:3]
+        self.assertIn("INSERT INTO employer_sync", query)
+        self.assertEqual(rows, [(1740,), (3529,)])
+        mock_cursor = self.db_manager.connection.cursor.return_value.__enter__.return_value
+        self.assertIn("DELETE FROM harvest_checkpoints", mock_cursor.execute.call_args[0][0])
+        self.db_manager.connection.commit.assert_called_once()
+
+    def test_get_stale_employers(self):
+        """Тест отбора работодателей с устаревшими данными"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = ("employer_sync",)
+        mock_cursor.fetchall.return_value = [(3529,)]
+        self.db_manager.connection = mock_conn
+
+        stale = self.db_manager.get_stale_employers([1740, 3529, 15478], timedelta(hours=12))
+
+        self.assertEqual(stale, [1740, 15478])
+        self.assertEqual(mock_cursor.execute.call_args[0][1][1], timedelta(hours=12))
+
+    def test_get_stale_employers_without_table(self):
+        """Тест: до создания employer_sync устаревшими считаются все работодатели"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (None,)
+        self.db_manager.connection = mock_conn
+
+        stale = self.db_manager.get_stale_employers([1740, 3529], timedelta(hours=12))
+
+        self.assertEqual(stale, [1740, 3529])
+        self.assertEqual(mock_cursor.execute.call_count, 1)
+
+    @patch("src.database.execute_values")
+    def test_load_batch_checkpoint(self, mock_execute_values):
+        """Тест записи отметки страницы в транзакции загрузки"""
+        self.db_manager.connection = MagicMock()
+        mock_cursor = self.db_manager.connection.cursor.return_value.__enter__.return_value
+        batch = Vacancy.from_json_batch([{"id": 1, "name": "Vacancy 1", "employer": {"id": 1}}])
+
+        self.db_manager.load_batch([], batch, checkpoint=(1740, 3))
+
+        calls = [c[0] for c in mock_cursor.execute.call_args_list if "harvest" in c[0][0]]
+        self.assertEqual(len(calls), 1)
+        self.assertIn("INSERT INTO harvest_checkpoints", calls[0][0])
+        self.assertEqual(calls[0][1], (1740, 3))
+
+    def test_get_checkpoints(self):
+        """Тест получения страниц для продолжения прерванного сбора"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [(1740, 3)]
+        self.db_manager.connection = mock_conn
+
+        self.assertEqual(self.db_manager.get_checkpoints([1740, 3529]), {1740: 4})
+        self.assertEqual(mock_cursor.execute.call_args[0][1][0], [1740, 3529])
+
+    def test_read_employer_ids(self):
+        """Тест чтения списка работодателей из таблицы"""
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [(1740,), (3529,)]
+        self.db_manager.connection = mock_conn
+
+        self.assertEqual(self.db_manager.read_employer_ids("watchlist.employers"), [1740, 3529])
+        mock_cursor.execute.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
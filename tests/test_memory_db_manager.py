@@ -0,0 +1,289 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+import psycopg2
+
+from src.db_manager import DBManager, VacancyRow
+from src.memory_db_manager import MemoryDBManager, _like_matcher
+from src.models import Employer, Salary, Vacancy
+from src.snapshot import write_snapshot
+
+
+class TestLikeMatcher(unittest.TestCase):
+    """Тесты сопоставления с шаблоном LIKE"""
+
+    def test_substring(self):
+        """Тест шаблона без спецсимволов внутри"""
+        matches = _like_matcher("%python%")
+        self.assertTrue(matches("senior python developer"))
+        self.assertFalse(matches("java developer"))
+
+    def test_wildcards(self):
+        """Тест символов % и _ внутри ключевого слова"""
+        self.assertTrue(_like_matcher("%c_+%")("c++ developer"))
+        self.assertTrue(_like_matcher("%java%script%")("java/typescript"))
+        self.assertFalse(_like_matcher("%c_+%")("c+ developer"))
+
+    def test_escape(self):
+        """Тест экранирования обратной косой чертой"""
+        self.assertTrue(_like_matcher("%100\\%%")("100% remote"))
+        self.assertFalse(_like_matcher("%100\\%%")("1000 remote"))
+
+
+class TestMemoryDBManager(unittest.TestCase):
+    """Тесты для класса MemoryDBManager"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.employers = [
+            Employer(id=1, name="Company A", url="", alternate_url=""),
+            Employer(id=2, name="Company B", url="", alternate_url=""),
+            Employer(id=3, name="Company C", url="", alternate_url=""),
+        ]
+        self.vacancies = [
+            Vacancy(
+                id=10,
+                name="Python Developer",
+                url="",
+                alternate_url="http://hh.ru/vacancy/10",
+                employer_id=1,
+                salary=Salary(from_=100001, to=150000, currency="RUR"),
+            ),
+            Vacancy(
+                id=11,
+                name="Java Developer",
+                url="",
+                alternate_url="http://hh.ru/vacancy/11",
+                employer_id=2,
+                salary=Salary(to=80000, currency="RUR"),
+            ),
+            Vacancy(
+                id=12,
+                name="Аналитик",
+                url="",
+                alternate_url="http://hh.ru/vacancy/12",
+                employer_id=1,
+            ),
+            Vacancy(
+                id=13,
+                name="Senior Python Developer",
+                url="",
+                alternate_url="http://hh.ru/vacancy/13",
+                employer_id=2,
+                salary=Salary(from_=300000, currency="RUR"),
+            ),
+        ]
+        self.db_manager = MemoryDBManager.from_models(self.employers, self.vacancies)
+
+    def test_companies_and_vacancies_count(self):
+        """Тест подсчета вакансий, включая компании без вакансий"""
+        self.assertEqual(
+            self.db_manager.get_companies_and_vacancies_count(),
+            [
+                {"company": "Company A", "vacancies_count": 2},
+                {"company": "Company B", "vacancies_count": 2},
+                {"company": "Company C", "vacancies_count": 0},
+            ],
+        )
+
+    def test_all_vacancies_order(self):
+        """Тест сортировки по компании и названию вакансии"""
+        result = self.db_manager.get_all_vacancies(row_format="tuple")
+        self.assertEqual(
+            [(row.company, row.vacancy) for row in result],
+            [
+                ("Company A", "Python Developer"),
+                ("Company A", "Аналитик"),
+                ("Company B", "Java Developer"),
+                ("Company B", "Senior Python Developer"),
+            ],
+        )
+        self.assertEqual(result[0], VacancyRow(
+            "Company A", "Python Developer", 100001, 150000, "RUR", "http://hh.ru/vacancy/10"
+        ))
+        self.assertIsNone(result[1].salary_from)
+
+    def test_avg_salary_integer_division(self):
+        """Тест средней зарплаты с целочисленным делением, как в SQL"""
+        # (100001 + 150000) / 2 = 125000, 80000 / 2 = 40000, 300000 / 2 = 150000
+        self.assertEqual(self.db_manager.get_avg_salary(), round(315000 / 3, 2))
+
+    def test_vacancies_with_higher_salary(self):
+        """Тест отбора вакансий с зарплатой выше средней по убыванию зарплаты"""
+        result = self.db_manager.get_vacancies_with_higher_salary()
+        self.assertEqual(
+            [vacancy["vacancy"] for vacancy in result],
+            ["Senior Python Developer", "Python Developer"],
+        )
+        self.assertEqual(result[1]["salary"], "100001 - 150000 RUR")
+
+    def test_vacancies_with_keyword(self):
+        """Тест поиска без учета регистра"""
+        result = self.db_manager.get_vacancies_with_keyword("PYTHON")
+        self.assertEqual(
+            [vacancy["vacancy"] for vacancy in result],
+            ["Python Developer", "Senior Python Developer"],
+        )
+        self.assertEqual(self.db_manager.get_vacancies_with_keyword("аналит")[0]["company"], "Company A")
+
+    def test_vacancies_in_salary_range(self):
+        """Тест пересечения вилок с открытыми границами и фильтров"""
+
+        def names(*args, **kwargs):
+            result = self.db_manager.get_vacancies_in_salary_range(*args, **kwargs)
+            return [vacancy["vacancy"] for vacancy in result]
+
+        self.assertEqual(names(150000, 200000), ["Python Developer"])
+        self.assertEqual(names(None, 90000), ["Java Developer"])
+        self.assertEqual(names(400000), ["Senior Python Developer"])
+        self.assertEqual(
+            names(),
+            ["Python Developer", "Java Developer", "Senior Python Developer"],
+        )
+        self.assertEqual(names(employer_ids=[2], keyword="python"), ["Senior Python Developer"])
+        self.assertEqual(names(currency="USD"), [])
+        with self.assertRaises(ValueError):
+            names(2, 1)
+
+    def test_duplicates_and_orphans(self):
+        """Тест повторяющихся id и вакансий без работодателя"""
+        updated = Vacancy(
+            id=10,
+            name="Python Team Lead",
+            url="",
+            alternate_url="",
+            employer_id=1,
+        )
+        orphan = Vacancy(id=20, name="Python QA", url="", alternate_url="", employer_id=99)
+        db_manager = MemoryDBManager.from_models(self.employers, self.vacancies + [updated, orphan])
+
+        names = [v["vacancy"] for v in db_manager.get_vacancies_with_keyword("python")]
+        self.assertEqual(names, ["Python Team Lead", "Senior Python Developer"])
+        self.assertEqual(db_manager.get_companies_and_vacancies_count()[0]["vacancies_count"], 2)
+
+    def test_empty(self):
+        """Тест отчетов без данных"""
+        db_manager = MemoryDBManager.from_models([], [])
+        self.assertEqual(db_manager.get_avg_salary(), 0.0)
+        self.assertEqual(db_manager.get_all_vacancies(), [])
+        self.assertEqual(
+            db_manager.get_vacancies_with_higher_salary(row_format="columns")["company"], []
+        )
+
+    def test_from_snapshot(self):
+        """Тест создания из снимка"""
+        handle, path = tempfile.mkstemp(suffix=".hhsnap")
+        os.close(handle)
+        try:
+            write_snapshot(path, self.employers, self.db_manager.vacancies)
+            db_manager = MemoryDBManager.from_snapshot(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(db_manager.get_all_vacancies(), self.db_manager.get_all_vacancies())
+
+
+class TestMemoryDBManagerParity(unittest.TestCase):
+    """
+    Сравнение результатов MemoryDBManager и DBManager на одних данных
+
+    Требуется PostgreSQL из config/database.ini, иначе тесты пропускаются.
+    Используется отдельная база, данные в ней перезаписываются.
+    """
+
+    DATABASE = "hh_vacancies_parity"
+
+    @classmethod
+    def setUpClass(cls):
+        from benchmarks.synthetic import generate_employers, generate_vacancies
+        from src.database import DatabaseManager
+
+        database = DatabaseManager()
+        try:
+            database.create_database(cls.DATABASE)
+        except psycopg2.Error as e:
+            raise unittest.SkipTest(f"PostgreSQL недоступен: {e}")
+        database.config["database"] = cls.DATABASE
+        database.create_tables()
+        assert database.connection is not None
+        with database.connection.cursor() as cursor:
+            cursor.execute("TRUNCATE vacancies, employers CASCADE")
+        database.connection.commit()
+
+        employer_data = generate_employers(50, seed=1)
+        employers = [Employer.from_json(e) for e in employer_data]
+        batch = Vacancy.from_json_batch(
+            generate_vacancies(5000, [e.id for e in employers], seed=1)
+        )
+        database.load_batch(employers, batch)
+
+        cls.memory = MemoryDBManager.from_database(database)
+        database.disconnect()
+        cls.postgres = DBManager(cache_size=0)
+        cls.postgres.config["database"] = cls.DATABASE
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.postgres.close()
+
+    def assertSameRows(self, first, second):
+        """Сравнить результаты без учета порядка строк с равными ключами сортировки"""
+        self.assertEqual(len(first), len(second))
+        self.assertEqual(Counter(first), Counter(second))
+
+    def assertSameOrder(self, first, second):
+        """Сравнить порядок строк вакансий по ключу сортировки (компания, название)"""
+        self.assertEqual(
+            [(row.company, row.vacancy) for row in first],
+            [(row.company, row.vacancy) for row in second],
+        )
+
+    def test_companies_and_vacancies_count(self):
+        memory = self.memory.get_companies_and_vacancies_count()
+        postgres = self.postgres.get_companies_and_vacancies_count()
+        self.assertSameRows(
+            [tuple(row.values()) for row in memory], [tuple(row.values()) for row in postgres]
+        )
+        self.assertEqual(
+            [row["vacancies_count"] for row in memory],
+            [row["vacancies_count"] for row in postgres],
+        )
+
+    def test_all_vacancies(self):
+        memory = self.memory.get_all_vacancies(row_format="tuple")
+        postgres = self.postgres.get_all_vacancies(row_format="tuple")
+        self.assertSameRows(memory, postgres)
+        self.assertSameOrder(memory, postgres)
+
+    def test_avg_salary(self):
+        self.assertEqual(self.memory.get_avg_salary(), self.postgres.get_avg_salary())
+
+    def test_vacancies_with_higher_salary(self):
+        memory = self.memory.get_vacancies_with_higher_salary(row_format="tuple")
+        postgres = self.postgres.get_vacancies_with_higher_salary(row_format="tuple")
+        self.assertSameRows(memory, postgres)
+        salary = [((row.salary_from or 0) + (row.salary_to or 0)) // 2 for row in memory]
+        self.assertEqual(salary, [((r.salary_from or 0) + (r.salary_to or 0)) // 2 for r in postgres])
+
+    def test_vacancies_with_keyword(self):
+        for keyword in ["python", "РАЗРАБОТЧИК", "a_b", "%", "нет такого"]:
+            with self.subTest(keyword=keyword):
+                memory = self.memory.get_vacancies_with_keyword(keyword, row_format="tuple")
+                postgres = self.postgres.get_vacancies_with_keyword(keyword, row_format="tuple")
+                self.assertSameRows(memory, postgres)
+                self.assertSameOrder(memory, postgres)
+
+    def test_vacancies_in_salary_range(self):
+        for bounds in [(None, None), (100000, 150000), (None, 50000), (200000, None)]:
+            with self.subTest(bounds=bounds):
+                memory = self.memory.get_vacancies_in_salary_range(*bounds, row_format="tuple")
+                postgres = self.postgres.get_vacancies_in_salary_range(
+                    *bounds, row_format="tuple"
+                )
+                self.assertSameRows(memory, postgres)
+                self.assertSameOrder(memory, postgres)
+
+
+if __name__ == "__main__":
+    unittest.main()
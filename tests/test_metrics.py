@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from src.metrics import (
+    DB_BATCH_ROWS,
+    DB_ROWS,
+    MetricsRegistry,
+    _format_value,
+    observe_statement,
+    timed_batch,
+)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Тесты метрик и их вывода в формате Prometheus"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter("requests_total", "Запросы", ("endpoint",))
+        self.latency = self.registry.histogram(
+            "latency_seconds", "Длительность", ("endpoint",), buckets=(0.1, 1)
+        )
+
+    def test_counter(self):
+        """Тест счетчика с метками"""
+        self.requests.inc(1, "vacancies")
+        self.requests.inc(2, "vacancies")
+
+        self.assertEqual(self.requests.value("vacancies"), 3)
+        self.assertEqual(self.requests.value("employers"), 0)
+        self.assertIs(self.registry.counter("requests_total", "Запросы"), self.requests)
+
+    def test_render(self):
+        """Тест текстового формата Prometheus"""
+        self.requests.inc(1, 'a"b')
+        self.latency.observe(0.05, "vacancies")
+        self.latency.observe(0.5, "vacancies")
+        self.latency.observe(5, "vacancies")
+
+        lines = self.registry.render().splitlines()
+
+        self.assertIn("# TYPE latency_seconds histogram", lines)
+        self.assertIn('latency_seconds_bucket{endpoint="vacancies",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{endpoint="vacancies",le="1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{endpoint="vacancies",le="+Inf"} 3', lines)
+        self.assertIn('latency_seconds_sum{endpoint="vacancies"} 5.55', lines)
+        self.assertIn('latency_seconds_count{endpoint="vacancies"} 3', lines)
+        self.assertIn('requests_total{endpoint="a\\"b"} 1', lines)
+
+    def test_format_value(self):
+        """Тест вывода специальных значений"""
+        self.assertEqual(_format_value(3.0), "3")
+        self.assertEqual(_format_value(0.25), "0.25")
+        self.assertEqual(_format_value(float("nan")), "NaN")
+        self.assertEqual(_format_value(float("inf")), "+Inf")
+        self.assertEqual(_format_value(float("-inf")), "-Inf")
+
+    def test_write_textfile(self):
+        """Тест записи метрик в файл"""
+        self.requests.inc(1, "vacancies")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hh.prom")
+            self.registry.write_textfile(path)
+            with open(path, encoding="utf-8") as file:
+                self.assertIn('requests_total{endpoint="vacancies"} 1', file.read())
+
+    def test_http_server(self):
+        """Тест выдачи метрик по HTTP"""
+        self.requests.inc(1, "vacancies")
+        server = self.registry.start_http_server(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        host, port = server.server_address[:2]
+
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            body = response.read().decode()
+
+        self.assertIn('requests_total{endpoint="vacancies"} 1', body)
+
+    def test_db_statements(self):
+        """Тест учета запросов и пакетов записи в БД"""
+        rows = DB_ROWS.value("test_statement")
+        batches = DB_BATCH_ROWS.count("test_batch")
+
+        observe_statement("test_statement", 0.01, 5)
+        with timed_batch("test_batch", 100):
+            pass
+
+        self.assertEqual(DB_ROWS.value("test_statement"), rows + 5)
+        self.assertEqual(DB_BATCH_ROWS.count("test_batch"), batches + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
+import math
 import unittest
+from unittest.mock import patch
 
-from src.models import Employer, Salary, Vacancy
+from src.encoding import NULL_CODE, StringDictionary
+from src.models import Employer, Salary, Vacancy, VacancyBatch
+from src.projection import LEAN
 
 
 class TestSalary(unittest.TestCase):
@@ -125,6 +129,26 @@ class TestVacancy(unittest.TestCase):
         self.assertEqual(vacancy.experience, "1-3 years")
         self.assertEqual(vacancy.employment, "full")
 
+    def test_vacancy_salary_write_back(self):
+        """Тест записи изменений полей зарплаты обратно в вакансию"""
+        vacancy = Vacancy(
+            id=1,
+            name="Python Developer",
+            url="http://example.com",
+            alternate_url="http://hh.ru/vacancy/1",
+            employer_id=1,
+            salary=Salary(from_=100000, currency="RUR"),
+        )
+
+        vacancy.salary.from_ = 120000
+        vacancy.salary.to = 150000
+
+        self.assertEqual(vacancy.salary, Salary(from_=120000, to=150000, currency="RUR"))
+        self.assertEqual((vacancy.salary_from, vacancy.salary_to), (120000, 150000))
+        self.assertEqual(vacancy.get_avg_salary(), 135000)
+        with self.assertRaises(AttributeError):
+            vacancy.salary.unknown = 1
+
     def test_vacancy_from_json_with_salary(self):
         """Тест создания Vacancy из JSON с зарплатой"""
         json_data = {
@@ -152,6 +176,24 @@ class TestVacancy(unittest.TestCase):
         self.assertEqual(vacancy.experience, "3-6 years")
         self.assertEqual(vacancy.employment, "part")
 
+    def test_vacancy_from_json_interns_fields(self):
+        """Тест общих экземпляров строк для повторяющихся значений"""
+        items = [
+            {
+                "id": i,
+                "name": "Vacancy",
+                "employer": {"id": 1},
+                "salary": {"from": 1, "currency": "".join(["R", "U", "R"])},
+                "experience": {"name": "".join(["3-6 ", "years"])},
+            }
+            for i in range(2)
+        ]
+
+        first, second = [Vacancy.from_json(item) for item in items]
+
+        self.assertIs(first.currency, second.currency)
+        self.assertIs(first.experience, second.experience)
+
     def test_vacancy_from_json_without_salary(self):
         """Тест создания Vacancy из JSON без зарплаты"""
         json_data = {
@@ -173,6 +215,196 @@ class TestVacancy(unittest.TestCase):
         self.assertIsNone(vacancy.experience)
         self.assertIsNone(vacancy.employment)
 
+    def test_vacancy_inline_salary(self):
+        """Тест хранения полей зарплаты в самой вакансии"""
+        vacancy = Vacancy(
+            id=4,
+            name="Go Developer",
+            url="",
+            alternate_url="",
+            employer_id=1,
+            salary=Salary(from_=100000, to=None, currency="RUR"),
+        )
+
+        self.assertEqual(vacancy.salary_from, 100000)
+        self.assertEqual(vacancy.currency, "RUR")
+        self.assertEqual(vacancy.get_avg_salary(), 100000)
+        self.assertEqual(vacancy.salary, Salary(from_=100000, currency="RUR"))
+
+        vacancy.salary = None
+        self.assertIsNone(vacancy.salary)
+        self.assertIsNone(vacancy.get_avg_salary())
+
+    def test_vacancy_equality(self):
+        """Тест сравнения вакансий"""
+        first = Vacancy(id=1, name="A", url="", alternate_url="", employer_id=1)
+        second = Vacancy(id=1, name="A", url="", alternate_url="", employer_id=1)
+
+        self.assertEqual(first, second)
+        second.employment = "full"
+        self.assertNotEqual(first, second)
+
+
+class TestSlots(unittest.TestCase):
+    """Тесты компактного представления моделей"""
+
+    def test_no_instance_dict(self):
+        """Тест отсутствия __dict__ у экземпляров моделей"""
+        objects = [
+            Salary(from_=1),
+            Employer(id=1, name="A", url="", alternate_url=""),
+            Vacancy(id=1, name="A", url="", alternate_url="", employer_id=1),
+        ]
+        for obj in objects:
+            self.assertFalse(hasattr(obj, "__dict__"))
+            with self.assertRaises(AttributeError):
+                obj.unknown_field = 1
+
+    def test_slotted_defaults(self):
+        """Тест значений по умолчанию у моделей со слотами"""
+        salary = Salary()
+
+        self.assertIsNone(salary.from_)
+        self.assertIsNone(salary.gross)
+        self.assertEqual(repr(salary), "Salary(from_=None, to=None, currency=None, gross=None)")
+
+    def test_compressed_description(self):
+        """Тест хранения описания вакансии в сжатом виде"""
+        vacancy = Vacancy(
+            id=1, name="A", url="", alternate_url="", employer_id=1, description="<p>Текст</p>"
+        )
+
+        self.assertIsInstance(vacancy.compressed_description, bytes)
+        self.assertEqual(vacancy.description, "<p>Текст</p>")
+        vacancy.description = None
+        self.assertIsNone(vacancy.compressed_description)
+
+
+class TestVacancyBatch(unittest.TestCase):
+    """Тесты для класса VacancyBatch"""
+
+    items = [
+        {
+            "id": "1",
+            "name": "Python Developer",
+            "alternate_url": "http://hh.ru/vacancy/1",
+            "employer": {"id": "10"},
+            "salary": {"from": 100000, "to": 150000, "currency": "RUR", "gross": True},
+            "experience": {"name": "1-3 years"},
+        },
+        {
+            "id": "2",
+            "name": "Java Developer",
+            "employer": {"id": "20"},
+            "salary": {"from": None, "to": 200000, "currency": "RUR"},
+        },
+        {"id": "3", "name": "Intern", "employer": {"id": "10"}},
+    ]
+
+    def test_from_json_batch(self):
+        """Тест создания столбцовой пачки из JSON"""
+        batch = Vacancy.from_json_batch(self.items)
+
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(list(batch.id), [1, 2, 3])
+        self.assertEqual(list(batch.employer_id), [10, 20, 10])
+        self.assertEqual(list(batch.salary_from_mask), [1, 0, 0])
+        self.assertEqual(list(batch.salary_to), [150000, 200000, 0])
+        self.assertEqual(list(batch.gross_mask), [1, 0, 0])
+        self.assertEqual(batch.decode("currency"), ["RUR", "RUR", None])
+        self.assertEqual(batch.decode("experience"), ["1-3 years", None, None])
+
+    def test_dictionary_encoded_columns(self):
+        """Тест хранения валюты кодами общего словаря"""
+        batch = Vacancy.from_json_batch(self.items)
+
+        self.assertEqual(batch.currency.typecode, "h")
+        self.assertEqual(batch.currency[0], batch.currency[1])
+        self.assertEqual(batch.currency[2], NULL_CODE)
+        self.assertEqual(batch.count_by("currency"), {"RUR": 2, None: 1})
+
+    def test_get_avg_salaries(self):
+        """Тест расчета средних зарплат для всей пачки"""
+        averages = Vacancy.from_json_batch(self.items).get_avg_salaries()
+
+        self.assertEqual(list(averages[:2]), [125000.0, 200000.0])
+        self.assertTrue(math.isnan(averages[2]))
+
+    def test_rows(self):
+        """Тест строк пачки для загрузки в БД"""
+        rows = list(Vacancy.from_json_batch(self.items).rows())
+
+        self.assertEqual(rows[0][5:9], (100000, 150000, "RUR", True))
+        self.assertEqual(rows[1][5:9], (None, 200000, "RUR", None))
+        self.assertEqual(rows[2][5:9], (None, None, None, None))
+
+    def test_to_vacancies(self):
+        """Тест совпадения пачки с поштучно созданными вакансиями"""
+        batch = Vacancy.from_json_batch(self.items)
+
+        self.assertEqual(batch.to_vacancies(), [Vacancy.from_json(i) for i in self.items])
+
+    def test_extend(self):
+        """Тест объединения пачек"""
+        batch = Vacancy.from_json_batch(self.items[:1])
+        batch.extend(Vacancy.from_json_batch(self.items[1:]))
+
+        self.assertEqual(list(batch.id), [1, 2, 3])
+        self.assertEqual(len(VacancyBatch()), 0)
+
+    def test_deduplicate(self):
+        """Тест удаления повторяющихся id с сохранением последней версии"""
+        batch = Vacancy.from_json_batch(self.items)
+        self.assertIs(batch.deduplicate(), batch)
+
+        updated = dict(self.items[0], name="Senior Python Developer")
+        unique = Vacancy.from_json_batch(self.items + [updated]).deduplicate()
+
+        self.assertEqual(list(unique.id), [2, 3, 1])
+        self.assertEqual(unique.name[2], "Senior Python Developer")
+        self.assertEqual(unique.salary_to.typecode, "q")
+        self.assertEqual(list(unique.salary_from_mask), [0, 0, 1])
+
+    def test_wide_codes(self):
+        """Тест расширения столбца кодов, когда словарь перерос int16"""
+        experience = StringDictionary(str(i) for i in range(40000))
+        items = [dict(self.items[0], experience={"name": name}) for name in ("1", "39999")]
+
+        with patch("src.models.EXPERIENCE", experience), patch.dict(
+            "src.models.DICTIONARY_COLUMNS", {"experience": experience}
+        ):
+            batch = Vacancy.from_json_batch(items[:1])
+            wide = Vacancy.from_json_batch(items[1:])
+            batch.extend(wide)
+
+            self.assertEqual(batch.currency.typecode, "h")
+            self.assertEqual(wide.experience.typecode, "i")
+            self.assertEqual(batch.decode("experience"), ["1", "39999"])
+            self.assertEqual(batch.deduplicate().decode("experience"), ["39999"])
+
+    def test_projection(self):
+        """Тест разбора только полей профиля проекции"""
+        items = [dict(self.items[0], url="http://api/1", description="<p>Описание</p>")]
+        batch = Vacancy.from_json_batch(items, LEAN)
+        vacancy = Vacancy.from_json(items[0], LEAN)
+
+        self.assertEqual(batch.url, [""])
+        self.assertEqual(batch.description, [None])
+        self.assertEqual(batch.decode("experience"), [None])
+        self.assertEqual(list(batch.salary_to), [150000])
+        self.assertEqual(batch.to_vacancies(), [vacancy])
+        self.assertEqual(vacancy.alternate_url, "http://hh.ru/vacancy/1")
+
+    def test_compressed_descriptions(self):
+        """Тест хранения описаний пачки в сжатом виде"""
+        items = [dict(self.items[0], description="<p>Описание</p>"), self.items[1]]
+        batch = Vacancy.from_json_batch(items)
+
+        self.assertIsInstance(batch.description[0], bytes)
+        self.assertEqual(batch.get_description(0), "<p>Описание</p>")
+        self.assertIsNone(batch.get_description(1))
+        self.assertEqual(batch.to_vacancies()[0].description, "<p>Описание</p>")
+
 
 if __name__ == "__main__":
     unittest.main()
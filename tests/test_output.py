@@ -0,0 +1,73 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from src.output import OutputWriter
+
+
+class TestOutputWriter(unittest.TestCase):
+    """Тесты для класса OutputWriter"""
+
+    columns = ("company", "vacancy", "salary_from")
+    rows = [("Company A", "Python, Senior", 100000), ("Company B", "Java", None)]
+
+    def test_text(self):
+        """Тест текстового формата"""
+        stream = io.StringIO()
+        with OutputWriter(stream, self.columns) as writer:
+            writer.write_rows(self.rows)
+
+        self.assertEqual(
+            stream.getvalue(), "Company A | Python, Senior | 100000\nCompany B | Java | \n"
+        )
+
+    def test_csv(self):
+        """Тест CSV с заголовком и экранированием"""
+        stream = io.StringIO()
+        with OutputWriter(stream, self.columns, "csv") as writer:
+            writer.write_rows(self.rows)
+
+        self.assertEqual(
+            stream.getvalue().splitlines(),
+            ["company,vacancy,salary_from", 'Company A,"Python, Senior",100000', "Company B,Java,"],
+        )
+
+    def test_jsonl(self):
+        """Тест формата JSONL"""
+        stream = io.StringIO()
+        with OutputWriter(stream, self.columns, "jsonl") as writer:
+            writer.write_rows(self.rows)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines[1], {"company": "Company B", "vacancy": "Java", "salary_from": None})
+
+    def test_limit(self):
+        """Тест ограничения количества строк"""
+        stream = io.StringIO()
+        with OutputWriter(stream, self.columns, limit=1) as writer:
+            self.assertEqual(writer.write_rows(iter(self.rows)), 1)
+            self.assertFalse(writer.write_row(self.rows[1]))
+
+        self.assertEqual(stream.getvalue().count("\n"), 1)
+
+    def test_buffered_writes(self):
+        """Тест передачи данных в поток крупными порциями"""
+        stream = MagicMock()
+        with OutputWriter(stream, self.columns, buffer_size=1000) as writer:
+            writer.write_rows(self.rows * 100)
+
+        written = [call[0][0] for call in stream.write.call_args_list]
+        self.assertLess(len(written), 10)
+        self.assertEqual("".join(written).count("\n"), 200)
+
+    def test_invalid_arguments(self):
+        """Тест недопустимого формата и ограничения"""
+        with self.assertRaises(ValueError):
+            OutputWriter(io.StringIO(), self.columns, "xml")
+        with self.assertRaises(ValueError):
+            OutputWriter(io.StringIO(), self.columns, limit=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
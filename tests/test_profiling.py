@@ -0,0 +1,142 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from contextlib import nullcontext
+from unittest.mock import patch
+
+from src import profiling
+from src.profiling import Profiler
+
+
+def build_rows(count):
+    return [str(i) * 10 for i in range(count)]
+
+
+class TestProfiler(unittest.TestCase):
+    """Тесты профилирования стадий"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.profiler = Profiler(interval=0.001)
+        self.addCleanup(profiling.disable)
+
+    def run_stages(self):
+        profiling.enable(self.profiler)
+        for _ in range(2):
+            with profiling.stage("parse"):
+                rows = build_rows(20000)
+                with profiling.stage("load"):
+                    time.sleep(0.02)
+        profiling.disable()
+        return rows
+
+    def test_disabled_stage(self):
+        """Тест: без включенного профилирования стадия — пустой контекст"""
+        self.assertIsInstance(profiling.stage("http"), nullcontext)
+
+    def test_stage_stats(self):
+        """Тест учета вызовов, времени и памяти по стадиям"""
+        self.run_stages()
+
+        parse, load = self.profiler.stages["parse"], self.profiler.stages["load"]
+        self.assertEqual((parse.calls, load.calls), (2, 2))
+        self.assertGreaterEqual(load.total_time, 0.04)
+        self.assertGreater(parse.peak_memory, 0)
+        self.assertTrue(any("test_profiling.py" in line for line in parse.allocations))
+        self.assertTrue(any(stack.startswith("load;") for stack in self.profiler.stacks))
+
+    def test_nested_stage_keeps_outer_peak(self):
+        """Тест: вложенная стадия не сбрасывает пик внешней"""
+        profiling.enable(self.profiler)
+        with profiling.stage("parse"):
+            rows = bytearray(4 * 1024 * 1024)
+            del rows
+            with profiling.stage("load"):
+                build_rows(10)
+        profiling.disable()
+
+        self.assertGreater(self.profiler.stages["parse"].peak_memory, 3 * 1024 * 1024)
+        self.assertLess(self.profiler.stages["load"].peak_memory, 1024 * 1024)
+
+    def test_snapshots_at_outer_stages(self):
+        """Тест: снимки tracemalloc только на границах внешних стадий"""
+        with patch("tracemalloc.take_snapshot", wraps=tracemalloc.take_snapshot) as snapshot:
+            self.run_stages()
+
+        self.assertEqual(snapshot.call_count, 4)
+        self.assertFalse(self.profiler.stages["load"].allocations)
+
+    def test_stages_in_threads(self):
+        """Тест: у каждого потока свой стек стадий"""
+        barrier = threading.Barrier(3)
+
+        def fetch():
+            barrier.wait()
+            for _ in range(50):
+                with profiling.stage("http"):
+                    time.sleep(0.001)
+
+        profiling.enable(self.profiler)
+        workers = [threading.Thread(target=fetch) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        for _ in range(20):
+            with profiling.stage("parse"):
+                with profiling.stage("load"):
+                    time.sleep(0.001)
+        for worker in workers:
+            worker.join()
+        profiling.disable()
+
+        stages = self.profiler.stages
+        self.assertEqual(stages["http"].calls, 100)
+        self.assertEqual((stages["parse"].calls, stages["load"].calls), (20, 20))
+        self.assertEqual(stages["http"].peak_memory, 0)
+        self.assertTrue(any(stack.startswith("http;") for stack in self.profiler.stacks))
+
+    def test_disabled_after_fork(self):
+        """Тест: дочерний процесс не наследует профилирование"""
+        profiling.enable(self.profiler)
+        with profiling.stage("parse"):
+            profiling._after_fork_in_child()
+
+        self.assertIsInstance(profiling.stage("parse"), nullcontext)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    @patch("src.profiling._reset_peak", None)
+    def test_stage_stats_without_reset_peak(self):
+        """Тест оценки пика без tracemalloc.reset_peak (Python 3.8)"""
+        rows = self.run_stages()
+
+        self.assertEqual(len(rows), 20000)
+        self.assertGreater(self.profiler.stages["parse"].peak_memory, 0)
+        self.assertGreater(self.profiler.stages["parse"].allocated, 0)
+
+    def test_write_and_summary(self):
+        """Тест записи результатов и сводной таблицы"""
+        self.run_stages()
+        stream = io.StringIO()
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.profiler.write(directory)
+            files = sorted(os.listdir(directory))
+            with open(os.path.join(directory, "stacks.folded"), encoding="utf-8") as file:
+                first = file.readline()
+        self.profiler.print_summary(stream)
+
+        self.assertEqual(
+            files, ["allocations.txt", "load.prof", "parse.prof", "stacks.folded"]
+        )
+        self.assertRegex(first, r"^\w+;.* \d+$")
+        summary = stream.getvalue()
+        self.assertIn("parse", summary)
+        self.assertIn("test_profiling.py:", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
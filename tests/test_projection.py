@@ -0,0 +1,50 @@
+import unittest
+
+from src.projection import FULL, LEAN, Projection, get_projection
+
+
+class TestProjection(unittest.TestCase):
+    """Тесты для профилей проекции"""
+
+    def test_full_profile(self):
+        """Тест полного профиля"""
+        self.assertIn("description", FULL)
+        self.assertEqual(len(FULL.vacancy_columns), 11)
+        self.assertNotIn("description", FULL.vacancy_columns)
+
+    def test_lean_profile(self):
+        """Тест профиля только с обязательными полями"""
+        self.assertIn("salary_from", LEAN)
+        self.assertNotIn("url", LEAN)
+        self.assertEqual(
+            LEAN.vacancy_columns,
+            (
+                "id",
+                "name",
+                "alternate_url",
+                "employer_id",
+                "salary_from",
+                "salary_to",
+                "currency",
+                "salary_gross",
+            ),
+        )
+        self.assertEqual(LEAN.row_indexes, (0, 1, 3, 4, 5, 6, 7, 8))
+
+    def test_get_projection(self):
+        """Тест выбора профиля по имени или перечню полей"""
+        self.assertIs(get_projection(None), FULL)
+        self.assertIs(get_projection(" lean "), LEAN)
+        self.assertEqual(
+            get_projection("experience, employment"),
+            Projection(frozenset({"experience", "employment"})),
+        )
+
+    def test_unknown_field(self):
+        """Тест ошибки при неизвестном поле"""
+        with self.assertRaises(ValueError):
+            get_projection("salary")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.scheduler import BACKOFF, INITIAL_INTERVAL, Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    """Тесты расписания обновлений работодателей"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.scheduler = Scheduler(
+            [1, 2, 3], min_interval=60, max_interval=7200, jitter=0, rng=random.Random(0)
+        )
+
+    def test_new_employers_due(self):
+        """Тест: новые работодатели обновляются сразу, не больше limit за раз"""
+        self.assertEqual(self.scheduler.due(now=0), [1, 2, 3])
+        self.assertEqual(self.scheduler.due(now=0, limit=2), [1, 2])
+        self.assertEqual(self.scheduler.due(now=0, limit=2, exclude=[1]), [2, 3])
+
+    def test_interval_adapts(self):
+        """Тест: интервал сокращается при изменениях и растет без них"""
+        self.scheduler.record(1, "a", now=0)
+        self.assertEqual(self.scheduler.schedules[1].next_run, INITIAL_INTERVAL)
+
+        self.scheduler.record(1, "b", now=100)
+        self.assertEqual(self.scheduler.schedules[1].interval, INITIAL_INTERVAL / 2)
+
+        self.scheduler.record(1, "b", now=200)
+        self.assertEqual(self.scheduler.schedules[1].interval, INITIAL_INTERVAL / 2 * BACKOFF)
+        self.assertEqual(self.scheduler.due(now=300), [2, 3])
+
+    def test_interval_bounds(self):
+        """Тест ограничения интервала границами расписания"""
+        for step in range(20):
+            self.scheduler.record(1, "same", now=step)
+            self.scheduler.record(2, str(step), now=step)
+        self.assertEqual(self.scheduler.schedules[1].interval, 7200)
+        self.assertEqual(self.scheduler.schedules[2].interval, 60)
+
+    def test_failure_backoff(self):
+        """Тест повтора после неудачи с удвоением задержки"""
+        self.scheduler.record_failure(1, now=0)
+        self.assertEqual(self.scheduler.schedules[1].next_run, 60)
+        self.scheduler.record_failure(1, now=0)
+        self.assertEqual(self.scheduler.schedules[1].next_run, 120)
+        self.scheduler.record(1, "a", now=0)
+        self.assertEqual(self.scheduler.schedules[1].failures, 0)
+
+    def test_jitter(self):
+        """Тест случайного сдвига следующего обновления"""
+        scheduler = Scheduler([1], jitter=0.1, rng=random.Random(1))
+        scheduler.record(1, "a", now=0)
+        next_run = scheduler.schedules[1].next_run
+        self.assertNotEqual(next_run, INITIAL_INTERVAL)
+        self.assertTrue(INITIAL_INTERVAL * 0.9 <= next_run <= INITIAL_INTERVAL * 1.1)
+
+    def test_save_load(self):
+        """Тест сохранения расписания между перезапусками"""
+        self.scheduler.record(1, "a", now=0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scheduler.json")
+            self.scheduler.save(path)
+
+            restored = Scheduler([1, 4], min_interval=60, max_interval=7200)
+            restored.load(path)
+
+        self.assertEqual(restored.schedules[1], self.scheduler.schedules[1])
+        self.assertNotIn(2, restored.schedules)
+        self.assertEqual(restored.due(now=0), [4])
+
+    def test_invalid_bounds(self):
+        """Тест ошибки при некорректных границах интервала"""
+        with self.assertRaises(ValueError):
+            Scheduler([1], min_interval=100, max_interval=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
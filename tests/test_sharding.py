@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from src.sharding import (
+    balance,
+    parse_shard,
+    read_employer_file,
+    run_local_shards,
+    shard_employers,
+)
+
+
+def double_ids(employer_ids):
+    return [employer_id * 2 for employer_id in employer_ids]
+
+
+class TestSharding(unittest.TestCase):
+    """Тесты разбиения работодателей на шарды"""
+
+    def test_parse_shard(self):
+        """Тест разбора номера шарда"""
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ("4/4", "-1/4", "1", "a/b", "0/0"):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_balance_covers_all(self):
+        """Тест: каждый работодатель попадает ровно в один шард"""
+        employer_ids = list(range(1, 101))
+        shards = balance(employer_ids, 7)
+
+        self.assertEqual(sorted(e for shard in shards for e in shard), employer_ids)
+        self.assertLessEqual(max(map(len, shards)) - min(map(len, shards)), 1)
+
+    def test_balance_weights(self):
+        """Тест выравнивания шардов по весу работодателей"""
+        weights = {1: 100, 2: 60, 3: 50, 4: 30, 5: 20}
+
+        shards = balance([1, 2, 3, 4, 5], 2, weights)
+
+        self.assertEqual(shards, [[1, 4], [2, 3, 5]])
+        self.assertEqual([sum(weights[e] for e in shard) for shard in shards], [130, 130])
+
+    def test_shard_deterministic(self):
+        """Тест: разбиение не зависит от порядка списка"""
+        employer_ids = [5, 3, 9, 1, 7, 3]
+        self.assertEqual(
+            shard_employers(employer_ids, 1, 3),
+            shard_employers(sorted(set(employer_ids)), 1, 3),
+        )
+        with self.assertRaises(ValueError):
+            shard_employers(employer_ids, 3, 3)
+
+    def test_read_employer_file(self):
+        """Тест чтения списка работодателей с весами и комментариями"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "employers.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("# Список\n1740, 1200  # Яндекс\n\n3529\n1740\n")
+
+            self.assertEqual(read_employer_file(path), ([1740, 3529], {1740: 1200.0}))
+
+            with open(path, "a", encoding="utf-8") as file:
+                file.write("abc\n")
+            with self.assertRaises(ValueError):
+                read_employer_file(path)
+
+    def test_run_local_shards(self):
+        """Тест параллельной обработки шардов в процессах"""
+        self.assertEqual(run_local_shards([[1, 2], [], [3]], double_ids), [[2, 4], [6]])
+        self.assertEqual(run_local_shards([[1]], double_ids), [[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
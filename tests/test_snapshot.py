@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.database import DatabaseManager
+from src.models import Employer, Vacancy
+from src.snapshot import DictColumn, Snapshot, StringColumn, write_snapshot, write_snapshot_from_db
+
+
+class TestSnapshot(unittest.TestCase):
+    """Тесты столбцового снимка"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        handle, self.path = tempfile.mkstemp(suffix=".hhsnap")
+        os.close(handle)
+        self.employers = [
+            Employer(id=1, name="Компания А", url="", alternate_url="", description="Описание"),
+            Employer(id=2, name="Company B", url="", alternate_url=""),
+        ]
+        self.batch = Vacancy.from_json_batch(
+            [
+                {
+                    "id": 10,
+                    "name": "Python-разработчик",
+                    "employer": {"id": 1},
+                    "salary": {"from": 100000, "to": 150000, "currency": "RUR", "gross": False},
+                    "experience": {"name": "От 1 года до 3 лет"},
+                },
+                {
+                    "id": 11,
+                    "name": "Java Developer",
+                    "employer": {"id": 2},
+                    "salary": {"to": 3000, "currency": "USD"},
+                    "description": "<p>Описание</p>",
+                },
+                {"id": 12, "name": "Стажер", "employer": {"id": 1}},
+            ]
+        )
+
+    def tearDown(self):
+        """Удаление файла снимка"""
+        os.remove(self.path)
+
+    def test_roundtrip(self):
+        """Тест записи и чтения снимка"""
+        write_snapshot(self.path, self.employers, self.batch)
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.rows("vacancies"), 3)
+            self.assertEqual(snapshot.employers(), self.employers)
+            self.assertEqual(snapshot.to_batch().to_vacancies(), self.batch.to_vacancies())
+
+    def test_columns_are_zero_copy(self):
+        """Тест чтения столбцов без копирования"""
+        write_snapshot(self.path, self.employers, self.batch)
+
+        with Snapshot(self.path) as snapshot:
+            ids = snapshot.column("vacancies", "id")
+            names = snapshot.column("vacancies", "name")
+            currency = snapshot.column("vacancies", "currency")
+
+            self.assertIsInstance(ids, memoryview)
+            self.assertTrue(ids.readonly)
+            self.assertEqual(ids.tolist(), [10, 11, 12])
+            self.assertIsInstance(names, StringColumn)
+            self.assertEqual(names[0], "Python-разработчик")
+            self.assertEqual(names[-1], "Стажер")
+            self.assertIsInstance(currency, DictColumn)
+            self.assertEqual(currency[:], ["RUR", "USD", None])
+            self.assertEqual(snapshot.column("vacancies", "description")[:2], [None, "<p>Описание</p>"])
+
+        with self.assertRaises(ValueError):
+            ids.tolist()
+
+    def test_invalid_file(self):
+        """Тест открытия файла, не являющегося снимком"""
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot" * 10)
+
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+    def test_write_snapshot_from_db(self):
+        """Тест записи снимка из базы данных"""
+        db_manager = DatabaseManager()
+        mock_conn = MagicMock()
+        employer_cursor = MagicMock()
+        employer_cursor.fetchall.return_value = [(1, "Компания А", "", "", None)]
+        vacancy_cursor = MagicMock()
+        vacancy_cursor.__iter__.return_value = iter(
+            [(10, "Python", "", "", 1, 100000, None, "RUR", None, None, None, "Полная занятость")]
+        )
+        mock_conn.cursor.return_value.__enter__.side_effect = [employer_cursor, vacancy_cursor]
+        db_manager.connection = mock_conn
+
+        write_snapshot_from_db(db_manager, self.path)
+
+        self.assertEqual(mock_conn.cursor.call_args_list[1][1], {"name": "hh_snapshot"})
+        with Snapshot(self.path) as snapshot:
+            vacancy = snapshot.to_batch().to_vacancies()[0]
+            self.assertEqual(vacancy.salary_from, 100000)
+            self.assertIsNone(vacancy.salary_to)
+            self.assertEqual(vacancy.employment, "Полная занятость")
+
+
+if __name__ == "__main__":
+    unittest.main()